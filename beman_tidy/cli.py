@@ -3,11 +3,60 @@
 
 import argparse
 from importlib.metadata import version as _pkg_version
+import os
 import sys
 import logging
 
-from beman_tidy.lib.utils.git import get_repo_info, load_beman_standard_config
+from beman_tidy.lib.utils.git import (
+    get_repo_info,
+    get_repo_tracked_files,
+    load_beman_standard_config,
+    use_repo_revision,
+)
 from beman_tidy.lib.pipeline import run_checks_pipeline
+from beman_tidy.lib.planner import expand_check_patterns, plan_checks
+from beman_tidy.lib.reporters import OUTPUT_FORMATS
+from beman_tidy.lib.utils.config import set_timeouts
+from beman_tidy.lib.utils.edits import EditBuffer
+from beman_tidy.lib.utils.filesystem import WorktreeFS, get_filesystem, is_archive_path
+from beman_tidy.lib.utils.logger_config import setup_logging
+from beman_tidy.lib.history import run_bisect, run_history
+from beman_tidy.lib.store import run_query
+
+
+def _positive_seconds(value):
+    try:
+        seconds = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number of seconds: '{value}'")
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"the number of seconds must be positive: '{value}'")
+    return seconds
+
+
+def add_timeout_arguments(parser):
+    """
+    Add the time budget arguments (they override 'timeouts' from the configuration file).
+    """
+    parser.add_argument(
+        "--check-timeout",
+        help="time budget of each check in seconds, a check that exceeds it is reported as timed out",
+        type=_positive_seconds,
+        default=None,
+    )
+    parser.add_argument(
+        "--file-timeout",
+        help="time budget of each file of a check in seconds, a file that exceeds it is skipped",
+        type=_positive_seconds,
+        default=None,
+    )
+
+
+def get_timeouts(args):
+    """
+    Get the time budgets set on the CLI: {scope: seconds} (see TIMEOUT_SCOPES).
+    """
+    return {"check": args.check_timeout, "file": args.file_timeout}
 
 
 def parse_args():
@@ -21,13 +70,26 @@ def parse_args():
         action="version",
         version=f"beman-tidy {_pkg_version('beman-tidy')}",
     )
-    parser.add_argument("repo_path", help="path to the repository to check", type=str)
+    parser.add_argument(
+        "repo_path",
+        help="path to the repository to check (a working tree, a bare repository or a source archive)",
+        type=str,
+    )
     parser.add_argument(
         "--fix-inplace",
         help="try to automatically fix found issues",
         action=argparse.BooleanOptionalAction,
         default=False,
     )
+    parser.add_argument(
+        "--fix-diff",
+        help="try to fix found issues without modifying the repository: write the fixes as a patch "
+        "(for git apply) to FILE, or to stdout if FILE is omitted or '-' (the report goes to stderr)",
+        nargs="?",
+        const="-",
+        default=None,
+        metavar="FILE",
+    )
     parser.add_argument(
         "--verbose",
         help="print verbose output for each check",
@@ -41,7 +103,10 @@ def parse_args():
         default=False,
     )
     parser.add_argument(
-        "--checks", help="array of checks to run", type=str, default=None
+        "--checks",
+        help="array of checks to run, glob patterns are supported (e.g., readme.title,cmake.*)",
+        type=str,
+        default=None,
     )
     parser.add_argument(
         "--config",
@@ -49,31 +114,293 @@ def parse_args():
         type=str,
         default=None,
     )
+    parser.add_argument(
+        "--tracked-only",
+        help="only check files tracked by git (read from the git index instead of walking the filesystem)",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+    )
+    parser.add_argument(
+        "--rev",
+        help="check the repository as of the given commit-ish (e.g., HEAD~3, v1.0.0), without checking it out",
+        type=str,
+        default=None,
+    )
+    parser.add_argument(
+        "--format",
+        help="output format: the human report (text), or JSON Lines on stdout (jsonl; the report goes to stderr)",
+        choices=OUTPUT_FORMATS,
+        default="text",
+    )
+    parser.add_argument(
+        "--store",
+        help="record the run in a SQLite results store (created if needed; see \"beman-tidy query\")",
+        type=str,
+        default=None,
+    )
+    add_timeout_arguments(parser)
     args = parser.parse_args()
 
-    args.repo_info = get_repo_info(args.repo_path, config_path=args.config)
+    if args.format == "jsonl" and args.fix_diff == "-":
+        parser.error("--format jsonl and --fix-diff cannot both write to stdout (use --fix-diff FILE)")
+
+    if args.fix_inplace and args.fix_diff is not None:
+        parser.error("--fix-inplace and --fix-diff cannot be used together")
+
+    if args.rev is not None and args.fix_inplace:
+        parser.error("--fix-inplace cannot be used with --rev (the revision is read-only)")
+
+    if args.rev is not None and is_archive_path(args.repo_path):
+        parser.error("--rev cannot be used with an archive (it has a single revision)")
+
     args.checks = args.checks.split(",") if args.checks else None
 
     return args
 
 
-def main():
+def get_checks_to_run(args, beman_standard_check_config):
     """
-    The beman-tidy main entry point.
+    Get the checks selected by --checks (all checks by default), with glob patterns expanded.
     """
+    if args.checks is None:
+        return list(beman_standard_check_config)
+    try:
+        return expand_check_patterns(args.checks, list(beman_standard_check_config))
+    except ValueError as e:
+        logging.error(f"Invalid --checks: {e}")
+        sys.exit(1)
+
+
+def get_planned_repo_info(args, io_plan):
+    """
+    Get the repository information, fetching and reading only what the planned checks need.
+    """
+    repo_info = get_repo_info(
+        args.repo_path,
+        config_path=args.config,
+        metadata=io_plan.metadata,
+        retained_files=io_plan.retained_files(),
+    )
+    if args.fix_inplace and not get_filesystem(repo_info).writable:
+        logging.error("--fix-inplace requires a working tree (bare repositories and archives are read-only).")
+        sys.exit(1)
+
+    if args.rev is not None:
+        # A revision only contains tracked files: --tracked-only is implied.
+        use_repo_revision(repo_info, args.rev, config_path=args.config)
+    elif args.tracked_only and "filesystem" not in repo_info:
+        repo_info["tracked_files"] = get_repo_tracked_files(repo_info)
+
+    fixing = args.fix_inplace or args.fix_diff is not None
+    if "filesystem" not in repo_info and (io_plan.needs_walk or fixing):
+        # The worktree is not modified while the checks run (fixes are buffered, see EditBuffer):
+        # the checks can share one repository walk.
+        repo_info["filesystem"] = WorktreeFS(cache_walks=io_plan.needs_walk)
+    if fixing:
+        repo_info["filesystem"] = EditBuffer(repo_info["filesystem"])
+
+    set_timeouts(repo_info["config"], **get_timeouts(args))
+    repo_info["io_plan"] = io_plan
+    return repo_info
+
+
+def parse_history_args(argv):
+    """
+    Parse the CLI arguments of "beman-tidy history".
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="beman-tidy history",
+        description="check each commit of a revision range, straight from the git object database",
+    )
+    parser.add_argument("repo_path", help="path to the repository to check", type=str)
+    parser.add_argument(
+        "--last", help="only check the last N commits of the range", type=int, default=None
+    )
+    parser.add_argument(
+        "--rev-range",
+        help="revision range to check (e.g., v1.0.0..HEAD; default: HEAD)",
+        type=str,
+        default=None,
+    )
+    parser.add_argument(
+        "--checks", help="array of checks to run", type=str, default=None
+    )
+    parser.add_argument(
+        "--config",
+        help="path to the configuration file (default: .beman-tidy.yaml in repo root, at each commit)",
+        type=str,
+        default=None,
+    )
+    add_timeout_arguments(parser)
+    args = parser.parse_args(argv)
+    if is_archive_path(args.repo_path):
+        parser.error("the repository must be a git repository, not an archive")
+    if args.last is not None and args.last <= 0:
+        parser.error("--last must be a positive number of commits")
+
+    args.repo_info = get_repo_info(args.repo_path, config_path=args.config)
+    args.timeouts = get_timeouts(args)
+    args.checks = args.checks.split(",") if args.checks else None
+
+    return args
 
-    args = parse_args()
 
+def _load_beman_standard_config():
     beman_standard_check_config = load_beman_standard_config()
     if not beman_standard_check_config or len(beman_standard_check_config) == 0:
         logging.error("Failed to download the beman standard. STOP.")
+        return None
+    return beman_standard_check_config
+
+
+def history_main(argv):
+    """
+    The "beman-tidy history" entry point.
+    """
+
+    args = parse_history_args(argv)
+
+    beman_standard_check_config = _load_beman_standard_config()
+    if beman_standard_check_config is None:
         return
 
-    checks_to_run = (
-        [check for check in beman_standard_check_config]
-        if args.checks is None
-        else args.checks
+    args.checks = get_checks_to_run(args, beman_standard_check_config)
+    sys.exit(run_history(args, beman_standard_check_config))
+
+
+def parse_bisect_args(argv):
+    """
+    Parse the CLI arguments of "beman-tidy bisect".
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="beman-tidy bisect",
+        description="find the first commit on which a check fails, straight from the git object database",
+    )
+    parser.add_argument("repo_path", help="path to the repository to check", type=str)
+    parser.add_argument("--check", help="the check to bisect (e.g., readme.title)", type=str, required=True)
+    parser.add_argument("--good", help="a commit-ish on which the check passes", type=str, required=True)
+    parser.add_argument(
+        "--bad", help="a commit-ish on which the check fails (default: HEAD)", type=str, default="HEAD"
+    )
+    parser.add_argument(
+        "--config",
+        help="path to the configuration file (default: .beman-tidy.yaml in repo root, at each commit)",
+        type=str,
+        default=None,
     )
+    add_timeout_arguments(parser)
+    args = parser.parse_args(argv)
+    if is_archive_path(args.repo_path):
+        parser.error("the repository must be a git repository, not an archive")
+
+    args.repo_info = get_repo_info(args.repo_path, config_path=args.config)
+    args.timeouts = get_timeouts(args)
+
+    return args
+
+
+def bisect_main(argv):
+    """
+    The "beman-tidy bisect" entry point.
+    """
+
+    args = parse_bisect_args(argv)
+
+    beman_standard_check_config = _load_beman_standard_config()
+    if beman_standard_check_config is None:
+        return
+
+    sys.exit(run_bisect(args, beman_standard_check_config))
+
+
+def parse_query_args(argv):
+    """
+    Parse the CLI arguments of "beman-tidy query".
+    """
+
+    parser = argparse.ArgumentParser(
+        prog="beman-tidy query",
+        description="answer questions about the runs recorded in a results store (see --store)",
+    )
+    parser.add_argument("store", help="path to the results store (SQLite database)", type=str)
+    questions = parser.add_subparsers(dest="question", required=True)
+
+    trend = questions.add_parser("trend", help="the number of failed checks of each run, per repository")
+    trend.add_argument("--repo", help="only this repository (remote URL or path)", type=str, default=None)
+    trend.add_argument("--last", help="only the last N runs of each repository", type=int, default=None)
+
+    regression = questions.add_parser(
+        "regression", help="the first run where a check failed after passing, per repository"
+    )
+    regression.add_argument("check", help="the check (e.g., readme.title)", type=str)
+    regression.add_argument("--repo", help="only this repository (remote URL or path)", type=str, default=None)
+
+    questions.add_parser("pass-rates", help="the pass rate of each check, over the last run of each repository")
+
+    args = parser.parse_args(argv)
+    if args.question == "trend" and args.last is not None and args.last <= 0:
+        parser.error("--last must be a positive number of runs")
+    if not os.path.isfile(args.store):
+        parser.error(f"the results store '{args.store}' does not exist")
+
+    return args
+
+
+def query_main(argv):
+    """
+    The "beman-tidy query" entry point.
+    """
+
+    args = parse_query_args(argv)
+    run_query(args)
+
+
+# Subcommands, dispatched on the first argument (otherwise, beman-tidy checks repo_path).
+SUBCOMMANDS = {
+    "history": history_main,
+    "bisect": bisect_main,
+    "query": query_main,
+}
+
+
+def get_subcommand(argv):
+    """
+    Get the entry point of the subcommand named by the first argument, or None to check repo_path.
+    An existing directory wins over a subcommand of the same name: "beman-tidy query" checks ./query if it exists.
+    (A path like ./history is never a subcommand.)
+    """
+    if len(argv) < 2 or argv[1] not in SUBCOMMANDS or os.path.isdir(argv[1]):
+        return None
+    return SUBCOMMANDS[argv[1]]
+
+
+def main():
+    """
+    The beman-tidy main entry point.
+    """
+
+    subcommand = get_subcommand(sys.argv)
+    if subcommand is not None:
+        subcommand(sys.argv[2:])
+        return
+
+    args = parse_args()
+    if args.fix_diff == "-" or args.format == "jsonl":
+        # stdout is reserved for the patch, or for the JSON Lines.
+        setup_logging(to_stderr=True)
+
+    beman_standard_check_config = _load_beman_standard_config()
+    if beman_standard_check_config is None:
+        return
+
+    checks_to_run = get_checks_to_run(args, beman_standard_check_config)
+    io_plan = plan_checks(checks_to_run, fix_inplace=args.fix_inplace)
+    if args.store is not None:
+        # The run is recorded with its commit.
+        io_plan.metadata.add("commit_hash")
+    args.repo_info = get_planned_repo_info(args, io_plan)
 
     failed_checks = run_checks_pipeline(
         checks_to_run, args, beman_standard_check_config
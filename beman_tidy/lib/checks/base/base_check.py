@@ -2,17 +2,29 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
 from abc import ABC
-import logging
+from dataclasses import dataclass
 from pathlib import Path
 
 from ..system.registry import get_beman_standard_check_name_by_class
-from ...utils.string import (
-    red_color,
-    yellow_color,
-    gray_color,
-    blue_color,
-    no_color,
-)
+from ...utils.diagnostics import Diagnostic, get_diagnostic_collector
+from ...utils.filesystem import get_filesystem
+
+
+@dataclass(frozen=True)
+class CheckInputs:
+    """
+    What a check reads from the repository, declared by each check class.
+    Used to compute the minimal I/O plan of a run (see planner.py).
+    """
+
+    # Files read by the check, relative to the repository root - e.g. "README.md".
+    files: tuple[str, ...] = ()
+    # Directories listed by the check, relative to the repository root - e.g. "src".
+    directories: tuple[str, ...] = ()
+    # File categories found by walking the repository - e.g. "cpp", "doc" (see FILE_CATEGORIES).
+    categories: tuple[str, ...] = ()
+    # Git metadata fields of repo_info - e.g. "default_branch" (see GIT_METADATA_FIELDS).
+    metadata: tuple[str, ...] = ()
 
 
 class BaseCheck(ABC):
@@ -26,6 +38,12 @@ class BaseCheck(ABC):
     thus an implementation is not required in the derived class.
     """
 
+    # What the check reads (nothing beyond the basic repo_info by default).
+    inputs = CheckInputs()
+
+    # The file or directory the check is about, if any (set by FileBaseCheck and DirectoryBaseCheck).
+    path = None
+
     def __init__(self, repo_info, beman_standard_check_config, name=None):
         """
         Create a new check instance.
@@ -75,6 +93,10 @@ class BaseCheck(ABC):
         assert "top_level" in repo_info
         self.repo_path = Path(repo_info["top_level"])
         assert self.repo_path is not None
+        # where repository files are read from: the worktree, or a git revision (--rev)
+        self.filesystem = get_filesystem(repo_info)
+        # where the messages of the check go (see log())
+        self.diagnostics = get_diagnostic_collector(repo_info)
         self.library_name = f"beman.{self.short_name}"
         assert self.library_name is not None
         self.library_alias = f"beman::{self.short_name}"
@@ -176,31 +198,53 @@ class BaseCheck(ABC):
         self.type = "Requirement"
         self.log_level = "error"
 
-    def log(self, message, enabled=True, log_level=None):
+    def log(
+        self,
+        message,
+        enabled=True,
+        log_level=None,
+        *,
+        code=None,
+        path=None,
+        line=None,
+        column=None,
+        fix_hint=None,
+        **args,
+    ):
         """
-        Logs a message with the check's log level.
+        Logs a message with the check's log level, as a Diagnostic emitted to the collector of the run
+        (see DiagnosticCollector; printed to the console by default).
         E.g., [warning][file.names]: File name "${name}" does not follow the snake_case naming convention.
         E.g., [error][toplevel.cmake]: The file 'CMakeLists.txt' does not exist.
-        """
 
-        if self.log_enabled and enabled:
-            if log_level:
-                level = log_level
-            elif self._is_resolving_log_level:  # if it hasn't been initialized yet
-                level = "info"
-            else:
-                level = self.log_level
-
-            color = (
-                red_color
-                if level == "error"
-                else yellow_color
-                if level == "warning"
-                else gray_color
-                if level == "skipped"
-                else blue_color
-                if level == "info"
-                else no_color
+        If fields are given (path, line, column or other keyword arguments), the message (and fix_hint)
+        is a str.format() template of them, rendered only if needed: {path} is displayed relative to
+        the repository. The diagnostic is about self.path (if any) unless path is given.
+        E.g., self.log("The file '{path}' is empty.", path=self.path).
+        Prefer fields to f-strings for messages of checks that run on many files.
+        """
+        if not (self.log_enabled and enabled):
+            return
+
+        if log_level:
+            level = log_level
+        elif self._is_resolving_log_level:  # if it hasn't been initialized yet
+            level = "info"
+        else:
+            level = self.log_level
+
+        is_template = args or path is not None or line is not None or column is not None
+        self.diagnostics.emit(
+            Diagnostic(
+                self.name,
+                level,
+                message,
+                code=code,
+                path=path if path is not None else self.path,
+                line=line,
+                column=column,
+                fix_hint=fix_hint,
+                args=args if is_template else None,
+                root=self.repo_path,
             )
-
-            logging.info(f"[{color}{level}{no_color}][{self.name}]: {message}")
+        )
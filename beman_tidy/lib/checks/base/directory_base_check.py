@@ -4,10 +4,10 @@
 from abc import abstractmethod
 from pathlib import Path
 
-from beman_tidy.lib.utils.string import normalize_path_for_display
 
 from .base_check import BaseCheck
-from ...utils.config import is_ignored
+from ...utils.config import get_ignores, is_ignored
+from ...utils.file import RepoFileIndex, classify_repo_files
 
 
 class DirectoryBaseCheck(BaseCheck):
@@ -34,14 +34,12 @@ class DirectoryBaseCheck(BaseCheck):
             self.log("The path is not set.")
             return False
 
-        if not self.path.exists():
-            display_path = normalize_path_for_display(self.path, self.repo_path)
-            self.log(f"The directory '{display_path}' does not exist.")
+        if not self.filesystem.exists(self.path):
+            self.log("The directory '{path}' does not exist.", path=self.path)
             return False
 
         if self.is_empty():
-            display_path = normalize_path_for_display(self.path, self.repo_path)
-            self.log(f"The directory '{display_path}' is empty.")
+            self.log("The directory '{path}' is empty.", path=self.path)
             return False
 
         return True
@@ -68,12 +66,34 @@ class DirectoryBaseCheck(BaseCheck):
         """
         pass
 
+    def repo_files(self) -> RepoFileIndex:
+        """
+        Get the repository files bucketed by category (paper, doc, test, ...).
+        The repository is walked only once per run and shared by all directory.* checks.
+        """
+        ignores = get_ignores(self.repo_info)
+        tracked_files = self.repo_info.get("tracked_files")
+        # Only the categories needed by the selected checks, if planned (see planner.py).
+        io_plan = self.repo_info.get("io_plan")
+        categories = io_plan.indexed_categories if io_plan is not None else None
+        key = (str(self.repo_path), tuple(ignores), tracked_files is not None, id(self.filesystem))
+        cache = self.repo_info.setdefault("repo_file_index", {})
+        if key not in cache:
+            cache[key] = classify_repo_files(
+                self.repo_path,
+                ignores=ignores,
+                tracked_files=tracked_files,
+                filesystem=self.filesystem,
+                categories=categories,
+            )
+        return cache[key]
+
     def read(self) -> list[Path]:
         """
         Read the directory content.
         """
         try:
-            return list(self.path.iterdir())
+            return self.filesystem.iterdir(self.path)
         except Exception:
             return []
 
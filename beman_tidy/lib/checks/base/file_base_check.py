@@ -3,12 +3,15 @@
 
 from abc import abstractmethod
 from collections.abc import Callable, Iterable
-import re
 from pathlib import Path
 
-from beman_tidy.lib.utils.string import normalize_path_for_display
 from .base_check import BaseCheck
-from ...utils.config import is_ignored, get_ignores
+from ...utils.analysis import FileFacts, analyze_lines, get_file_facts
+from ...utils.budget import BudgetExceeded, checkpoint, time_budget
+from ...utils.cache import invalidate_cached_file
+from ...utils.config import is_ignored, get_ignores, get_max_file_size, get_timeout
+from ...utils.document import Document
+from ...utils.sniff import FileKind, sniff_file, sniff_head
 
 
 class FileBaseCheck(BaseCheck):
@@ -16,12 +19,20 @@ class FileBaseCheck(BaseCheck):
     Base class for checks that operate on a file.
     """
 
+    # True for checks that only read the head of the file (e.g., the license header): an oversized file is then
+    # checked on its first max_file_size bytes instead of being skipped (see document()), but it is not fixed.
+    head_only = False
+
     def __init__(self, repo_info, beman_standard_check_config, relative_path, name=None):
         super().__init__(repo_info, beman_standard_check_config, name=name)
         self.relative_path = Path(relative_path)
 
         # set a path - e.g. "README.md"
         self.path = self.repo_path / relative_path
+        # The file content, opened on first use (see document()).
+        self._document = None
+        # Why the file is not checked (see should_skip()), if it is skipped because of its content.
+        self.skipped_kind: FileKind | None = None
 
     def pre_check(self):
         """
@@ -35,25 +46,74 @@ class FileBaseCheck(BaseCheck):
             self.log("The path is not set.")
             return False
 
-        if not self.path.exists():
-            display_path = normalize_path_for_display(self.path, self.repo_path)
-            self.log(f"The file '{display_path}' does not exist.")
+        if not self.filesystem.exists(self.path):
+            self.log("The file '{path}' does not exist.", path=self.path)
             return False
 
         if self.is_empty():
-            display_path = normalize_path_for_display(self.path, self.repo_path)
-            self.log(f"The file '{display_path}' is empty.")
+            self.log("The file '{path}' is empty.", path=self.path)
             return False
 
         return True
 
     def should_skip(self):
         """
-        Check if the file should be skipped based on configuration.
+        Check if the file should be skipped based on configuration,
+        or because its content is not text (binary, Git LFS pointer, larger than max_file_size).
+        The kind of a file skipped because of its content is kept in skipped_kind, to report it.
         """
         if super().should_skip():
             return True
-        return is_ignored(self.repo_info, self.relative_path)
+        if is_ignored(self.repo_info, self.relative_path):
+            return True
+
+        kind = self.content_kind()
+        if kind is None or kind is FileKind.TEXT:
+            return False
+        self.skipped_kind = kind
+        if kind is FileKind.OVERSIZED:
+            self.log(
+                "The file '{path}' was not checked: it is larger than max_file_size ({max_file_size} bytes).",
+                log_level="skipped",
+                path=self.path,
+                max_file_size=get_max_file_size(self.repo_info),
+            )
+        else:
+            self.log(
+                "The file '{path}' was not checked: it is a {kind} file.",
+                log_level="skipped",
+                path=self.path,
+                kind=kind.value,
+            )
+        return True
+
+    def file_kind(self) -> FileKind | None:
+        """
+        Classify the file without reading it entirely (see sniff_file()), or None if it cannot be read.
+        """
+        try:
+            return sniff_file(self.path, self.filesystem, get_max_file_size(self.repo_info))
+        except OSError:
+            return None
+
+    def content_kind(self) -> FileKind | None:
+        """
+        Classify the content read by the check: as file_kind(), except that only the head of
+        an oversized file is classified for head-only checks (see head_only).
+        """
+        kind = self.file_kind()
+        if kind is FileKind.OVERSIZED and self.head_only:
+            try:
+                return sniff_head(self.path, self.filesystem)
+            except OSError:
+                return None
+        return kind
+
+    def reads_head(self) -> bool:
+        """
+        True if only the head of the file is read (an oversized file of a head-only check): it cannot be fixed.
+        """
+        return self.head_only and self.file_kind() is FileKind.OVERSIZED
 
     @abstractmethod
     def check(self):
@@ -69,26 +129,67 @@ class FileBaseCheck(BaseCheck):
         """
         pass
 
+    def document(self) -> Document | None:
+        """
+        Get the content of the file, opened once per check (memory-mapped if big, see Document).
+        Returns None if the file cannot be read, or is not a text file (see should_skip()).
+        Only the first max_file_size bytes of an oversized file are read, by head-only checks (see reads_head()).
+        Substring searches on the document do not decode the file; prefer them to read() when possible.
+        """
+        if self._document is None:
+            if self.content_kind() is not FileKind.TEXT:
+                return None
+            try:
+                if self.reads_head():
+                    self._document = Document.open_head(
+                        self.path, get_max_file_size(self.repo_info), self.filesystem
+                    )
+                else:
+                    self._document = Document.open(self.path, self.filesystem)
+            except Exception:
+                return None
+        return self._document
+
+    def _close_document(self):
+        if self._document is not None:
+            try:
+                self._document.close()
+            except BufferError:
+                pass  # A slice is still in use: the map is released with it.
+            self._document = None
+
     def read(self) -> str:
         """
-        Read the file content.
+        Read the file content ("" if it cannot be read, or is not a text file - see should_skip()).
         """
+        document = self.document()
         try:
-            with open(self.path, "r") as file:
-                return file.read()
+            return document.text() if document is not None else ""
         except Exception:
             return ""
 
     def read_lines(self) -> list[str]:
         """
-        Read the file content as lines.
+        Read the file content as lines ([] if it cannot be read, or is not a text file - see should_skip()).
         """
+        document = self.document()
         try:
-            with open(self.path, "r") as file:
-                return file.readlines()
+            return document.lines() if document is not None else []
         except Exception:
             return []
 
+    def facts(self) -> FileFacts:
+        """
+        Get the facts extracted from the file by the shared single-pass analyser.
+        The file is read at most once per run, no matter how many checks query it
+        (the head read by a head-only check is analysed on its own, see reads_head()).
+        """
+        if self.content_kind() is not FileKind.TEXT:
+            return FileFacts()
+        if self.reads_head():
+            return analyze_lines(self.read_lines())
+        return get_file_facts(self.path, self.filesystem)
+
     def read_lines_strip(self) -> list[str]:
         """
         Read the file content as lines and strip them.
@@ -98,19 +199,29 @@ class FileBaseCheck(BaseCheck):
     def write(self, content):
         """
         Write the content to the file.
-        """
+        With --fix-inplace, the content is recorded in the edit buffer of the run (see EditBuffer):
+        later reads see it, and the file is written once at the end of the run.
+        """
+        if not self.filesystem.writable:
+            self.log("Cannot write the file '{path}': the repository is read-only.", path=self.path)
+            return
+        if self.reads_head():
+            self.log("Cannot write the file '{path}': only its head was read.", path=self.path)
+            return
+
+        invalidate_cached_file(self.path)
+        self._close_document()
         try:
-            with open(self.path, "w") as file:
-                file.write(content)
+            self.filesystem.write_text(self.path, content)
         except Exception as e:
-            display_path = normalize_path_for_display(self.path, self.repo_path)
-            self.log(f"Error writing the file '{display_path}': {e}")
+            self.log("Error writing the file '{path}': {error}", path=self.path, error=e)
 
     def write_lines(self, lines):
         """
-        Write the lines to the file.
+        Write the lines to the file, each one terminated by exactly one line break.
+        Lines can come with their line break (as from read_lines()) or without it.
         """
-        self.write("\n".join(lines))
+        self.write("".join(line if line.endswith("\n") else line + "\n" for line in lines))
 
     def replace_line(self, line_number, new_line):
         """
@@ -120,22 +231,43 @@ class FileBaseCheck(BaseCheck):
         lines[line_number] = new_line
         self.write_lines(lines)
 
+    def _column_of(self, line_index, *markers) -> int | None:
+        """
+        The 1-based column of the first of the markers found (case-insensitive) in the line, for diagnostics.
+        Only the line is decoded. Returns None if no marker is found or the line cannot be read.
+        """
+        if not self.log_enabled:
+            return None  # Nothing is logged.
+        document = self.document()
+        try:
+            line = document.line(line_index).lower()
+        except Exception:
+            return None
+        columns = [line.find(marker.lower()) for marker in markers]
+        columns = [column for column in columns if column != -1]
+        return min(columns) + 1 if columns else None
+
     def is_empty(self):
         """
-        Check if the file is empty.
+        Check if the file is empty (or cannot be read). The content is not read.
         """
-        return len(self.read()) == 0
+        try:
+            return self.filesystem.size(self.path) == 0
+        except OSError:
+            return True
 
     def has_content(self, content_to_match) -> bool:
         """
         Check if the file contains the given content (literal string match).
         """
-        readme_content = self.read()
-        if not readme_content or len(readme_content) == 0:
+        document = self.document()
+        if document is None or len(document) == 0:
             return False
 
-        escaped_content_to_match: str = re.escape(str(content_to_match))
-        return re.search(escaped_content_to_match, readme_content) is not None
+        try:
+            return document.contains(str(content_to_match))
+        except Exception:
+            return False
 
 
 class BatchFileBaseCheck(BaseCheck):
@@ -148,6 +280,11 @@ class BatchFileBaseCheck(BaseCheck):
         self.beman_standard_check_config = beman_standard_check_config
         self.file_check_class: type[FileBaseCheck] | None = None
         self.file_path_generator: Callable[..., Iterable[Path | str]] | None = None
+        # Files that exceeded the per-file time budget (see get_timeout()) in the last batch operation.
+        self.timed_out_files: list[Path] = []
+        # Files that were not checked because of their content (see FileBaseCheck.should_skip())
+        # in the last batch operation.
+        self.unchecked_files: list[Path] = []
 
     def _validate(self):
         """
@@ -171,53 +308,102 @@ class BatchFileBaseCheck(BaseCheck):
         file_check.name = self.name
 
         file_check.log_enabled = self.log_enabled
-        
+
         if file_check.should_skip():
+            if file_check.skipped_kind is not None:
+                self.unchecked_files.append(Path(relative_path))
             return None
-            
+
         if not file_check.pre_check():
             return False
 
         return file_check
 
-    def _run_batch_operation(self, operation_callback):
+    def _run_batch_operation(self, operation_callback, memoize=False):
         """
         Runs a batch operation on all files.
         @param operation_callback: A function that takes a file_check instance and returns True if successful.
+        @param memoize: Whether the per-file results can be reused (read-only operations only).
         @return: True if all operations were successful.
+        Raises BudgetExceeded if some files exceeded the per-file time budget and all other files were successful
+        (the result is unknown); these files are skipped and logged, the remaining files are still processed.
         """
         self._validate()
         assert self.file_path_generator is not None
 
         ignores = get_ignores(self.repo_info)
 
-        all_files = self.file_path_generator(self.repo_path, ignores=ignores)
+        all_files = self.file_path_generator(
+            self.repo_path,
+            ignores=ignores,
+            tracked_files=self.repo_info.get("tracked_files"),
+            filesystem=self.filesystem,
+        )
+        file_timeout = get_timeout(self.repo_info, "file")
         all_successful = True
-        
+        self.timed_out_files = []
+        self.unchecked_files = []
+        timeout = None
+
         for relative_path in all_files:
-            file_check = self._create_and_init_file_check(relative_path)
-
-            if file_check is None:
-                continue
-            if file_check is False:
-                all_successful = False
-                continue
-            if not operation_callback(file_check):
-                all_successful = False
-        
+            checkpoint()
+            try:
+                with time_budget(file_timeout, Path(relative_path).as_posix()) as budget:
+                    if not self._run_file_operation(relative_path, operation_callback, memoize):
+                        all_successful = False
+            except BudgetExceeded as e:
+                if e.budget is not budget:
+                    raise  # The budget of the whole check is exhausted.
+                self.log(
+                    "The file '{path}' was not checked: it exceeded the time budget of {timeout:g}s.",
+                    path=relative_path,
+                    timeout=file_timeout,
+                )
+                self.timed_out_files.append(Path(relative_path))
+                timeout = e
+
+        if all_successful and timeout is not None:
+            raise timeout
         return all_successful
 
+    def _run_file_operation(self, relative_path, operation_callback, memoize):
+        """
+        Runs the operation on one file. Returns False if it failed.
+        If memoize is set and repo_info["file_results"] is a dict (e.g., beman-tidy history),
+        results are reused for files with the same content (see filesystem.content_id()).
+        """
+        file_results = self.repo_info.get("file_results") if memoize else None
+        key = None
+        if file_results is not None:
+            content_id = self.filesystem.content_id(self.repo_path / relative_path)
+            if content_id is not None:
+                key = (self.name, Path(relative_path).as_posix(), content_id)
+                if key in file_results:
+                    return file_results[key]
+
+        file_check = self._create_and_init_file_check(relative_path)
+        if file_check is None:
+            result = True
+        elif file_check is False:
+            result = False
+        else:
+            result = bool(operation_callback(file_check))
+
+        if key is not None:
+            file_results[key] = result
+        return result
+
     def check(self):
         """
         Runs the actual check on all target files.
         Returns True if all files pass the check.
         """
-        return self._run_batch_operation(lambda fc: fc.check())
+        return self._run_batch_operation(lambda fc: fc.check(), memoize=True)
 
     def fix(self):
         """
         Runs the fix on all source files.
         Returns True if all files are fixed (or were already correct).
         """
-        # If the check passes, it's good. If not, try the fix.
-        return self._run_batch_operation(lambda fc: fc.check() or fc.fix())
+        # If the check passes, it's good. If not, try the fix (unless only the head of the file was read).
+        return self._run_batch_operation(lambda fc: fc.check() or (not fc.reads_head() and fc.fix()))
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+# Import all the implemented checks, so that importing this package registers them
+# (see register_beman_standard_check()). A new check module must be added here.
+from . import cmake  # noqa: F401
+from . import cpp  # noqa: F401
+from . import directory  # noqa: F401
+from . import file  # noqa: F401
+from . import general  # noqa: F401
+from . import license  # noqa: F401
+from . import readme  # noqa: F401
+from . import release  # noqa: F401
+from . import repository  # noqa: F401
+from . import toplevel  # noqa: F401
@@ -8,6 +8,7 @@ import cmake_parser
 from cmake_parser.ast import AstNode, Command
 
 from ..system.registry import register_beman_standard_check
+from ..base.base_check import CheckInputs
 from ..base.file_base_check import FileBaseCheck
 
 # [cmake.*] checks category.
@@ -41,6 +42,8 @@ class CMakeBaseCheck(FileBaseCheck, ABC):
         repo_info: Contains information about the repository being checked.
         beman_standard_check_config: Configuration settings for the Beman standard checks.
     """
+    inputs = CheckInputs(files=("CMakeLists.txt",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "CMakeLists.txt")
 
@@ -3,10 +3,9 @@
 
 from abc import ABC
 
+from ..base.base_check import CheckInputs
 from ..base.directory_base_check import DirectoryBaseCheck
 from ..system.registry import register_beman_standard_check
-from beman_tidy.lib.utils.string import normalize_path_for_display
-from ...utils.config import is_ignored
 
 
 # [directory.*] checks category.
@@ -46,16 +45,6 @@ def _get_tolerated_root_files():
     """
     return {"README.md", "CONTRIBUTING.md"}
 
-def _get_paper_extensions():
-    """
-    Returns a list of file extensions that are "paper-related".
-    """
-    return [
-        ".md", ".bib", ".bst", ".tex", ".sty", ".cls", ".pdf", ".docx",
-        ".org", ".html", ".css", ".js", ".asciidoc", ".asc", ".ad",
-        ".ascdoc", ".rst", ".wip", ".draft", ".proposal", ".standard",
-    ]
-
 # TODO directory.interface_headers
 
 
@@ -71,6 +60,8 @@ class DirectorySourcesCheck(BemanTreeDirectoryCheck):
     Example for a repo named "exemplar": src/beman/exemplar
     """
 
+    inputs = CheckInputs(directories=("src", "source", "sources", "lib", "library"))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "src")
 
@@ -85,15 +76,16 @@ class DirectorySourcesCheck(BemanTreeDirectoryCheck):
         forbidden_source_locations = ["source/", "sources/", "lib/", "library/"]
         for forbidden_prefix in forbidden_source_locations:
             forbidden_prefix = self.repo_path / forbidden_prefix
-            if forbidden_prefix.exists():
-                display_path = normalize_path_for_display(forbidden_prefix, self.repo_path)
+            if self.filesystem.exists(forbidden_prefix):
                 self.log(
-                    f"Please move source files from {display_path} to src/beman/{self.short_name}. See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#directorysources for more information."
+                    "Please move source files from {path} to src/beman/{short_name}. See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#directorysources for more information.",
+                    path=forbidden_prefix,
+                    short_name=self.short_name,
                 )
                 return False
 
         # If `src/` exists, src/beman/<short_name> also should exist.
-        if (self.repo_path / "src/").exists() and not self.path.exists():
+        if self.filesystem.exists(self.repo_path / "src/") and not self.filesystem.exists(self.path):
             self.log(
                 f"Please use the required source files location: src/beman/{self.short_name}. See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#directorysources for more information."
             )
@@ -139,6 +131,8 @@ class DirectoryTestsCheck(BemanTreeDirectoryCheck):
                 └── test_utilities.hpp
     """
 
+    inputs = CheckInputs(directories=("tests",), categories=("test", "cmake"))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "tests")
 
@@ -149,18 +143,15 @@ class DirectoryTestsCheck(BemanTreeDirectoryCheck):
             exclude_dirs.append("cookiecutter")
 
         # Find all test files in the repository outside the excluded directories.
-        misplaced_test_files = []
-        for p in self.repo_path.rglob("*.test.*"):
-            rel_p = p.relative_to(self.repo_path).as_posix()
-            if not any(excluded in rel_p for excluded in exclude_dirs):
-                if not is_ignored(self.repo_info, p.relative_to(self.repo_path)):
-                    misplaced_test_files.append(p)
+        repo_files = self.repo_files()
+        misplaced_test_files = [
+            self.repo_path / p for p in repo_files.get("test", exclude=exclude_dirs)
+        ]
 
         # Check if any test files are misplaced outside the excluded directories.
         if len(misplaced_test_files) > 0:
             for misplaced_test_file in misplaced_test_files:
-                display_path = normalize_path_for_display(misplaced_test_file, self.repo_path)
-                self.log(f"Misplaced test file found: {display_path}")
+                self.log("Misplaced test file found: {path}", path=misplaced_test_file)
 
             self.log(
                 "Please move all test files within the tests/ directory. "
@@ -169,8 +160,8 @@ class DirectoryTestsCheck(BemanTreeDirectoryCheck):
             return False
 
         # Check if the repository has at least one relevant test inside tests/beman/<short_name>.
-        relevant_test_files = list(self.path.rglob("*.test.*"))
-        relevant_cmake_files = list(self.path.rglob("CMakeLists.txt"))
+        relevant_test_files = repo_files.get("test", under=self.relative_path)
+        relevant_cmake_files = repo_files.get("cmake", under=self.relative_path)
 
         if len(relevant_test_files) == 0 or len(relevant_cmake_files) == 0:
             self.log(
@@ -191,6 +182,8 @@ class DirectoryTestsCheck(BemanTreeDirectoryCheck):
 
 @register_beman_standard_check("directory.examples")
 class DirectoryExamplesCheck(DirectoryBaseCheck):
+    inputs = CheckInputs(directories=("examples",), categories=("example", "cmake"))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "examples")
 
@@ -204,14 +197,15 @@ class DirectoryExamplesCheck(DirectoryBaseCheck):
         └── identity_direct_usage.cpp
         """
         # Check if the examples/ directory contains at least one relevant example.
-        if len(list(self.path.glob("**/*.cpp"))) == 0:
+        repo_files = self.repo_files()
+        if len(repo_files.get("example", under=self.relative_path)) == 0:
             self.log(
                 "Missing one relevant example - cannot find examples/**/*.cpp. "
                 "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#directoryexamples for more information."
             )
             return False
 
-        if len(list(self.path.glob("**/*CMakeLists.txt"))) == 0:
+        if len(repo_files.get("cmake", under=self.relative_path)) == 0:
             self.log(
                 "Missing CMakeLists.txt for examples - cannot find examples/**/*CMakeLists.txt. "
                 "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#directoryexamples for more information."
@@ -235,6 +229,8 @@ class DirectoryDocsCheck(DirectoryBaseCheck):
     Exception: root README.md and CONTRIBUTING.md files.
     """
 
+    inputs = CheckInputs(directories=("docs",), categories=("doc",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "docs")
 
@@ -246,7 +242,7 @@ class DirectoryDocsCheck(DirectoryBaseCheck):
     def check(self):
         # Exclude directories that are not part of the documentation.
         exclude_dirs = ["src", "papers", "examples", ".github", "infra"]
-        if self.path.exists():
+        if self.filesystem.exists(self.path):
             exclude_dirs.append("docs")
         if self.short_name == "exemplar":
             exclude_dirs.append("cookiecutter")
@@ -255,18 +251,15 @@ class DirectoryDocsCheck(DirectoryBaseCheck):
 
         # Find all MD files in the repository.
         misplaced_md_files = [
-            p
-            for p in self.repo_path.rglob("*.md")
-            if not any(excluded in p.relative_to(self.repo_path).as_posix().split('/') for excluded in exclude_dirs)
-            and p.name not in tolerated_files
-            and not is_ignored(self.repo_info, p.relative_to(self.repo_path))
+            self.repo_path / p
+            for p in self.repo_files().get("doc", exclude=exclude_dirs)
+            if p.name not in tolerated_files
         ]
 
         # Check if any MD files are misplaced.
         if len(misplaced_md_files) > 0:
             for misplaced_md_file in misplaced_md_files:
-                display_path = normalize_path_for_display(misplaced_md_file, self.repo_path)
-                self.log(f"Misplaced MD file found: {display_path}")
+                self.log("Misplaced MD file found: {path}", path=misplaced_md_file)
 
             self.log(
                 f"Please move all documentation files within the docs/ directory, except for root files: {', '.join(tolerated_files)}. "
@@ -293,6 +286,8 @@ class DirectoryPapersCheck(DirectoryBaseCheck):
     Check if all paper-related files reside within papers/ directory.
     """
 
+    inputs = CheckInputs(directories=("papers",), categories=("paper",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "papers")
 
@@ -313,30 +308,23 @@ class DirectoryPapersCheck(DirectoryBaseCheck):
         """
         # Exclude directories that are not part of the papers/ directory.
         exclude_dirs = ["src", "docs", "examples", ".github", "infra", "antora"]
-        if self.path.exists():
+        if self.filesystem.exists(self.path):
             exclude_dirs.append("papers")
         if self.short_name == "exemplar":
             exclude_dirs.append("cookiecutter")
 
-        paper_extensions = _get_paper_extensions()
         tolerated_files = _get_tolerated_root_files()
 
         # Find all misplaced paper-related files in the repository.
-        misplaced_paper_files = []
-        for extension in paper_extensions:
-            for p in self.repo_path.rglob(f"*{extension}"):
-                # Exclude files that are already in excluded directories.
-                if (
-                    not any(excluded in p.relative_to(self.repo_path).as_posix() for excluded in exclude_dirs)
-                    and p.name not in tolerated_files
-                    and not is_ignored(self.repo_info, p.relative_to(self.repo_path))
-                ):
-                    misplaced_paper_files.append(p)
+        misplaced_paper_files = [
+            self.repo_path / p
+            for p in self.repo_files().get("paper", exclude=exclude_dirs)
+            if p.name not in tolerated_files
+        ]
 
         if len(misplaced_paper_files) > 0:
             for misplaced_paper_file in misplaced_paper_files:
-                display_path = normalize_path_for_display(misplaced_paper_file, self.repo_path)
-                self.log(f"Misplaced paper file found: {display_path}")
+                self.log("Misplaced paper file found: {path}", path=misplaced_paper_file)
 
             self.log(
                 f"Please move all paper related files (and directories if applicable) within the papers/ directory, except for root files: {', '.join(tolerated_files)}. "
@@ -3,11 +3,18 @@
 
 from typing import Optional
 
+from ..base.base_check import CheckInputs
 from ..base.file_base_check import FileBaseCheck, BatchFileBaseCheck
 from ..system.registry import register_beman_standard_check
-from ...utils.file import get_cpp_files, get_spdx_info, get_commentable_files, get_non_test_cpp_files, get_test_files
-from ...utils.string import normalize_path_for_display
-from ...utils.comments import find_in_comment, CommentType, BLOCK_ENDS, BLOCK_STARTS, LINE_PREFIXES
+from ...utils.analysis import (
+    COPYRIGHT_MARKERS_RE,
+    SPDX_MARKER_BYTES,
+    SPDX_MAX_LINE,
+    find_copyright_search_start,
+    get_cached_file_facts,
+)
+from ...utils.file import find_spdx_index, get_cpp_files, get_spdx_info, get_commentable_files, get_non_test_cpp_files, get_test_files
+from ...utils.comments import build_comment_map, CommentType, BLOCK_ENDS, BLOCK_STARTS, LINE_PREFIXES
 
 # [file.*] checks category.
 # All checks in this file extend the BaseCheck class.
@@ -20,6 +27,8 @@ class FileNamesCheck(BatchFileBaseCheck):
     Recommendation: File names must be lowercase and use snake_case.
     """
 
+    inputs = CheckInputs(categories=("cpp",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
         self.file_check_class = self.FileNamesCheckImpl
@@ -44,19 +53,16 @@ class FileNamesCheck(BatchFileBaseCheck):
             )
 
             if not is_valid:
-                display_path = normalize_path_for_display(self.path, self.repo_path)
                 self.log(
-                    f"File name {display_path} does not follow the snake_case naming convention. "
-                    f"See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#filenames"
+                    "File name {path} does not follow the snake_case naming convention.",
+                    path=self.path,
+                    fix_hint="See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#filenames",
                 )
                 return False
             return True
 
         def fix(self):
-            display_path = normalize_path_for_display(self.path, self.repo_path)
-            self.log(
-                f"Please manually rename {display_path} to follow the snake_case naming convention."
-            )
+            self.log("Please manually rename {path} to follow the snake_case naming convention.", path=self.path)
             return False
 
 
@@ -67,6 +73,8 @@ class FileTestNamesCheck(BatchFileBaseCheck):
     Requirement: Test source code files must use the *.test.cpp naming convention.
     """
 
+    inputs = CheckInputs(categories=("cpp",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
         self.file_check_class = self.FileTestNamesCheckImpl
@@ -85,20 +93,17 @@ class FileTestNamesCheck(BatchFileBaseCheck):
         def check(self):
             filename = self.path.name
             if filename.endswith(".cpp") and not filename.endswith(".test.cpp"):
-                display_path = normalize_path_for_display(self.path, self.repo_path)
                 self.log(
-                    f"Test source code file {display_path} does not follow the *.test.cpp naming convention. "
-                    f"See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#filetest_names"
+                    "Test source code file {path} does not follow the *.test.cpp naming convention.",
+                    path=self.path,
+                    fix_hint="See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#filetest_names",
                 )
                 return False
             return True
 
         def fix(self):
             # Renaming files automatically would require updating build systems.
-            display_path = normalize_path_for_display(self.path, self.repo_path)
-            self.log(
-                f"Please manually rename {display_path} to follow the *.test.cpp naming convention."
-            )
+            self.log("Please manually rename {path} to follow the *.test.cpp naming convention.", path=self.path)
             return False
 
 
@@ -110,7 +115,9 @@ class FileLicenseIdCheck(BatchFileBaseCheck):
     in all files that can contain a comment (C++, CMake, Python, shell, YAML, etc.).
     """
 
-    SPDX_MAX_LINE = 25
+    inputs = CheckInputs(categories=("commentable",))
+
+    SPDX_MAX_LINE = SPDX_MAX_LINE
 
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
@@ -122,41 +129,73 @@ class FileLicenseIdCheck(BatchFileBaseCheck):
         Implementation of the "file.license_id" check for a single file.
         """
 
+        head_only = True
+
         def __init__(self, repo_info, beman_standard_check_config, relative_path):
             super().__init__(repo_info, beman_standard_check_config, relative_path, name="file.license_id")
 
+        def _find_spdx_index(self, in_head):
+            # Find the marker in the raw bytes of the first SPDX_MAX_LINE lines (in_head), or of the rest of the file:
+            # nothing is decoded, and the rest of the file is not read (nor paged in, if memory-mapped)
+            # unless it is searched.
+            document = self.document()
+            if document is None:
+                return -1
+            end = document.head_end(FileLicenseIdCheck.SPDX_MAX_LINE)
+            offset = document.find(SPDX_MARKER_BYTES, 0, end) if in_head else document.find(SPDX_MARKER_BYTES, end)
+            return document.line_index_at(offset) if offset != -1 else -1
+
         def check(self):
-            lines = self.read_lines()
-            spdx_index, _ = get_spdx_info(lines)
-            display_path = normalize_path_for_display(self.path, self.repo_path)
+            # Reuse the facts if another check already analysed this file (the marker is searched in the head only).
+            facts = get_cached_file_facts(self.path, self.filesystem)
+            spdx_index = facts.spdx_index if facts is not None else self._find_spdx_index(in_head=True)
+            if spdx_index != -1:
+                return True
 
-            if spdx_index == -1:
-                self.log(
-                    f"Missing SPDX-License-Identifier in {display_path}. "
-                    f"Please add it within the first {FileLicenseIdCheck.SPDX_MAX_LINE} lines. "
-                    f"See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#filelicense_id"
-                )
-                return False
+            self._log_spdx_not_in_head()
+            return False
+
+        def _log_spdx_not_in_head(self):
+            """
+            Report a file without the marker in its first SPDX_MAX_LINE lines: the rest of the file is only searched
+            for the diagnostic (missing, or too late), which is always the same when it is emitted.
+            """
+            if not self.log_enabled:
+                return  # Nothing is logged: the rest of the file is not read.
 
-            if spdx_index >= FileLicenseIdCheck.SPDX_MAX_LINE:
+            spdx_index = self._find_spdx_index(in_head=False)
+            if spdx_index == -1:
                 self.log(
-                    f"SPDX-License-Identifier must be within the first {FileLicenseIdCheck.SPDX_MAX_LINE} lines in {display_path}, "
-                    f"but found at line {spdx_index + 1}. "
-                    f"See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#filelicense_id"
+                    "Missing SPDX-License-Identifier in {path}.",
+                    code="file.license_id.missing",
+                    path=self.path,
+                    fix_hint="Please add it within the first {max_line} lines. "
+                    "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#filelicense_id",
+                    max_line=FileLicenseIdCheck.SPDX_MAX_LINE,
                 )
-                return False
+                return
 
-            return True
+            self.log(
+                "SPDX-License-Identifier must be within the first {max_line} lines in {path}, "
+                "but found at line {line}.",
+                code="file.license_id.too_late",
+                path=self.path,
+                line=spdx_index + 1,
+                column=self._column_of(spdx_index, "SPDX-License-Identifier"),
+                fix_hint="See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#filelicense_id",
+                max_line=FileLicenseIdCheck.SPDX_MAX_LINE,
+            )
 
         def fix(self):
+            # Relocating the line needs the whole file.
             lines = self.read_lines()
-            spdx_index, _ = get_spdx_info(lines)
-            display_path = normalize_path_for_display(self.path, self.repo_path)
+            spdx_index = find_spdx_index(lines)
 
             if spdx_index == -1:
                 self.log(
-                    f"Cannot auto-fix {display_path}: SPDX-License-Identifier is missing. "
-                    f"Please add it manually."
+                    "Cannot auto-fix {path}: SPDX-License-Identifier is missing.",
+                    path=self.path,
+                    fix_hint="Please add it manually.",
                 )
                 return False
 
@@ -178,6 +217,8 @@ class FileCopyrightCheck(BatchFileBaseCheck):
     Recommendation: Source code files should NOT include a copyright notice following the SPDX license identifier.
     """
 
+    inputs = CheckInputs(categories=("cpp",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
         self.file_check_class = self.FileCopyrightCheckImpl
@@ -187,6 +228,9 @@ class FileCopyrightCheck(BatchFileBaseCheck):
         """
         Implementation of the "file.copyright" check for a single file.
         """
+
+        head_only = True
+
         def __init__(self, repo_info, beman_standard_check_config, relative_path):
             super().__init__(repo_info, beman_standard_check_config, relative_path, name="file.copyright")
 
@@ -196,33 +240,28 @@ class FileCopyrightCheck(BatchFileBaseCheck):
             This is the comment block immediately following the SPDX identifier.
             Returns (start_index, comment_type) or (None, None) if no further processing is needed.
             """
-            spdx_index, comment_type = get_spdx_info(lines)
-            if not self._has_valid_spdx(spdx_index, comment_type):
-                return None, None
-
-            start_index = spdx_index + 1
-            search_comment_type = comment_type
-            if self._is_single_line_block_comment(lines, spdx_index, comment_type):
-                next_index, next_comment_type = self._find_next_comment_start(lines, spdx_index + 1)
-                if next_index != -1:
-                    start_index = next_index
-                    search_comment_type = next_comment_type
-                else:
-                    return None, None
-
-            return start_index, search_comment_type
+            comment_map = build_comment_map(lines)
+            spdx_index, comment_type = get_spdx_info(lines, comment_map)
+            return find_copyright_search_start(lines, spdx_index, comment_type, comment_map)
 
         def check(self):
-            lines = self.read_lines()
-            start_search_index, search_comment_type = self._get_copyright_search_start_info(lines)
-            if start_search_index is None:
-                return True
-
-            # Start searching from the line after SPDX identifier
-            line_index, found_text = find_in_comment(lines, start_search_index, search_comment_type, ["copyright", "(c)"], ignore_case=True)
+            # Most files have no copyright text at all: look for it in the raw bytes first (without decoding
+            # the file), and only analyse the comments of the files that have some.
+            if get_cached_file_facts(self.path, self.filesystem) is None:
+                document = self.document()
+                if document is None or document.search(COPYRIGHT_MARKERS_RE) is None:
+                    return True
 
-            if line_index is not None:
-                self.log(f"Copyright notice found in {self.path.name} at line {line_index+1}. It should be removed.")
+            copyright_lines = self.facts().copyright_lines
+            if copyright_lines:
+                self.log(
+                    "Copyright notice found in {name} at line {line}.",
+                    path=self.path,
+                    line=copyright_lines[0] + 1,
+                    column=self._column_of(copyright_lines[0], "copyright", "(c)"),
+                    fix_hint="It should be removed.",
+                    name=self.path.name,
+                )
                 return False
 
             return True
@@ -245,35 +284,6 @@ class FileCopyrightCheck(BatchFileBaseCheck):
             self.write("".join(new_lines))
             return True
 
-        @staticmethod
-        def _has_valid_spdx(spdx_index, comment_type):
-            return spdx_index != -1 and comment_type is not None
-
-        @staticmethod
-        def _is_single_line_block_comment(lines, spdx_index, comment_info):
-            if comment_info == CommentType.BLOCK:
-                if any(end in lines[spdx_index] for end in BLOCK_ENDS):
-                    return True
-            return False
-
-        @staticmethod
-        def _find_next_comment_start(lines, start_index):
-            for i in range(start_index, len(lines)):
-                line = lines[i].strip()
-                if not line:
-                    continue
-
-                if any(line.startswith(prefix) for prefix in LINE_PREFIXES):
-                    return i, CommentType.LINE
-
-                if any(line.startswith(start) for start in BLOCK_STARTS):
-                    return i, CommentType.BLOCK
-
-                # Found non-comment code
-                return -1, None
-
-            return -1, None
-
         def _remove_lines_with_text_in_comment(self, lines, start_index, comment_type, texts, log_func=None):
             """
             Removes lines from the comment block that contain any of the texts.
@@ -3,13 +3,13 @@
 
 from abc import ABC
 
-from ..base.base_check import BaseCheck
+from ..base.base_check import BaseCheck, CheckInputs
 from ..base.file_base_check import FileBaseCheck
 from ..system.registry import register_beman_standard_check
-from beman_tidy.lib.utils.git import get_beman_recommended_license_path
-from beman_tidy.lib.utils.string import (
-    match_apache_license_v2_with_llvm_exceptions,
-    match_boost_software_license_v1_0
+from beman_tidy.lib.utils.license import (
+    APACHE_LLVM_LICENSE_ID,
+    get_license_match,
+    get_reference_license_text,
 )
 
 # [license.*] checks category.
@@ -19,6 +19,8 @@ from beman_tidy.lib.utils.string import (
 
 
 class LicenseBaseCheck(FileBaseCheck, ABC):
+    inputs = CheckInputs(files=("LICENSE",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "LICENSE")
 
@@ -29,18 +31,13 @@ class LicenseApprovedCheck(LicenseBaseCheck):
         super().__init__(repo_info, beman_standard_check_config)
 
     def check(self):
-        content = self.read()
-
-        if match_apache_license_v2_with_llvm_exceptions(content):
-            self.log(
-                "Valid Apache License - Version 2.0 with LLVM Exceptions found in LICENSE file.",
-                log_level="info",
-            )
-            return True
+        license_match = get_license_match(self.path, self.filesystem)
 
-        if match_boost_software_license_v1_0(content):
+        # The corpus only contains approved licenses.
+        if license_match is not None:
             self.log(
-                "Valid Boost Software License - Version 1.0 found in LICENSE file.",
+                f"Valid {license_match.license.name} found in LICENSE file "
+                f"(similarity with the reference text: {license_match.score:.2f}).",
                 log_level="info",
             )
             return True
@@ -66,7 +63,7 @@ class LicenseApacheLLVMCheck(LicenseBaseCheck):
     def check(self):
         # Compare LICENSE file stored at self.path with the reference one.
         target_content = self.read().splitlines()
-        ref_content = get_beman_recommended_license_path().read_text(encoding="utf-8").splitlines()
+        ref_content = get_reference_license_text(APACHE_LLVM_LICENSE_ID).splitlines()
 
         if target_content != ref_content:
             self.log(
@@ -4,13 +4,11 @@
 import re
 from abc import ABC
 
+from ..base.base_check import CheckInputs
 from ..base.file_base_check import FileBaseCheck, BaseCheck
 from ..system.registry import register_beman_standard_check
-from beman_tidy.lib.utils.string import (
-    match_apache_license_v2_with_llvm_exceptions,
-    match_boost_software_license_v1_0,
-    normalize_path_for_display,
-)
+from beman_tidy.lib.utils.markdown import MarkdownIndex, get_markdown_index
+from beman_tidy.lib.utils.license import identify_license
 
 
 # [readme.*] checks category.
@@ -18,9 +16,18 @@ from beman_tidy.lib.utils.string import (
 #
 # Note: ReadmeBaseCheck is not a registered check!
 class ReadmeBaseCheck(FileBaseCheck, ABC):
+    inputs = CheckInputs(files=("README.md",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, "README.md")
 
+    def markdown_index(self) -> MarkdownIndex:
+        """
+        Get the Markdown index of the README, shared by all readme.* checks.
+        The README is read and scanned only once per run.
+        """
+        return get_markdown_index(self.path, self.filesystem)
+
 
 @register_beman_standard_check("readme.purpose")
 class ReadmePurposeCheck(BaseCheck):
@@ -42,15 +49,18 @@ class ReadmeTitleCheck(ReadmeBaseCheck):
         super().__init__(repo_info, beman_standard_check_config)
 
     def check(self):
-        lines = self.read_lines_strip()
-        first_line = lines[0]
+        first_line = self.markdown_index().lines[0]
 
         # Match the pattern "# <self.library_name>[: <short_description>]"
         regex = rf"^# {re.escape(self.library_name)}: (.*)$"  # noqa: F541
         if not re.match(regex, first_line):
-            display_path = normalize_path_for_display(self.path, self.repo_path)
             self.log(
-                f"The first line of the file '{display_path}' is invalid. It should start with '# {self.library_name}: <short_description>'."
+                "The first line of the file '{path}' is invalid.",
+                path=self.path,
+                line=1,
+                column=1,
+                fix_hint="It should start with '# {library_name}: <short_description>'.",
+                library_name=self.library_name,
             )
             return False
 
@@ -84,8 +94,8 @@ class ReadmeBadgesCheck(ReadmeBaseCheck):
                     len(badges) == 2
                 )  # The number of standard targets specified in the Beman Standard.
 
-        def count_badges(badges):
-            return len([badge for badge in badges if self.has_content(badge)])
+        # One scan of the README for all badge categories.
+        badge_counts = self.config["values_matcher"].count(self.markdown_index().text)
 
         count_failed = 0
         for category_data in self.config["values"]:
@@ -93,10 +103,11 @@ class ReadmeBadgesCheck(ReadmeBaseCheck):
             badges = category_data[category]
             validate_badges(category, badges)
 
-            if count_badges(badges) != 1:
-                display_path = normalize_path_for_display(self.path, self.repo_path)
+            if badge_counts[category] != 1:
                 self.log(
-                    f"The file '{display_path}' does not contain exactly one required badge of category '{category}'."
+                    "The file '{path}' does not contain exactly one required badge of category '{category}'.",
+                    path=self.path,
+                    category=category,
                 )
                 count_failed += 1
 
@@ -115,7 +126,7 @@ class ReadmeImplementsCheck(ReadmeBaseCheck):
         super().__init__(repo_info, beman_standard_check_config)
 
     def check(self):
-        lines = self.read_lines_strip()
+        lines = self.markdown_index().label_lines("Implements")
 
         # Matches lines starting with "**Implements**:" that reference a WG21 paper
         # and include a corresponding https://wg21.link/Pxxxx[Rx] URL
@@ -138,9 +149,9 @@ class ReadmeImplementsCheck(ReadmeBaseCheck):
             return True
 
         # Invalid/missing/duplicate "Implements:" line
-        display_path = normalize_path_for_display(self.path, self.repo_path)
         self.log(
-            f"Invalid/missing/duplicate 'Implements:' line in '{display_path}'. See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#readmeimplements for more information."
+            "Invalid/missing/duplicate 'Implements:' line in '{path}'. See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#readmeimplements for more information.",
+            path=self.path,
         )
         return False
 
@@ -163,12 +174,13 @@ class ReadmeLibraryStatusCheck(ReadmeBaseCheck):
         statuses = self.config["values"]
         assert len(statuses) == len(self.beman_library_maturity_model)
 
-        # Check if at least one of the required status values is present.
-        status_count = len([status for status in statuses if self.has_content(status)])
-        if status_count != 1:
-            display_path = normalize_path_for_display(self.path, self.repo_path)
+        # Check if exactly one of the required status values is present.
+        status_counts = self.config["values_matcher"].count(self.markdown_index().text)
+        if sum(status_counts.values()) != 1:
             self.log(
-                f"The file '{display_path}' does not contain exactly one of the required statuses from {statuses}"
+                "The file '{path}' does not contain exactly one of the required statuses from {statuses}",
+                path=self.path,
+                statuses=statuses,
             )
             return False
 
@@ -188,28 +200,23 @@ class ReadmeLicenseCheck(ReadmeBaseCheck):
 
     def check(self):
         # Extract ## License section from the file.
-        content = self.read()
-        license_section = re.search(
-            r"^## License\n(.*?)\n##", content, re.DOTALL | re.MULTILINE
-        )
+        index = self.markdown_index()
+        license_section = index.section("License", level=2)
         if license_section is None:
-            display_path = normalize_path_for_display(self.path, self.repo_path)
             self.log(
-                f"The file '{display_path}' does not contain a `## License` section. "
-                "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#readmelicense."
+                "The file '{path}' does not contain a `## License` section. "
+                "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#readmelicense.",
+                path=self.path,
             )
             return False
 
-        # Check if the license section contains at least one of the required licenses.
-        license_text = license_section.group(1).strip()
-        if (
-            not match_apache_license_v2_with_llvm_exceptions(license_text)
-            and not match_boost_software_license_v1_0(license_text)
-        ):
-            display_path = normalize_path_for_display(self.path, self.repo_path)
+        # Check if the license section mentions one of the approved licenses.
+        license_text = index.section_text(license_section).strip()
+        if identify_license(license_text) is None:
             self.log(
-                f"The file '{display_path}' does not contain the required license. "
-                "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#readmelicense for the desired format."
+                "The file '{path}' does not contain the required license. "
+                "See https://github.com/bemanproject/beman/blob/main/docs/beman_standard.md#readmelicense for the desired format.",
+                path=self.path,
             )
             return False
 
@@ -4,7 +4,6 @@
 import re
 from beman_tidy.lib.checks.base.base_check import BaseCheck
 from beman_tidy.lib.checks.beman_standard.readme import ReadmeBaseCheck
-from beman_tidy.lib.utils.string import normalize_path_for_display
 from ..system.registry import register_beman_standard_check
 
 # [release.*] checks category.
@@ -70,14 +69,17 @@ class ReleaseGodboltTrunkVersionCheck(ReadmeBaseCheck):
         Note: Only the suffix of the https://godbolt.org/z/* has dynamic content.
         """
 
-        content = self.read()
-        regex = re.compile(
-            r"\[!\[Compiler Explorer Example\]\(https://img\.shields\.io/badge/Try%20it%20on%20Compiler%20Explorer-grey\?logo=compilerexplorer&logoColor=67c52a\)\]\(https://godbolt\.org/z/([a-zA-Z0-9]+)\)"
-        )
-        if not re.search(regex, content):
-            display_path = normalize_path_for_display(self.path, self.repo_path)
+        badge_image = "https://img.shields.io/badge/Try%20it%20on%20Compiler%20Explorer-grey?logo=compilerexplorer&logoColor=67c52a"
+        godbolt_link = re.compile(r"https://godbolt\.org/z/([a-zA-Z0-9]+)")
+        if not any(
+            badge.text == "Compiler Explorer Example"
+            and badge.url == badge_image
+            and godbolt_link.fullmatch(badge.href)
+            for badge in self.markdown_index().linked_images()
+        ):
             self.log(
-                f"The file '{display_path}' does not contain a Compiler Explorer badge - trunk version assumed to be missing."
+                "The file '{path}' does not contain a Compiler Explorer badge - trunk version assumed to be missing.",
+                path=self.path,
             )
             return False
 
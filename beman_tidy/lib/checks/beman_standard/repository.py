@@ -5,7 +5,7 @@ import re
 import textwrap
 
 from ..base.file_base_check import FileBaseCheck
-from ..base.base_check import BaseCheck
+from ..base.base_check import BaseCheck, CheckInputs
 from ..system.registry import register_beman_standard_check
 from ...utils.string import is_beman_snake_case
 
@@ -45,6 +45,8 @@ class RepositoryNameCheck(BaseCheck):
 
 @register_beman_standard_check("repository.default_branch")
 class RepositoryDefaultBranchCheck(BaseCheck):
+    inputs = CheckInputs(metadata=("default_branch",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config)
 
@@ -64,6 +66,8 @@ class RepositoryDefaultBranchCheck(BaseCheck):
 
 @register_beman_standard_check("repository.codeowners")
 class RepositoryCodeownersCheck(FileBaseCheck):
+    inputs = CheckInputs(files=(".github/CODEOWNERS",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, ".github/CODEOWNERS")
 
@@ -94,6 +98,8 @@ class RepositoryCodeReviewRulesCheck(BaseCheck):
 
 @register_beman_standard_check("repository.disallow_git_submodules")
 class RepositoryDisallowGitSubmodulesCheck(FileBaseCheck):
+    inputs = CheckInputs(files=(".gitmodules",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(repo_info, beman_standard_check_config, ".gitmodules")
 
@@ -102,7 +108,7 @@ class RepositoryDisallowGitSubmodulesCheck(FileBaseCheck):
         return True
 
     def check(self):
-        if self.path.exists():
+        if self.filesystem.exists(self.path):
             content = self.read()
 
             # Regex pattern to match "wg21" submodule
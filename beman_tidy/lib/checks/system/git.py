@@ -3,7 +3,7 @@
 
 import sys
 
-from ..base.base_check import BaseCheck
+from ..base.base_check import BaseCheck, CheckInputs
 
 
 class DisallowFixInplaceAndUnstagedChangesCheck(BaseCheck):
@@ -11,6 +11,8 @@ class DisallowFixInplaceAndUnstagedChangesCheck(BaseCheck):
     --fix-inplace requires no unstaged changes.
     """
 
+    inputs = CheckInputs(metadata=("unstaged_changes",))
+
     def __init__(self, repo_info, beman_standard_check_config):
         super().__init__(
             repo_info, beman_standard_check_config, "internal.no_unstaged_changes"
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import logging
+import sys
+
+from .checks.system.registry import get_registered_beman_standard_checks
+from .utils.budget import BudgetExceeded, time_budget
+from .utils.config import get_disabled_rules, get_timeout, is_rule_disabled, load_repo_config, set_timeouts
+from .utils.filesystem import GitTreeFS, get_git_object_store
+from .utils.string import red_color, green_color, yellow_color, gray_color, no_color
+
+# Import all the implemented checks (registers them).
+from .checks import beman_standard  # noqa: F401
+
+# Cell of the history matrix for each check status.
+STATUS_SYMBOLS = {
+    "passed": f"{green_color}.{no_color}",
+    "failed": f"{red_color}F{no_color}",
+    "skipped": f"{gray_color}-{no_color}",
+    "disabled": f"{gray_color} {no_color}",
+    "error": f"{red_color}E{no_color}",
+    "timeout": f"{yellow_color}T{no_color}",
+}
+
+
+class RevisionEvaluator:
+    """
+    Evaluate checks on commits straight from the git object database (no checkout).
+
+    Work is shared between commits:
+    - results for a whole tree are memoized by tree SHA (e.g., reverts, merges without changes),
+    - per-file results of batch checks are memoized by blob SHA (see BatchFileBaseCheck),
+    - derived file views (facts, Markdown index, license match) are cached by blob SHA,
+    - tree listings and blob contents are read once (see GitObjectStore).
+    So the cost of a scan grows with the number of distinct blobs, not with the number of commits.
+    """
+
+    def __init__(self, repo_info, beman_standard_check_config, config_path=None, timeouts=None):
+        """
+        @param timeouts: Time budgets overriding the configuration of each commit - e.g. {"check": 60}.
+        """
+        self.repo_info = repo_info
+        self.beman_standard_check_config = beman_standard_check_config
+        self.config_path = config_path
+        self.timeouts = timeouts or {}
+        self.store = get_git_object_store(repo_info["top_level"])
+        # tree SHA -> {check name: status}
+        self._tree_results = {}
+        # .beman-tidy.yaml blob SHA -> per-file results of batch checks (see BatchFileBaseCheck)
+        self._file_results = {}
+
+    def iter_commits(self, rev_range=None, last=None):
+        """
+        Get the commits to scan, oldest first: rev_range (e.g., "v1.0.0..HEAD", default: HEAD),
+        limited to the last N commits. Raises ValueError for an invalid range.
+        """
+        try:
+            commits = list(self.store.repo.iter_commits(rev_range or "HEAD", max_count=last))
+        except Exception as e:
+            raise ValueError(f"'{rev_range}' is not a valid revision range: {e}")
+        return list(reversed(commits))
+
+    def _revision_repo_info(self, filesystem):
+        config_id = filesystem.content_id(self.repo_info["top_level"] / ".beman-tidy.yaml")
+        repo_info = {
+            key: value
+            for key, value in self.repo_info.items()
+            if key not in ("compiled_ignores", "repo_file_index", "tracked_files")
+        }
+        repo_info["filesystem"] = filesystem
+        repo_info["rev"] = filesystem.rev
+        repo_info["commit_hash"] = filesystem.commit.hexsha
+        repo_info["config"] = load_repo_config(repo_info["top_level"], self.config_path, filesystem=filesystem)
+        set_timeouts(repo_info["config"], **self.timeouts)
+        repo_info["file_results"] = self._file_results.setdefault(config_id, {})
+        return repo_info
+
+    def evaluate(self, commit, check_names):
+        """
+        Evaluate the checks on the commit's tree (read-only, nothing is logged).
+        Returns {check name: status}, where status is one of STATUS_SYMBOLS.
+        """
+        tree_results = self._tree_results.setdefault(commit.tree.hexsha, {})
+        pending = [name for name in check_names if name not in tree_results]
+        if pending:
+            repo_info = self._revision_repo_info(GitTreeFS(self.repo_info["top_level"], commit.hexsha, self.store))
+            implemented_checks = get_registered_beman_standard_checks()
+            disabled_rules = get_disabled_rules(repo_info, self.beman_standard_check_config.keys())
+            for check_name in pending:
+                if is_rule_disabled(check_name, disabled_rules):
+                    tree_results[check_name] = "disabled"
+                else:
+                    tree_results[check_name] = self._evaluate_check(
+                        implemented_checks[check_name], repo_info
+                    )
+        return {name: tree_results[name] for name in check_names}
+
+    def _evaluate_check(self, check_class, repo_info):
+        try:
+            check_instance = check_class(repo_info, self.beman_standard_check_config)
+            if check_instance.should_skip():
+                return "skipped"
+            with time_budget(get_timeout(repo_info, "check"), f"check [{check_instance.name}]"):
+                return "passed" if check_instance.pre_check() and check_instance.check() else "failed"
+        except BudgetExceeded as e:
+            logging.debug(f"Timeout running check [{check_class.__name__}] on {repo_info['commit_hash']}: {e}")
+            return "timeout"
+        except Exception as e:
+            # Old revisions may contain anything: report the error and keep scanning.
+            logging.debug(f"Error running check [{check_class.__name__}] on {repo_info['commit_hash']}: {e}")
+            return "error"
+
+
+def is_bad_status(status) -> bool:
+    """
+    Bisection: a commit is bad if the check fails (or cannot run) on it.
+    A timeout does not tell whether the check passes, so it is not bad.
+    """
+    return status in ("failed", "error")
+
+
+def bisect_check(evaluator, check_name, good, bad, on_probe=None):
+    """
+    Find the first commit between good (exclusive) and bad (inclusive) on which the check is bad,
+    following first parents. Assumes the check stays bad once it turned bad: O(log n) evaluations.
+    on_probe(commit, status) is called after each evaluation.
+    Raises ValueError for invalid revisions, or if the check is not good at 'good' and bad at 'bad'.
+
+    @return: (first bad commit, number of evaluated commits).
+    """
+    good_commit = evaluator.store.resolve(good)
+    bad_commit = evaluator.store.resolve(bad)
+    if not evaluator.store.repo.is_ancestor(good_commit, bad_commit):
+        raise ValueError(f"'{good}' is not an ancestor of '{bad}'")
+
+    probes = 0
+
+    def probe(commit):
+        nonlocal probes
+        probes += 1
+        status = evaluator.evaluate(commit, [check_name])[check_name]
+        if on_probe is not None:
+            on_probe(commit, status)
+        return status
+
+    if is_bad_status(probe(good_commit)):
+        raise ValueError(f"'{check_name}' is already bad at '{good}'")
+    if not is_bad_status(probe(bad_commit)):
+        raise ValueError(f"'{check_name}' is not bad at '{bad}'")
+
+    # Oldest first; the last commit is bad_commit.
+    commits = list(reversed(list(evaluator.store.repo.iter_commits(
+        f"{good_commit.hexsha}..{bad_commit.hexsha}", first_parent=True
+    ))))
+    low, high = -1, len(commits) - 1
+    while high - low > 1:
+        middle = (low + high) // 2
+        if is_bad_status(probe(commits[middle])):
+            high = middle
+        else:
+            low = middle
+    return commits[high], probes
+
+
+def get_implemented_checks_to_run(checks_to_run, beman_standard_check_config):
+    """
+    Keep the checks that are implemented, in the Beman Standard order.
+    """
+    implemented_checks = get_registered_beman_standard_checks()
+    return [
+        name
+        for name in beman_standard_check_config
+        if name in implemented_checks and (checks_to_run is None or name in checks_to_run)
+    ]
+
+
+def run_history(args, beman_standard_check_config):
+    """
+    Evaluate the checks on the selected commits and print a pass/fail matrix: one row per commit
+    (oldest first), one column per check.
+
+    @return: The number of failed checks at the newest commit.
+    """
+    check_names = get_implemented_checks_to_run(args.checks, beman_standard_check_config)
+    evaluator = RevisionEvaluator(
+        args.repo_info, beman_standard_check_config, config_path=args.config, timeouts=args.timeouts
+    )
+    try:
+        commits = evaluator.iter_commits(args.rev_range, args.last)
+    except ValueError as e:
+        logging.error(f"Cannot scan the history of '{args.repo_info['top_level']}': {e}")
+        sys.exit(1)
+
+    # Legend: checks are numbered, the matrix header shows the numbers vertically.
+    for index, check_name in enumerate(check_names, 1):
+        logging.info(f"[{index:>2}] {check_name}")
+    logging.info("")
+    width = len(str(len(check_names)))
+    for digit in range(width):
+        digits = "".join(str(index).rjust(width)[digit] for index in range(1, len(check_names) + 1))
+        logging.info(f"{'':<19} {digits}")
+
+    results = {}
+    for commit in commits:
+        results = evaluator.evaluate(commit, check_names)
+        row = "".join(STATUS_SYMBOLS[results[name]] for name in check_names)
+        passed = sum(status == "passed" for status in results.values())
+        date = commit.committed_datetime.strftime("%Y-%m-%d")
+        summary = commit.summary if len(commit.summary) <= 50 else commit.summary[:47] + "..."
+        logging.info(f"{commit.hexsha[:7]} {date}  {row}  {passed:>3}/{len(check_names)}  {summary}")
+
+    sys.stdout.flush()
+    return sum(status in ("failed", "error") for status in results.values())
+
+
+def run_bisect(args, beman_standard_check_config):
+    """
+    Find the commit that made the check args.check go bad between args.good and args.bad.
+
+    @return: 0 if the first bad commit was found, 1 otherwise.
+    """
+    if args.check not in get_implemented_checks_to_run(None, beman_standard_check_config):
+        logging.error(f"Unknown or not implemented check '{args.check}'.")
+        return 1
+
+    def log_probe(commit, status):
+        logging.info(f"{commit.hexsha[:7]} {STATUS_SYMBOLS[status]} {status:<8} {commit.summary}")
+
+    evaluator = RevisionEvaluator(
+        args.repo_info, beman_standard_check_config, config_path=args.config, timeouts=args.timeouts
+    )
+    try:
+        commit, probes = bisect_check(evaluator, args.check, args.good, args.bad, on_probe=log_probe)
+    except ValueError as e:
+        logging.error(f"Cannot bisect '{args.check}': {e}")
+        return 1
+
+    logging.info(f"\n{commit.hexsha} is the first bad commit for [{args.check}] ({probes} commits checked).")
+    logging.info(f"    {commit.author.name} {commit.committed_datetime.strftime('%Y-%m-%d')}: {commit.summary}")
+    sys.stdout.flush()
+    return 0
@@ -1,42 +1,82 @@
 #!/usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
+import sqlite3
 import sys
 import logging
 
 from .checks.system.registry import get_registered_beman_standard_checks
 from .checks.system.git import DisallowFixInplaceAndUnstagedChangesCheck
-from .utils.config import get_disabled_rules, is_rule_disabled
+from .utils.budget import BudgetExceeded, time_budget
+from .reporters import JsonLinesReporter
+from .store import ResultsStore, RunRecorder
+from .utils.config import get_disabled_rules, get_timeout, is_rule_disabled
+from .utils.diagnostics import ConsoleRenderer, DiagnosticCollector
+from .utils.edits import get_edit_buffer
 from .utils.string import (
+    normalize_path_for_display,
     red_color,
     green_color,
     yellow_color,
     gray_color,
     no_color,
 )
+from .worker import CheckWorker
 
-# import all the implemented checks.
-# TODO: Consider removing F403 from ignored lint checks
-from .checks.beman_standard.cmake import *  # noqa: F401, F403
-from .checks.beman_standard.cpp import *  # noqa: F401, F403
-from .checks.beman_standard.directory import *  # noqa: F401, F403
-from .checks.beman_standard.file import *  # noqa: F401, F403
-from .checks.beman_standard.general import *  # noqa: F401, F403
-from .checks.beman_standard.license import *  # noqa: F401, F403
-from .checks.beman_standard.readme import *  # noqa: F401, F403
-from .checks.beman_standard.release import *  # noqa: F401, F403
-from .checks.beman_standard.repository import *  # noqa: F401, F403
-from .checks.beman_standard.toplevel import *  # noqa: F401, F403
+# Import all the implemented checks (registers them).
+from .checks import beman_standard  # noqa: F401
 
 
 def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
     """
     Run the checks pipeline for The Beman Standard.
     Read-only checks if args.fix_inplace is False, otherwise try to fix the issues in-place.
+    With args.fix_diff, the issues are fixed in memory only, and the fixes are written as a patch (see write_fix_diff()).
     Verbosity is controlled by args.verbose.
 
-    @return: The number of failed checks.
+    A check that exceeds its time budget (see get_timeout()) is reported as timed out.
+    The files that were not checked because of their content (binary, Git LFS pointer, larger than max_file_size)
+    are counted in the summary, whatever the verbosity.
+    Fixes are buffered (see EditBuffer): each fixed file is written once, at the end of the run.
+    With args.format == "jsonl", the results are also streamed to stdout as JSON Lines (see JsonLinesReporter).
+    With args.store, the run is recorded in a SQLite results store (see ResultsStore).
+
+    @return: The number of failed (or timed out) checks.
     """
+    check_timeout = get_timeout(args.repo_info, "check")
+    fix = args.fix_inplace or args.fix_diff is not None
+
+    # The diagnostics of the checks are printed in verbose mode, and sent to the reporters (if any).
+    reporters = []
+    if args.format == "jsonl":
+        reporters.append(JsonLinesReporter(sys.stdout))
+    store = None
+    recorder = None
+    if args.store is not None:
+        try:
+            store = ResultsStore(args.store)
+        except (sqlite3.Error, ValueError) as e:
+            logging.error(f"Cannot open the results store '{args.store}': {e}")
+            sys.exit(1)
+        recorder = RunRecorder(
+            store,
+            args.repo_info,
+            {
+                "checks": list(checks_to_run),
+                "require_all": args.require_all,
+                "fix": fix,
+                "rev": args.repo_info.get("rev"),
+            },
+        )
+        reporters.append(recorder)
+    renderers = ([ConsoleRenderer()] if args.verbose else []) + reporters
+    args.repo_info["diagnostics"] = DiagnosticCollector(renderers)
+    # Only the diagnostics that are emitted are built (e.g., their line and column): with a reporter, they all are,
+    # which costs time but does not change the results.
+    diagnostics_enabled = bool(renderers)
+    edits = get_edit_buffer(args.repo_info)
+    # The files that were not checked because of their content, by any check (see BatchFileBaseCheck).
+    unchecked_files = set()
 
     def log(msg):
         """
@@ -45,12 +85,12 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
         if args.verbose:
             logging.info(msg)
 
-    def run_check(check_class, log_enabled=args.verbose, require_all=args.require_all):
+    def run_check(check_class, log_enabled=diagnostics_enabled, require_all=args.require_all):
         """
         Helper function to run a check.
         @param check_class: The check class type to run.
         @param log_enabled: Whether to log the check result.
-        @return: True if the check passed, False otherwise.
+        @return: (check type, status), where status is "passed", "failed", "skipped" or "timeout".
         """
         check_instance = check_class(args.repo_info, beman_standard_check_config)
 
@@ -70,9 +110,20 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
         # Run the check on normal mode.
         log(f"Running check [{check_instance.type}][{check_instance.name}] ... ")
         check_instance.log_enabled = log_enabled
-        if (check_instance.pre_check() and check_instance.check()) or (
-            args.fix_inplace and check_instance.fix()
-        ):
+        try:
+            with time_budget(check_timeout, f"check [{check_instance.name}]"):
+                passed = (check_instance.pre_check() and check_instance.check()) or (
+                    fix and check_instance.fix()
+                )
+        except BudgetExceeded as e:
+            log(
+                f"\tcheck [{check_instance.type}][{check_instance.name}] ... {yellow_color}timeout{no_color} ({e})\n"
+            )
+            return check_instance.type, "timeout"
+        finally:
+            unchecked_files.update(path.as_posix() for path in getattr(check_instance, "unchecked_files", []))
+
+        if passed:
             log(
                 f"\tcheck [{check_instance.type}][{check_instance.name}] ... {green_color}passed{no_color}\n"
             )
@@ -83,6 +134,33 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
             )
             return check_instance.type, "failed"
 
+    def run_check_in_worker(worker, check_name):
+        """
+        Helper function to run a check in the worker process (see CheckWorker).
+        If the check does not stop at a cancellation point after its budget, the worker is killed.
+        @return: (check type, status), as run_check().
+        """
+        result = worker.run_check(check_name, check_timeout)
+        if result is not None:
+            result, pending_edits, diagnostic_rows, worker_unchecked_files = result
+            unchecked_files.update(worker_unchecked_files)
+            if edits is not None:
+                edits.merge(pending_edits)
+            if recorder is not None:
+                recorder.add_diagnostics(diagnostic_rows)
+            return result
+
+        check_type = (
+            beman_standard_check_config[check_name]["type"]
+            if not args.require_all
+            else "Requirement"
+        )
+        log(
+            f"\tcheck [{check_type}][{check_name}] ... {yellow_color}timeout{no_color} "
+            f"(killed after {check_timeout:g}s, the worker process was recycled)\n"
+        )
+        return check_type, "timeout"
+
     def run_pipeline_helper():
         """
         Helper function to run the pipeline.
@@ -130,10 +208,33 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
             "Requirement": 0,
             "Recommendation": 0,
         }
+        # All implemented checks that exceeded their time budget.
+        cnt_timeout_checks = {
+            "Requirement": 0,
+            "Recommendation": 0,
+        }
 
         # Resolve disabled from config.
         disabled_rules = get_disabled_rules(args.repo_info, beman_standard_check_config.keys())
 
+        # With a time budget, checks run in a worker process that can be killed if they do not stop in time.
+        worker = None
+        if check_timeout is not None and CheckWorker.is_supported():
+            # The edits, recorded diagnostics and unchecked files of the worker are sent back with each result
+            # (those of a killed check are dropped).
+            def run_check_for_worker(check_name):
+                if recorder is not None:
+                    # Drop the rows inherited from the main process: it still has them.
+                    recorder.take_diagnostics()
+                return (
+                    run_check(implemented_checks[check_name]),
+                    edits.pending() if edits is not None else {},
+                    recorder.take_diagnostics() if recorder is not None else [],
+                    unchecked_files,
+                )
+
+            worker = CheckWorker(run_check_for_worker)
+
         # Run the checks.
         for check_name in checks_to_run:
             if check_name not in implemented_checks:
@@ -148,17 +249,36 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
                 )
                 log(f"Running check [{check_type}][{check_name}] ... {gray_color}disabled (by own repo config){no_color}\n")
                 cnt_disabled_checks[check_type] += 1
+                for reporter in reporters:
+                    reporter.check_result(check_name, check_type, "disabled")
                 continue
 
-            check_type, status = run_check(implemented_checks[check_name])
+            if worker is not None:
+                check_type, status = run_check_in_worker(worker, check_name)
+            else:
+                check_type, status = run_check(implemented_checks[check_name])
             if status == "passed":
                 cnt_passed_checks[check_type] += 1
             elif status == "failed":
                 cnt_failed_checks[check_type] += 1
             elif status == "skipped":
                 cnt_skipped_checks[check_type] += 1
+            elif status == "timeout":
+                cnt_timeout_checks[check_type] += 1
             else:
                 raise ValueError(f"Invalid status: {status}")
+            for reporter in reporters:
+                reporter.check_result(check_name, check_type, status)
+
+        if worker is not None:
+            worker.close()
+
+        # Write the fixed files (or the patch).
+        if args.fix_diff is not None:
+            write_fix_diff(edits.diff(args.repo_info["top_level"]), args.fix_diff)
+        elif edits is not None:
+            for path in edits.commit():
+                log(f"Fixed file written: '{normalize_path_for_display(path, args.repo_info['top_level'])}'")
 
         # Count the checks from the Beman Standard.
         for check_name in all_checks:
@@ -182,6 +302,7 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
             cnt_implemented_checks,
             cnt_not_implemented_checks,
             cnt_disabled_checks,
+            cnt_timeout_checks,
         )
 
     log("beman-tidy pipeline started ...\n")
@@ -193,6 +314,7 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
         cnt_implemented_checks,
         cnt_not_implemented_checks,
         cnt_disabled_checks,
+        cnt_timeout_checks,
     ) = run_pipeline_helper()
     log("\nbeman-tidy pipeline finished.\n")
 
@@ -201,6 +323,10 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
         f", {no_color}{cnt_disabled_checks['Requirement']} checks disabled"
         if cnt_disabled_checks["Requirement"] > 0
         else ""
+    ) + (
+        f", {yellow_color}{cnt_timeout_checks['Requirement']} checks timed out{no_color}"
+        if cnt_timeout_checks["Requirement"] > 0
+        else ""
     )
     logging.info(
         f"Summary    Requirement: {green_color} {cnt_passed_checks['Requirement']} checks passed{no_color}, "
@@ -212,6 +338,10 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
         f", {no_color}{cnt_disabled_checks['Recommendation']} checks disabled"
         if cnt_disabled_checks["Recommendation"] > 0
         else ""
+    ) + (
+        f", {yellow_color}{cnt_timeout_checks['Recommendation']} checks timed out{no_color}"
+        if cnt_timeout_checks["Recommendation"] > 0
+        else ""
     )
     logging.info(
         f"Summary Recommendation: {green_color} {cnt_passed_checks['Recommendation']} checks passed{no_color}, "
@@ -219,6 +349,11 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
         f"{gray_color}{cnt_skipped_checks['Recommendation']} checks skipped, "
         f"{no_color} {cnt_not_implemented_checks['Recommendation']} checks not implemented{disabled_rec_summary_suffix}."
     )
+    if unchecked_files:
+        logging.info(
+            f"{yellow_color}{len(unchecked_files)} files not checked{no_color} "
+            f"(binary, Git LFS pointer or larger than max_file_size, see --verbose)."
+        )
 
     # Always print the coverage.
     cnt_passed_requirement = (
@@ -301,14 +436,58 @@ def run_checks_pipeline(checks_to_run, args, beman_standard_check_config):
         f"({total_passed}/{total_implemented} checks passed){disabled_total_coverage_suffix}.{no_color}"
     )
 
-    total_cnt_failed = cnt_failed_checks["Requirement"] + (
-        cnt_failed_checks["Recommendation"] if args.require_all else 0
+    # A timed out check is not known to pass: it counts as failed.
+    total_cnt_failed = (
+        cnt_failed_checks["Requirement"]
+        + cnt_timeout_checks["Requirement"]
+        + (
+            cnt_failed_checks["Recommendation"] + cnt_timeout_checks["Recommendation"]
+            if args.require_all
+            else 0
+        )
     )
 
+    counters = {
+        "passed": cnt_passed_checks,
+        "failed": cnt_failed_checks,
+        "skipped": cnt_skipped_checks,
+        "timeout": cnt_timeout_checks,
+        "disabled": cnt_disabled_checks,
+        "implemented": cnt_implemented_checks,
+        "not_implemented": cnt_not_implemented_checks,
+        "all": cnt_all_beman_standard_checks,
+    }
+    coverage = {
+        "Requirement": coverage_requirement,
+        "Recommendation": coverage_recommendation,
+        "TOTAL": total_coverage,
+    }
+    try:
+        for reporter in reporters:
+            reporter.summary(counters, coverage, total_cnt_failed)
+    except sqlite3.Error as e:
+        logging.error(f"Cannot record the run in the results store '{args.store}': {e}")
+        sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
+
     sys.stdout.flush()
     return total_cnt_failed
 
 
+def write_fix_diff(patch, output):
+    """
+    Write the patch of the fixes to the output file, or to stdout if output is "-".
+    """
+    if output == "-":
+        sys.stdout.write(patch)
+        sys.stdout.flush()
+        return
+    with open(output, "w", encoding="utf-8") as file:
+        file.write(patch)
+
+
 def calculate_coverage_color(coverage, no_color=False):
     """
     Returns the color for the coverage print based on severity
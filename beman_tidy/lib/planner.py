@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import fnmatch
+from dataclasses import dataclass, field
+
+from .checks.system.registry import get_registered_beman_standard_checks
+from .checks.system.git import DisallowFixInplaceAndUnstagedChangesCheck
+from .utils.file import FILE_CATEGORIES, REPO_FILE_CATEGORIES
+from .utils.git import GIT_METADATA_FIELDS
+
+# Import all the implemented checks (registers them).
+from .checks import beman_standard  # noqa: F401
+
+_GLOB_CHARS = ("*", "?", "[")
+
+
+def expand_check_patterns(patterns, check_names) -> list[str]:
+    """
+    Expand the glob patterns of --checks (e.g., "cmake.*", "readme.[tl]*") over the known check names,
+    keeping their order. Plain names are kept as they are.
+    Raises ValueError if a pattern matches no check.
+    """
+    checks = []
+    for pattern in patterns:
+        if not any(char in pattern for char in _GLOB_CHARS):
+            matches = [pattern]
+        else:
+            matches = fnmatch.filter(check_names, pattern)
+            if not matches:
+                raise ValueError(f"'{pattern}' does not match any check")
+        checks.extend(match for match in matches if match not in checks)
+    return checks
+
+
+@dataclass
+class IOPlan:
+    """
+    The I/O needed by a set of checks: the union of their declared inputs (see CheckInputs).
+    """
+
+    # Files read, relative to the repository root.
+    files: set[str] = field(default_factory=set)
+    # Directories listed, relative to the repository root.
+    directories: set[str] = field(default_factory=set)
+    # File categories found by walking the repository (see FILE_CATEGORIES).
+    categories: set[str] = field(default_factory=set)
+    # Git metadata fields of repo_info to fetch (see GIT_METADATA_FIELDS).
+    metadata: set[str] = field(default_factory=set)
+
+    @property
+    def needs_walk(self) -> bool:
+        """
+        True if the repository must be walked (otherwise, only the planned files and directories are read).
+        """
+        return bool(self.categories)
+
+    @property
+    def indexed_categories(self) -> set[str]:
+        """
+        The categories of the shared repository index to build (see classify_repo_files()).
+        """
+        return self.categories & set(REPO_FILE_CATEGORIES)
+
+    def retained_files(self) -> set[str] | None:
+        """
+        The files whose content is needed, or None for all files (e.g., a batch check reads every C++ file).
+        The repository configuration and .gitignore are always needed.
+        """
+        if self.needs_walk:
+            return None
+        return self.files | {".beman-tidy.yaml", ".gitignore"}
+
+    def add(self, inputs):
+        """
+        Add the inputs of one check to the plan.
+        """
+        unknown_categories = set(inputs.categories) - set(FILE_CATEGORIES)
+        assert not unknown_categories, f"Unknown file categories: {unknown_categories}"
+        unknown_metadata = set(inputs.metadata) - set(GIT_METADATA_FIELDS)
+        assert not unknown_metadata, f"Unknown git metadata fields: {unknown_metadata}"
+
+        self.files.update(inputs.files)
+        self.directories.update(inputs.directories)
+        self.categories.update(inputs.categories)
+        self.metadata.update(inputs.metadata)
+
+
+def plan_checks(checks_to_run, fix_inplace=False) -> IOPlan:
+    """
+    Compute the minimal I/O plan for running the given checks (names that are not implemented are ignored).
+    """
+    implemented_checks = get_registered_beman_standard_checks()
+    plan = IOPlan()
+    if fix_inplace:
+        plan.add(DisallowFixInplaceAndUnstagedChangesCheck.inputs)
+    for check_name in checks_to_run:
+        if check_name in implemented_checks:
+            plan.add(implemented_checks[check_name].inputs)
+    return plan
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import json
+
+# Output formats of a run (--format): the colored human report, or one JSON object per line.
+OUTPUT_FORMATS = ("text", "jsonl")
+
+
+class JsonLinesReporter:
+    """
+    Stream the results of a run as JSON Lines (--format jsonl): one object per diagnostic and per check result,
+    written as soon as they are produced, then one summary object. Each object has a "type" field:
+    "diagnostic", "check" or "summary". Every line is flushed, so a consumer can process it right away.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def render(self, diagnostic):
+        """
+        Write a diagnostic (the reporter is a renderer of the DiagnosticCollector).
+        """
+        self._write(
+            {
+                "type": "diagnostic",
+                "check": diagnostic.check,
+                "level": diagnostic.level,
+                "code": diagnostic.message_id,
+                "path": diagnostic.display_path,
+                "line": diagnostic.line,
+                "column": diagnostic.column,
+                "message": diagnostic.message,
+                "fix_hint": diagnostic.hint,
+            }
+        )
+
+    def check_result(self, check_name, check_type, status):
+        """
+        Write the result of a check: status is "passed", "failed", "skipped", "timeout" or "disabled".
+        """
+        self._write({"type": "check", "check": check_name, "check_type": check_type, "status": status})
+
+    def summary(self, counters, coverage, failed):
+        """
+        Write the summary of the run.
+        @param counters: {counter name: {"Requirement": count, "Recommendation": count}}.
+        @param coverage: {"Requirement": percent, "Recommendation": percent, "TOTAL": percent}.
+        @param failed: The number of failed checks (the exit code of beman-tidy).
+        """
+        self._write({"type": "summary", "counters": counters, "coverage": coverage, "failed": failed})
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+
+from .utils.git import get_beman_standard_config_path
+
+# Version of the schema below (PRAGMA user_version).
+SCHEMA_VERSION = 1
+
+# Seconds to wait for another run to finish writing to the store (see RunRecorder.summary()).
+BUSY_TIMEOUT = 30.0
+
+# Runs are recorded in order: their id is the chronological order (per repository and fleet-wide).
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    name TEXT,
+    commit_hash TEXT,
+    started_at TEXT NOT NULL,
+    tool_version TEXT,
+    standard_hash TEXT,
+    options TEXT,
+    passed INTEGER,
+    failed INTEGER,
+    skipped INTEGER,
+    timeout INTEGER,
+    disabled INTEGER,
+    failed_checks INTEGER,
+    coverage_requirement REAL,
+    coverage_recommendation REAL,
+    coverage_total REAL
+);
+CREATE INDEX IF NOT EXISTS runs_by_repo ON runs (repo, id);
+
+CREATE TABLE IF NOT EXISTS check_results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    check_name TEXT NOT NULL,
+    check_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    PRIMARY KEY (run_id, check_name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS check_results_by_check ON check_results (check_name, run_id, status);
+
+CREATE TABLE IF NOT EXISTS diagnostics (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    check_name TEXT NOT NULL,
+    level TEXT NOT NULL,
+    code TEXT NOT NULL,
+    path TEXT,
+    line INTEGER,
+    column INTEGER,
+    message TEXT NOT NULL,
+    fix_hint TEXT
+);
+CREATE INDEX IF NOT EXISTS diagnostics_by_run ON diagnostics (run_id, check_name);
+CREATE INDEX IF NOT EXISTS diagnostics_by_code ON diagnostics (code, run_id);
+"""
+
+
+def get_tool_version() -> str:
+    try:
+        return version("beman-tidy")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def get_beman_standard_hash() -> str:
+    """
+    The SHA-256 of the Beman Standard snapshot the checks were run against.
+    """
+    with open(get_beman_standard_config_path(), "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+class ResultsStore:
+    """
+    A SQLite database of beman-tidy runs (--store): one row per run (repository, commit, tool version,
+    Beman Standard hash, options, counters and coverage), per check result and per diagnostic.
+    The common questions (see the queries below) are answered from the indexes, without re-running anything.
+    """
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT)
+        self.connection.row_factory = sqlite3.Row
+        schema_version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if schema_version not in (0, SCHEMA_VERSION):
+            self.connection.close()
+            raise ValueError(f"'{path}' has an unsupported schema version: {schema_version}")
+        if schema_version == 0:
+            with self.connection:
+                self.connection.executescript(_SCHEMA)
+                self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    def failing_checks_trend(self, repo=None, last=None) -> list[sqlite3.Row]:
+        """
+        The number of failed checks of each run (oldest first), for one repository or for all of them.
+        @param last: Only the last N runs of each repository.
+        """
+        # The repository condition is only added when needed, so that the runs_by_repo index is used.
+        where = "WHERE repo = :repo" if repo is not None else ""
+        return self.connection.execute(
+            f"""
+            SELECT repo, id, started_at, commit_hash, failed_checks, coverage_total
+            FROM (
+                SELECT repo, id, started_at, commit_hash, failed_checks, coverage_total,
+                       ROW_NUMBER() OVER (PARTITION BY repo ORDER BY id DESC) AS age
+                FROM runs
+                {where}
+            )
+            WHERE :last IS NULL OR age <= :last
+            ORDER BY repo, id
+            """,
+            {"repo": repo, "last": last},
+        ).fetchall()
+
+    def first_regressions(self, check_name, repo=None) -> list[sqlite3.Row]:
+        """
+        For each repository, the first run where the check failed after a run where it passed.
+        The runs where the check did not pass nor fail (e.g., skipped, timed out or disabled) are ignored.
+        """
+        return self.connection.execute(
+            """
+            WITH history AS (
+                SELECT runs.repo, runs.id, runs.started_at, runs.commit_hash, check_results.status,
+                       LAG(check_results.status) OVER (PARTITION BY runs.repo ORDER BY runs.id) AS previous_status
+                FROM check_results JOIN runs ON runs.id = check_results.run_id
+                WHERE check_results.check_name = :check AND (:repo IS NULL OR runs.repo = :repo)
+                      AND check_results.status IN ('passed', 'failed')
+            ),
+            regressions AS (
+                SELECT *, ROW_NUMBER() OVER (PARTITION BY repo ORDER BY id) AS rank
+                FROM history
+                WHERE status = 'failed' AND previous_status = 'passed'
+            )
+            SELECT repo, id, started_at, commit_hash FROM regressions WHERE rank = 1 ORDER BY repo
+            """,
+            {"check": check_name, "repo": repo},
+        ).fetchall()
+
+    def pass_rates(self) -> list[sqlite3.Row]:
+        """
+        Fleet-wide pass rate of each check, over the last run of each repository.
+        Skipped and disabled checks are not counted; a timed out check counts as not passed.
+        """
+        return self.connection.execute(
+            """
+            WITH latest AS (SELECT MAX(id) AS id FROM runs GROUP BY repo)
+            SELECT check_name,
+                   SUM(status = 'passed') AS passed,
+                   SUM(status IN ('passed', 'failed', 'timeout')) AS evaluated,
+                   ROUND(100.0 * SUM(status = 'passed') / SUM(status IN ('passed', 'failed', 'timeout')), 2) AS rate
+            FROM check_results JOIN latest ON check_results.run_id = latest.id
+            GROUP BY check_name
+            HAVING evaluated > 0
+            ORDER BY rate, check_name
+            """
+        ).fetchall()
+
+
+class RunRecorder:
+    """
+    Record a run in a ResultsStore: a reporter of the pipeline (see JsonLinesReporter for the interface),
+    and a renderer of its DiagnosticCollector. The rows are kept in memory while the checks run, and
+    written with the summary in one short transaction (so that runs sharing a store do not block each other):
+    an interrupted run is not recorded.
+    """
+
+    def __init__(self, store, repo_info, options):
+        """
+        @param options: The options of the run (JSON-serializable), e.g. the selected checks.
+        """
+        self.store = store
+        self.run_id = None
+        repo = repo_info.get("remote_url") or str(repo_info["top_level"])
+        self._run_row = (
+            repo,
+            repo_info.get("short_name", repo_info["name"]),
+            repo_info.get("commit_hash"),
+            datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            get_tool_version(),
+            get_beman_standard_hash(),
+            json.dumps(options, sort_keys=True),
+        )
+        self._check_rows = []
+        self._diagnostic_rows = []
+
+    def render(self, diagnostic):
+        self._diagnostic_rows.append(
+            (
+                diagnostic.check,
+                diagnostic.level,
+                diagnostic.message_id,
+                diagnostic.display_path,
+                diagnostic.line,
+                diagnostic.column,
+                diagnostic.message,
+                diagnostic.hint,
+            )
+        )
+
+    def take_diagnostics(self) -> list[tuple]:
+        """
+        Take the diagnostic rows recorded so far, e.g. to send them from a worker process to the recorder
+        of the main process (see add_diagnostics()).
+        """
+        rows, self._diagnostic_rows = self._diagnostic_rows, []
+        return rows
+
+    def add_diagnostics(self, rows):
+        self._diagnostic_rows.extend(rows)
+
+    def check_result(self, check_name, check_type, status):
+        self._check_rows.append((check_name, check_type, status))
+
+    def summary(self, counters, coverage, failed):
+        """
+        Write the run. Raises sqlite3.Error if the store cannot be written (e.g., still locked after its busy timeout).
+        """
+        run_row = self._run_row + (
+            *(sum(counters[name].values()) for name in ("passed", "failed", "skipped", "timeout", "disabled")),
+            failed,
+            coverage["Requirement"],
+            coverage["Recommendation"],
+            coverage["TOTAL"],
+        )
+        with self.store.connection:
+            run_id = self.store.connection.execute(
+                """
+                INSERT INTO runs (repo, name, commit_hash, started_at, tool_version, standard_hash, options,
+                                  passed, failed, skipped, timeout, disabled, failed_checks,
+                                  coverage_requirement, coverage_recommendation, coverage_total)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                run_row,
+            ).lastrowid
+            self.store.connection.executemany(
+                "INSERT INTO check_results (run_id, check_name, check_type, status) VALUES (?, ?, ?, ?)",
+                ((run_id, *row) for row in self._check_rows),
+            )
+            self.store.connection.executemany(
+                """
+                INSERT INTO diagnostics (run_id, check_name, level, code, path, line, column, message, fix_hint)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                ((run_id, *row) for row in self._diagnostic_rows),
+            )
+        self.run_id = run_id
+
+
+def run_query(args):
+    """
+    Answer a question (args.question) from a results store and print the answer.
+    @return: The number of rows of the answer.
+    """
+    try:
+        store = ResultsStore(args.store)
+    except (sqlite3.Error, ValueError) as e:
+        logging.error(f"Cannot open the results store '{args.store}': {e}")
+        sys.exit(1)
+
+    try:
+        if args.question == "trend":
+            rows = store.failing_checks_trend(args.repo, args.last)
+            for row in rows:
+                commit = (row["commit_hash"] or "-")[:7]
+                logging.info(
+                    f"{row['repo']}  {row['started_at']}  {commit:<7}  "
+                    f"{row['failed_checks']:>3} failed  (coverage: {row['coverage_total']:.2f}%)"
+                )
+        elif args.question == "regression":
+            rows = store.first_regressions(args.check, args.repo)
+            for row in rows:
+                commit = (row["commit_hash"] or "-")[:7]
+                logging.info(f"{row['repo']}  {row['started_at']}  {commit:<7}  [{args.check}] regressed (run {row['id']})")
+        else:
+            rows = store.pass_rates()
+            for row in rows:
+                logging.info(f"{row['check_name']:<40} {row['rate']:6.2f}%  ({row['passed']}/{row['evaluated']} repositories)")
+    finally:
+        store.close()
+
+    sys.stdout.flush()
+    return len(rows)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import io
+import re
+from dataclasses import dataclass, field
+
+from .budget import CHECKPOINT_INTERVAL, checkpoint
+from .cache import FileStatCache
+from .comments import (
+    CommentType,
+    build_comment_map,
+    determine_comment_type,
+    find_in_line,
+    iterate_comment_text,
+)
+
+SPDX_MARKER = "SPDX-License-Identifier:"
+# The SPDX marker must be within the first lines of a file (see file.license_id): only they are searched.
+SPDX_MAX_LINE = 25
+COPYRIGHT_TEXTS = ["copyright", "(c)"]
+# The same markers, to scan the raw bytes of a file (see scan.py); they are ASCII, so IGNORECASE matches
+# the same text as str.lower().
+SPDX_MARKER_BYTES = SPDX_MARKER.encode()
+COPYRIGHT_MARKERS_RE = re.compile(b"|".join(re.escape(text.encode()) for text in COPYRIGHT_TEXTS), re.IGNORECASE)
+
+_NAMESPACE_QUALIFIED_RE = re.compile(r"namespace\s+beman\s*::\s*(\w+(?:\s*::\s*\w+)*)")
+_NAMESPACE_BEMAN_OPEN_RE = re.compile(r"namespace\s+beman\s*\{\s*$")
+_NAMESPACE_NESTED_RE = re.compile(r"^\s*namespace\s+(\w+)")
+
+
+@dataclass
+class FileFacts:
+    """
+    Facts extracted from a single file by one pass of analyze_lines().
+    Shared by all file-level checks (file.license_id, file.copyright, cpp.namespace, ...).
+    """
+
+    line_count: int = 0
+    # Index of the first line containing SPDX_MARKER, or -1 if none of the first SPDX_MAX_LINE lines does.
+    spdx_index: int = -1
+    # Comment style of the SPDX line (CommentType or None).
+    spdx_comment_type: CommentType | None = None
+    # Indices of the lines containing a copyright notice in the comment following the SPDX line.
+    copyright_lines: list[int] = field(default_factory=list)
+    # Declared beman namespaces, e.g. {"beman::optional", "beman::optional::detail"}.
+    namespaces: set[str] = field(default_factory=set)
+    # [start, end) of the code body, excluding the include/define header and the #endif footer.
+    code_body: tuple[int, int] = (0, 0)
+    # True if the code body contains at least one line that is neither a comment nor a directive.
+    has_body_code: bool = False
+
+    def declares_namespace(self, namespace):
+        """
+        Check if the given namespace (or one of its nested namespaces) is declared.
+        Only whole namespace names match: "beman::optional26" does not declare "beman::optional".
+        """
+        return any(
+            declared == namespace or declared.startswith(f"{namespace}::")
+            for declared in self.namespaces
+        )
+
+
+def analyze_lines(lines) -> FileFacts:
+    """
+    Extract all facts needed by the file-level checks in a single forward scan.
+    """
+    facts = FileFacts(line_count=len(lines))
+
+    last_directive_index = -1
+    first_code_since_directive = None
+    last_endif_index = -1
+    pending_beman_namespace = False
+
+    for i, line in enumerate(lines):
+        if i % CHECKPOINT_INTERVAL == 0:
+            checkpoint()
+        stripped = line.strip()
+
+        if facts.spdx_index == -1 and i < SPDX_MAX_LINE and SPDX_MARKER in line:
+            facts.spdx_index = i
+
+        if stripped.startswith(("#include", "#define")):
+            last_directive_index = i
+            first_code_since_directive = None
+        elif stripped.startswith("#endif"):
+            last_endif_index = i
+        elif (
+            stripped
+            and not stripped.startswith("//")
+            and not stripped.startswith("#")
+            and first_code_since_directive is None
+        ):
+            first_code_since_directive = i
+
+        if "namespace" in line:
+            for match in _NAMESPACE_QUALIFIED_RE.finditer(line):
+                facts.namespaces.add("beman::" + re.sub(r"\s+", "", match.group(1)))
+
+            if pending_beman_namespace and stripped:
+                nested = _NAMESPACE_NESTED_RE.match(line)
+                if nested:
+                    facts.namespaces.add(f"beman::{nested.group(1)}")
+            if _NAMESPACE_BEMAN_OPEN_RE.search(line):
+                pending_beman_namespace = True
+                continue
+        if stripped:
+            pending_beman_namespace = False
+
+    code_start = last_directive_index + 1
+    code_end = last_endif_index if last_endif_index != -1 else len(lines)
+    facts.code_body = (code_start, code_end)
+    facts.has_body_code = (
+        first_code_since_directive is not None and first_code_since_directive < code_end
+    )
+
+    if facts.spdx_index != -1:
+        comment_map = build_comment_map(lines)
+        facts.spdx_comment_type = determine_comment_type(
+            lines,
+            facts.spdx_index,
+            comment_map=comment_map,
+            column=lines[facts.spdx_index].find(SPDX_MARKER),
+        )
+        facts.copyright_lines = _find_copyright_lines(
+            lines, facts.spdx_index, facts.spdx_comment_type, comment_map
+        )
+
+    return facts
+
+
+def find_copyright_search_start(lines, spdx_index, comment_type, comment_map=None):
+    """
+    Finds the starting point for searching for copyright notices.
+    This is the comment block immediately following the SPDX identifier.
+    Returns (start_index, comment_type) or (None, None) if no further processing is needed.
+    """
+    if spdx_index == -1 or comment_type is None:
+        return None, None
+
+    if comment_map is None:
+        comment_map = build_comment_map(lines)
+
+    if comment_type == CommentType.BLOCK:
+        span = comment_map.span_at(spdx_index, lines[spdx_index].find(SPDX_MARKER))
+        if span is not None and span.end_line == spdx_index:
+            # Single-line block comment: the copyright notice would be in the next comment.
+            return _find_next_comment_start(lines, spdx_index + 1, comment_map)
+
+    return spdx_index + 1, comment_type
+
+
+def _find_next_comment_start(lines, start_index, comment_map):
+    for i in range(start_index, len(lines)):
+        if not lines[i].strip():
+            continue
+
+        span = comment_map.leading_comment(i)
+        if span is not None:
+            return i, span.kind
+
+        # Found non-comment code
+        return None, None
+
+    return None, None
+
+
+def _find_copyright_lines(lines, spdx_index, comment_type, comment_map):
+    start_index, search_comment_type = find_copyright_search_start(
+        lines, spdx_index, comment_type, comment_map
+    )
+    if start_index is None:
+        return []
+
+    return [
+        i
+        for i, text in iterate_comment_text(lines, start_index, search_comment_type, comment_map)
+        if find_in_line(text, COPYRIGHT_TEXTS, ignore_case=True)
+    ]
+
+
+_file_facts_cache = FileStatCache()
+
+
+def _analyze_text(text) -> FileFacts:
+    return analyze_lines(io.StringIO(text).readlines())
+
+
+def get_cached_file_facts(path, filesystem=None) -> FileFacts | None:
+    """
+    Returns the facts for the given file if they were already computed and are still fresh, otherwise None.
+    """
+    return _file_facts_cache.get(path, filesystem)
+
+
+def get_file_facts(path, filesystem=None) -> FileFacts:
+    """
+    Read the file once and return its facts.
+    Results are cached until the file changes on disk or invalidate_file_facts() is called.
+    """
+    return _file_facts_cache.get_or_compute(path, _analyze_text, default=FileFacts(), filesystem=filesystem)
+
+
+def invalidate_file_facts(path=None):
+    """
+    Drop the cached facts for the given file, or for all files if path is None.
+    """
+    _file_facts_cache.invalidate(path)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Stack of active budgets, innermost last (e.g., the budget of a check, then of the file being checked).
+_active_budgets: ContextVar[tuple] = ContextVar("beman_tidy_time_budgets", default=())
+
+# Hot loops call checkpoint() every CHECKPOINT_INTERVAL iterations (e.g., lines of a file).
+CHECKPOINT_INTERVAL = 1024
+
+
+class TimeBudget:
+    """
+    A wall-clock time budget (e.g., for a check, or for one file of a batch check).
+    """
+
+    def __init__(self, seconds, label):
+        self.seconds = seconds
+        self.label = label
+        self.deadline = time.monotonic() + seconds
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+
+class BudgetExceeded(BaseException):
+    """
+    Raised by checkpoint() when an active time budget is exhausted.
+
+    Like KeyboardInterrupt, it derives from BaseException so that the "except Exception"
+    fallbacks of the read helpers and caches do not swallow the cancellation.
+    """
+
+    def __init__(self, budget):
+        super().__init__(f"{budget.label} exceeded its time budget of {budget.seconds:g}s")
+        self.budget = budget
+
+
+@contextmanager
+def time_budget(seconds, label):
+    """
+    Run the block within a time budget of the given seconds (no budget if seconds is None).
+    Cancellation is cooperative: BudgetExceeded is raised by the next checkpoint() after the deadline.
+    Yields the TimeBudget (or None).
+    """
+    if seconds is None:
+        yield None
+        return
+
+    budget = TimeBudget(seconds, label)
+    token = _active_budgets.set(_active_budgets.get() + (budget,))
+    try:
+        yield budget
+    finally:
+        _active_budgets.reset(token)
+
+
+def checkpoint():
+    """
+    A cancellation point: raises BudgetExceeded if any active budget is exhausted.
+    Cheap when no budget is active.
+    """
+    budgets = _active_budgets.get()
+    if not budgets:
+        return
+    now = time.monotonic()
+    for budget in budgets:
+        if now >= budget.deadline:
+            raise BudgetExceeded(budget)
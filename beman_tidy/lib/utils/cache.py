@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from pathlib import Path
+
+from .filesystem import WORKTREE_FS
+
+# All caches created by FileStatCache, so a write can invalidate every derived view of a file.
+_file_stat_caches = []
+
+
+class FileStatCache:
+    """
+    Per-process cache of values derived from a file (e.g., analysis facts, Markdown index).
+    On the worktree, an entry is valid as long as the file's mtime and size are unchanged.
+    On a git revision (GitTreeFS), entries are keyed by blob SHA and shared by identical blobs.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        _file_stat_caches.append(self)
+
+    def get(self, path, filesystem=None):
+        """
+        Returns the cached value for the given file if it is still fresh, otherwise None.
+        """
+        filesystem = filesystem or WORKTREE_FS
+        try:
+            key, version = filesystem.cache_identity(path)
+        except OSError:
+            return None
+
+        cached = self._entries.get(key)
+        if cached is None:
+            return None
+        if cached[0] == version:
+            return cached[1]
+        del self._entries[key]
+        return None
+
+    def get_or_compute(self, path, compute, default=None, filesystem=None):
+        """
+        Returns the cached value for the given file, or computes it with compute(text) and caches it.
+        If the file cannot be read (or decoded), returns default without caching it.
+        Errors raised by compute() are not caught.
+        """
+        filesystem = filesystem or WORKTREE_FS
+        value = self.get(path, filesystem)
+        if value is not None:
+            return value
+
+        try:
+            key, version = filesystem.cache_identity(path)
+            text = filesystem.read_text(path)
+        except (OSError, UnicodeDecodeError):
+            return default
+
+        value = compute(text)
+        self._entries[key] = (version, value)
+        return value
+
+    def set(self, path, value, filesystem=None):
+        """
+        Cache a value computed by the caller for the given file (ignored if the file cannot be accessed).
+        """
+        filesystem = filesystem or WORKTREE_FS
+        try:
+            key, version = filesystem.cache_identity(path)
+        except OSError:
+            return
+        self._entries[key] = (version, value)
+
+    def invalidate(self, path=None):
+        """
+        Drop the cached value for the given file, or for all files if path is None.
+        """
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(str(Path(path).absolute()), None)
+
+
+def invalidate_cached_file(path=None):
+    """
+    Drop every cached value derived from the given file (or from all files if path is None).
+    """
+    for cache in _file_stat_caches:
+        cache.invalidate(path)
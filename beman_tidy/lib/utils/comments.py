@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+import re
+from bisect import bisect_right
 from enum import Enum, auto
+from typing import NamedTuple
+
+from .budget import CHECKPOINT_INTERVAL, checkpoint
 
 class CommentType(Enum):
     LINE = auto()
@@ -11,89 +16,288 @@ LINE_PREFIXES = ['//']
 BLOCK_STARTS = ['/*']
 BLOCK_ENDS = ['*/']
 
-def determine_comment_type(lines, line_index):
+# Next interesting token while scanning code: raw string, comment start, string or character literal.
+_CODE_TOKEN_RE = re.compile(r'(?<![\w])(?:u8|u|U|L)?R"|//|/\*|"|\'')
+_STRING_BODY_RE = re.compile(r'(?:[^"\\]|\\.)*"')
+_CHAR_BODY_RE = re.compile(r"(?:[^'\\]|\\.)*'")
+_RAW_STRING_OPEN_RE = re.compile(r'([^()\\\s]{0,16})\(')
+_CHAR_PREFIXES = {"u8", "u", "U", "L"}
+
+
+class CommentSpan(NamedTuple):
+    """
+    A comment found by the tokenizer.
+    Columns are relative to the line; end_col is exclusive.
+    """
+
+    kind: CommentType
+    start_line: int
+    start_col: int
+    end_line: int
+    end_col: int
+
+
+class CommentMap:
+    """
+    Comment span table for a list of lines, built by a single forward tokenizer pass.
+
+    Understands string literals (including line splices), character literals, digit separators
+    and raw string literals, so comment delimiters inside them are ignored, as are comment
+    delimiters inside other comments (e.g., '/*' inside a line comment or a second '/*' inside
+    a block comment).
+
+    Queries:
+    - open_span(line_index) / first_span(line_index): O(1).
+    - span_at(line_index, column): O(log n).
+    """
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.spans: list[CommentSpan] = []
+        # Span active when the line starts (multi-line block or continued line comment), else -1.
+        self._open_at_line: list[int] = [-1] * len(lines)
+        # First span starting on the line, else -1.
+        self._first_on_line: list[int] = [-1] * len(lines)
+        self._tokenize()
+        self._span_starts = [(span.start_line, span.start_col) for span in self.spans]
+
+    def _add_span(self, kind, start_line, start_col):
+        self.spans.append(CommentSpan(kind, start_line, start_col, start_line, start_col))
+        if self._first_on_line[start_line] == -1:
+            self._first_on_line[start_line] = len(self.spans) - 1
+
+    def _close_span(self, end_line, end_col):
+        span = self.spans[-1]
+        self.spans[-1] = span._replace(end_line=end_line, end_col=end_col)
+
+    def _tokenize(self):
+        # state: None (code), "block", "line", "string", "raw"
+        state = None
+        raw_terminator = None
+
+        for i, line in enumerate(self.lines):
+            if i % CHECKPOINT_INTERVAL == 0:
+                checkpoint()
+            text = line.rstrip("\r\n")
+            pos = 0
+            if state in ("block", "line"):
+                self._open_at_line[i] = len(self.spans) - 1
+
+            while pos <= len(text):
+                if state == "block":
+                    end = text.find("*/", pos)
+                    if end == -1:
+                        self._close_span(i, len(text))
+                        break
+                    pos = end + 2
+                    self._close_span(i, pos)
+                    state = None
+                elif state == "line":
+                    self._close_span(i, len(text))
+                    # A trailing backslash splices the next line into the comment.
+                    if not text.endswith("\\"):
+                        state = None
+                    break
+                elif state == "string":
+                    match = _STRING_BODY_RE.match(text, pos)
+                    if match is None:
+                        if not text.endswith("\\"):
+                            state = None
+                        break
+                    pos = match.end()
+                    state = None
+                elif state == "raw":
+                    end = text.find(raw_terminator, pos)
+                    if end == -1:
+                        break
+                    pos = end + len(raw_terminator)
+                    state = None
+                else:
+                    match = _CODE_TOKEN_RE.search(text, pos)
+                    if match is None:
+                        break
+                    token = match.group(0)
+                    if token == "//":
+                        self._add_span(CommentType.LINE, i, match.start())
+                        state = "line"
+                    elif token == "/*":
+                        self._add_span(CommentType.BLOCK, i, match.start())
+                        pos = match.end()
+                        state = "block"
+                    elif token == '"':
+                        pos = match.end()
+                        state = "string"
+                    elif token == "'":
+                        pos = self._skip_char_literal(text, match.start())
+                    else:  # raw string: [prefix]R"delim( ... )delim"
+                        opening = _RAW_STRING_OPEN_RE.match(text, match.end())
+                        if opening is None:
+                            pos = match.end()
+                            state = "string"
+                            continue
+                        raw_terminator = f'){opening.group(1)}"'
+                        pos = opening.end()
+                        state = "raw"
+
+    @staticmethod
+    def _skip_char_literal(text, quote_pos):
+        """
+        Returns the position after a character literal starting at quote_pos,
+        or quote_pos + 1 if the quote is a digit separator (e.g., 1'000'000).
+        """
+        word_start = quote_pos
+        while word_start > 0 and (text[word_start - 1].isalnum() or text[word_start - 1] == "_"):
+            word_start -= 1
+        word = text[word_start:quote_pos]
+        if word and word not in _CHAR_PREFIXES and word[0].isdigit():
+            return quote_pos + 1
+
+        match = _CHAR_BODY_RE.match(text, quote_pos + 1)
+        return match.end() if match else len(text)
+
+    def open_span(self, line_index) -> CommentSpan | None:
+        """
+        The comment that is already open when the given line starts, if any.
+        """
+        index = self._open_at_line[line_index]
+        return self.spans[index] if index != -1 else None
+
+    def first_span(self, line_index) -> CommentSpan | None:
+        """
+        The first comment that starts on the given line, if any.
+        """
+        index = self._first_on_line[line_index]
+        return self.spans[index] if index != -1 else None
+
+    def span_at(self, line_index, column) -> CommentSpan | None:
+        """
+        The comment covering the given position, if any.
+        """
+        index = bisect_right(self._span_starts, (line_index, column)) - 1
+        if index < 0:
+            return None
+        span = self.spans[index]
+        if (span.end_line, span.end_col) > (line_index, column):
+            return span
+        return None
+
+    def leading_comment(self, line_index) -> CommentSpan | None:
+        """
+        The comment covering the first non-whitespace character of the line, if any.
+        """
+        span = self.open_span(line_index)
+        if span is not None:
+            return span
+        span = self.first_span(line_index)
+        line = self.lines[line_index]
+        if span is not None and span.start_col == len(line) - len(line.lstrip()):
+            return span
+        return None
+
+
+def build_comment_map(lines) -> CommentMap:
+    """
+    Tokenize the lines once and return the comment span table.
+    """
+    return CommentMap(lines)
+
+
+def determine_comment_type(lines, line_index, comment_map=None, column=None):
     """
     Determines the comment style at the given line index.
+    If column is given, the comment covering that exact position is used;
+    otherwise the first comment open on (or starting on) the line.
     Returns CommentType or None.
     """
     if line_index < 0 or line_index >= len(lines):
         return None
-        
-    line = lines[line_index].strip()
-    
-    # Check for line comments
-    if any(line.startswith(prefix) for prefix in LINE_PREFIXES):
-        return CommentType.LINE
-        
-    # Check for block comment start
-    if any(line.startswith(start) for start in BLOCK_STARTS):
-        return CommentType.BLOCK
-        
-    # Check if inside block comment
-    for i in range(line_index - 1, -1, -1):
-        prev_line = lines[i].strip()
-
-        has_start = any(prev_line.startswith(start) for start in BLOCK_STARTS)
-        has_end = any(end in prev_line for end in BLOCK_ENDS)
-
-        if has_start and has_end:
-            continue
-        elif has_end:
-            return None
-        elif has_start:
-            # We are inside the block
-            return CommentType.BLOCK
-             
+
+    if comment_map is None:
+        comment_map = build_comment_map(lines)
+
+    if column is not None:
+        span = comment_map.span_at(line_index, column)
+    else:
+        span = comment_map.open_span(line_index) or comment_map.first_span(line_index)
+
+    return span.kind if span is not None else None
+
+
+def _comment_block_span(comment_map, line_index, comment_type):
+    """
+    The comment of the given type that is open at, or starts on, the given line.
+    """
+    span = comment_map.open_span(line_index)
+    if span is not None and span.kind == comment_type:
+        return span
+    span = comment_map.first_span(line_index)
+    if span is not None and span.kind == comment_type:
+        return span
     return None
 
 
-def iterate_comment_lines(lines, start_index, comment_type):
+def iterate_comment_lines(lines, start_index, comment_type, comment_map=None):
     """
     Iterates over the lines of a comment block starting at start_index.
     Yields (line_index, line_content).
     Stops when the comment block ends.
+
+    For CommentType.LINE, a block is a run of lines that are blank or start with a line comment.
     """
     if start_index < 0 or start_index >= len(lines) or comment_type is None:
         return
 
-    i = start_index
+    if comment_map is None:
+        comment_map = build_comment_map(lines)
+
     if comment_type == CommentType.LINE:
-        while i < len(lines):
+        for i in range(start_index, len(lines)):
+            if (i - start_index) % CHECKPOINT_INTERVAL == 0:
+                checkpoint()
             line = lines[i]
-            stripped = line.strip()
-            if not stripped:
-                yield i, line
-                i += 1
-                continue
-            
-            if not any(stripped.startswith(prefix) for prefix in LINE_PREFIXES):
-                break
-            
+            if line.strip():
+                span = comment_map.leading_comment(i)
+                if span is None or span.kind != CommentType.LINE:
+                    break
             yield i, line
-            i += 1
 
     elif comment_type == CommentType.BLOCK:
-        while i < len(lines):
-            line = lines[i]
-            yield i, line
-            if any(end in line for end in BLOCK_ENDS):
-                break
-            i += 1
+        span = _comment_block_span(comment_map, start_index, CommentType.BLOCK)
+        if span is None:
+            return
+        for i in range(start_index, span.end_line + 1):
+            yield i, lines[i]
 
 
-def find_in_comment(lines, start_index, comment_type, texts, ignore_case=False):
+def iterate_comment_text(lines, start_index, comment_type, comment_map=None):
+    """
+    Like iterate_comment_lines(), but yields (line_index, commented_text) where commented_text
+    is only the part of the line covered by the comment (delimiters included).
+    Blank lines between line comments are skipped.
+    """
+    if comment_map is None:
+        comment_map = build_comment_map(lines)
+
+    for i, line in iterate_comment_lines(lines, start_index, comment_type, comment_map):
+        span = comment_map.open_span(i)
+        if span is None or span.kind != comment_type:
+            span = _comment_block_span(comment_map, i, comment_type)
+        if span is None:
+            continue  # blank line between line comments
+
+        start_col = span.start_col if span.start_line == i else 0
+        end_col = span.end_col if span.end_line == i else len(line)
+        yield i, line[start_col:end_col]
+
+
+def find_in_comment(lines, start_index, comment_type, texts, ignore_case=False, comment_map=None):
     """
     Searches for any of the text in the texts list within the comment block.
+    Only the commented part of each line is searched.
     Returns (line_index, found_text) or (None, None).
     """
-    for i, line in iterate_comment_lines(lines, start_index, comment_type):
-        if comment_type == CommentType.BLOCK:
-            for end in BLOCK_ENDS:
-                if end in line:
-                    line = line.split(end)[0]
-                    break
-
-        found_text = find_in_line(line, texts, ignore_case)
+    for i, text in iterate_comment_text(lines, start_index, comment_type, comment_map):
+        found_text = find_in_line(text, texts, ignore_case)
         if found_text:
             return i, found_text
     return None, None
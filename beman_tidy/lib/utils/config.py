@@ -8,6 +8,9 @@ import logging
 
 from pathlib import Path
 from beman_tidy.lib.utils.file import get_repo_ignorable_subdirectories
+from beman_tidy.lib.utils.filesystem import WORKTREE_FS
+from beman_tidy.lib.utils.ignore import compile_ignores
+from beman_tidy.lib.utils.sniff import DEFAULT_MAX_FILE_SIZE
 from beman_tidy.lib.utils.logger_config import setup_logging
 
 setup_logging()
@@ -47,6 +50,16 @@ def validate_config(config):
     if not _validate_disabled_rules(config):
         return False
 
+    if not _validate_timeouts(config):
+        return False
+
+    max_file_size = config.get("max_file_size")
+    if max_file_size is not None and (
+        isinstance(max_file_size, bool) or not isinstance(max_file_size, int) or max_file_size <= 0
+    ):
+        logging.error(f"Error: 'max_file_size' in .beman-tidy.yaml must be a positive number of bytes, but got {max_file_size}.")
+        return False
+
     return True
 
 
@@ -74,6 +87,61 @@ def _validate_disabled_rules(config):
     return True
 
 
+# Time budgets that can be set in 'timeouts': per check (all its files), and per file of a batch check.
+TIMEOUT_SCOPES = ("check", "file")
+
+
+def _validate_timeouts(config):
+    """
+    Validate the 'timeouts' configuration: {scope: seconds} with scopes from TIMEOUT_SCOPES.
+    Returns True if valid, False otherwise.
+    """
+    timeouts = config.get("timeouts")
+    if timeouts is None:
+        return True
+
+    if not isinstance(timeouts, dict):
+        logging.error(f"Error: 'timeouts' in .beman-tidy.yaml must be a mapping, but got {type(timeouts).__name__}.")
+        return False
+
+    for scope, seconds in timeouts.items():
+        if scope not in TIMEOUT_SCOPES:
+            logging.error(f"Error: Invalid entry in 'timeouts': {scope}. Must be one of {', '.join(TIMEOUT_SCOPES)}.")
+            return False
+        if seconds is None:
+            continue
+        if isinstance(seconds, bool) or not isinstance(seconds, (int, float)) or seconds <= 0:
+            logging.error(f"Error: Invalid timeout for '{scope}' in 'timeouts': {seconds}. Must be a positive number of seconds.")
+            return False
+
+    return True
+
+
+def get_timeout(repo_info, scope):
+    """
+    Get the time budget in seconds for the given scope (see TIMEOUT_SCOPES), or None if there is no budget.
+    """
+    assert scope in TIMEOUT_SCOPES
+    timeouts = repo_info.get("config", {}).get("timeouts") or {}
+    return timeouts.get(scope)
+
+
+def set_timeouts(config, **timeouts):
+    """
+    Override the configured time budgets (e.g., from the CLI); None values keep the configured budget.
+    """
+    overrides = {scope: seconds for scope, seconds in timeouts.items() if seconds is not None}
+    if overrides:
+        config["timeouts"] = {**(config.get("timeouts") or {}), **overrides}
+
+
+def get_max_file_size(repo_info):
+    """
+    Get the size in bytes above which files are not read by the checks (see sniff_file()).
+    """
+    return repo_info.get("config", {}).get("max_file_size") or DEFAULT_MAX_FILE_SIZE
+
+
 def get_disabled_rules(repo_info, known_rule_names):
     """
     Get the expanded set of disabled rule names from the configuration.
@@ -122,10 +190,12 @@ def get_default_config_path():
     return Path(__file__).parent.parent.parent / ".beman-standard.yaml"
 
 
-def load_repo_config(repo_path, config_path=None):
+def load_repo_config(repo_path, config_path=None, filesystem=None):
     """
     Load the configuration file.
+    The default .beman-tidy.yaml is read from 'filesystem' (the worktree by default, see get_filesystem()).
     """
+    filesystem = filesystem or WORKTREE_FS
     # Load default configuration
     default_config_path = get_default_config_path()
     with default_config_path.open('r') as f:
@@ -134,15 +204,16 @@ def load_repo_config(repo_path, config_path=None):
     # Determine user config path
     if config_path:
         user_config_path = Path(config_path)
+        # An explicit configuration file is always read from disk.
+        filesystem = WORKTREE_FS
     else:
         user_config_path = Path(repo_path) / ".beman-tidy.yaml"
 
     # Load user configuration if it exists
     user_config = {}
-    if user_config_path.exists():
+    if filesystem.exists(user_config_path):
         try:
-            with open(user_config_path, "r") as f:
-                user_config = yaml.safe_load(f) or {}
+            user_config = yaml.safe_load(filesystem.read_text(user_config_path)) or {}
         except Exception as e:
             logging.error(f"Error loading user configuration from '{user_config_path}': {e}")
             sys.exit(1)
@@ -163,11 +234,29 @@ def load_repo_config(repo_path, config_path=None):
 def get_ignores(repo_info):
     """
     Returns a combined list of default system ignores and user-configured ignores.
+    The result is memoized in repo_info (until the configured ignored_paths change).
+    """
+    return _get_compiled_ignores(repo_info)[0]
+
+
+def get_ignore_matcher(repo_info):
+    """
+    Returns the ignores from get_ignores() compiled into an IgnoreMatcher.
     """
+    return _get_compiled_ignores(repo_info)[1]
+
+
+def _get_compiled_ignores(repo_info):
+    user_ignores = repo_info.get("config", {}).get("ignored_paths")
+    cached = repo_info.get("compiled_ignores")
+    if cached is not None and cached[0] is user_ignores:
+        return cached[1], cached[2]
 
     default_ignores = get_repo_ignorable_subdirectories()
-    user_ignores = repo_info.get("config", {}).get("ignored_paths") or []
-    return list(default_ignores) + user_ignores
+    ignores = list(default_ignores) + (user_ignores or [])
+    matcher = compile_ignores(ignores)
+    repo_info["compiled_ignores"] = (user_ignores, ignores, matcher)
+    return ignores, matcher
 
 
 def is_ignored(repo_info, relative_path):
@@ -176,15 +265,4 @@ def is_ignored(repo_info, relative_path):
     A path can be a file or a directory.
     If a directory is ignored, all its children are also ignored.
     """
-    ignores = get_ignores(repo_info)
-    rel_path_str = relative_path.as_posix()
-    for ignore in ignores:
-        ignore_str = str(ignore).rstrip('/')
-
-        if rel_path_str == ignore_str:
-            return True
-        
-        if rel_path_str.startswith(ignore_str + '/'):
-            return True
-
-    return False
+    return get_ignore_matcher(repo_info).matches(relative_path)
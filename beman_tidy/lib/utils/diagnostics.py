@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+from .string import (
+    normalize_path_for_display,
+    red_color,
+    yellow_color,
+    gray_color,
+    blue_color,
+    no_color,
+)
+
+# Diagnostic levels, from the most to the least severe.
+LEVELS = ("error", "warning", "info", "skipped")
+
+
+@dataclass(frozen=True)
+class Diagnostic:
+    """
+    A finding of a check, kept as a template and its fields: it is only rendered (see message)
+    when a renderer needs the text.
+    E.g., Diagnostic("file.license_id", "error", "Missing SPDX-License-Identifier in {path}.", path=..., args={}).
+    """
+
+    # The check that emitted the diagnostic - e.g. "file.license_id".
+    check: str
+    # The severity, one of LEVELS.
+    level: str
+    # The message: a str.format() template of the fields below if args is set, otherwise plain text.
+    template: str
+    # Identifies the kind of diagnostic, e.g. for aggregation (the check name if not set).
+    code: str | None = None
+    # The file or directory the diagnostic is about (absolute, or relative to root).
+    path: Path | None = None
+    # The 1-based line and column in the file, if known.
+    line: int | None = None
+    column: int | None = None
+    # How to fix the issue (a template of the same fields as the message), if any.
+    fix_hint: str | None = None
+    # The other fields of the templates, or None if the message is plain text.
+    args: dict | None = None
+    # The repository root: paths are displayed relative to it.
+    root: Path | None = None
+
+    @property
+    def message_id(self) -> str:
+        return self.code if self.code is not None else self.check
+
+    @property
+    def display_path(self) -> str | None:
+        if self.path is None:
+            return None
+        return normalize_path_for_display(self.path, self.root) if self.root is not None else str(self.path)
+
+    def _render(self, template) -> str:
+        if self.args is None:
+            return template
+        return template.format(path=self.display_path, line=self.line, column=self.column, **self.args)
+
+    @property
+    def message(self) -> str:
+        """
+        The rendered message: the template, with {path} (for display), {line}, {column} and the args replaced.
+        """
+        return self._render(self.template)
+
+    @property
+    def hint(self) -> str | None:
+        """
+        The rendered fix hint, if any.
+        """
+        return self._render(self.fix_hint) if self.fix_hint is not None else None
+
+
+class ConsoleRenderer:
+    """
+    Print the diagnostics as colored log lines (the default output of beman-tidy).
+    E.g., [error][toplevel.cmake]: The file 'CMakeLists.txt' does not exist.
+    """
+
+    COLORS = {
+        "error": red_color,
+        "warning": yellow_color,
+        "skipped": gray_color,
+        "info": blue_color,
+    }
+
+    def render(self, diagnostic):
+        color = self.COLORS.get(diagnostic.level, no_color)
+        text = diagnostic.message
+        if diagnostic.fix_hint is not None:
+            text += " " + diagnostic.hint
+        logging.info(f"[{color}{diagnostic.level}{no_color}][{diagnostic.check}]: {text}")
+
+
+class DiagnosticCollector:
+    """
+    Receives the diagnostics of the checks of a run, as they are emitted, and passes them to the renderers.
+    Diagnostics are not kept: renderers stream them (e.g., to the console).
+    """
+
+    def __init__(self, renderers=None):
+        """
+        @param renderers: Objects with a render(diagnostic) method (the console by default).
+        """
+        self.renderers = list(renderers) if renderers is not None else [ConsoleRenderer()]
+
+    def emit(self, diagnostic):
+        for renderer in self.renderers:
+            renderer.render(diagnostic)
+
+
+_console_collector = DiagnosticCollector()
+
+
+def get_diagnostic_collector(repo_info) -> DiagnosticCollector:
+    """
+    Get the collector of the run (repo_info["diagnostics"]); diagnostics are printed to the console by default.
+    """
+    return repo_info.get("diagnostics") or _console_collector
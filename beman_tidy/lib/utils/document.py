@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import io
+import mmap
+
+from .filesystem import WORKTREE_FS
+from .scan import decode_line, decode_range, head_end, line_index_at, line_starts
+
+# Worktree files of at least this size are memory-mapped instead of read.
+MMAP_THRESHOLD = 64 * 1024
+
+
+class Document:
+    """
+    The content of a text file, as raw UTF-8 bytes decoded on demand.
+
+    Big worktree files are memory-mapped (see MMAP_THRESHOLD); files of git revisions and archives are
+    already in memory. Substring searches and slices work on the bytes without copying or decoding them.
+    The line index (the byte offset of each line) is built on the first random access to a line,
+    and only the lines that are accessed are decoded.
+    Lines are as in text mode: universal newlines, normalized to "\\n".
+    """
+
+    def __init__(self, data, encoding="utf-8"):
+        """
+        @param data: The raw content (bytes or mmap).
+        """
+        self.data = data
+        self.encoding = encoding
+        self._line_starts = None
+
+    @classmethod
+    def open(cls, path, filesystem=None):
+        """
+        Open the file of the given filesystem (the worktree by default).
+        Raises OSError if the file cannot be read.
+        """
+        filesystem = filesystem or WORKTREE_FS
+        if filesystem.is_mappable(path) and filesystem.size(path) >= MMAP_THRESHOLD:
+            with open(path, "rb") as file:
+                return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+        return cls(filesystem.read_bytes(path))
+
+    @classmethod
+    def open_head(cls, path, max_size, filesystem=None):
+        """
+        Open the first max_size bytes of the file of the given filesystem, up to the last complete line.
+        Raises OSError if the file cannot be read.
+        """
+        filesystem = filesystem or WORKTREE_FS
+        data = filesystem.read_head(path, max_size)
+        if len(data) == max_size:
+            last_line_end = max(data.rfind(b"\n"), data.rfind(b"\r"))
+            if last_line_end != -1:
+                data = data[: last_line_end + 1]
+        return cls(data)
+
+    @property
+    def is_mapped(self) -> bool:
+        return isinstance(self.data, mmap.mmap)
+
+    def close(self):
+        """
+        Release the memory map, if any (the document cannot be used anymore).
+        """
+        if self.is_mapped:
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.data)
+
+    def view(self, start=0, end=None) -> memoryview:
+        """
+        A zero-copy slice of the raw content.
+        """
+        return memoryview(self.data)[start:end]
+
+    def find(self, marker, start=0, end=None) -> int:
+        """
+        Find an ASCII marker (bytes) in the raw content (up to the end offset, if any), without decoding it.
+        Returns its byte offset, or -1.
+        """
+        if end is None:
+            return self.data.find(marker, start)
+        return self.data.find(marker, start, end)
+
+    def search(self, pattern):
+        """
+        Search a compiled bytes pattern in the raw content, without decoding it. Returns the first match, or None.
+        """
+        return pattern.search(self.data)
+
+    def contains(self, text) -> bool:
+        """
+        Check if the document contains the text (literal match, as in the decoded content).
+        """
+        if "\n" in text or "\r" in text:
+            if self.find(b"\r") != -1:
+                # Line breaks are normalized in the decoded content.
+                return text in self.text()
+        return self.find(text.encode(self.encoding)) != -1
+
+    @property
+    def line_starts(self) -> list[int]:
+        """
+        The byte offset of the start of each line, computed on first access.
+        """
+        if self._line_starts is None:
+            self._line_starts = line_starts(self.data)
+        return self._line_starts
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line(self, index) -> str:
+        """
+        Decode the line at the given index (with its line break). Raises IndexError if there is no such line.
+        """
+        if not 0 <= index < self.line_count:
+            raise IndexError(f"line index out of range: {index}")
+        return decode_line(self.data, index, self.line_starts, self.encoding)
+
+    def head_end(self, max_lines) -> int:
+        """
+        The byte offset of the end of the first max_lines lines, e.g. to search a marker in the head of the file
+        only (see find()). Without the line index, only the line breaks of these lines are searched.
+        """
+        if self._line_starts is not None:
+            return self._line_starts[max_lines] if 0 <= max_lines < self.line_count else len(self.data)
+        return head_end(self.data, max_lines)
+
+    def line_index_at(self, offset) -> int:
+        """
+        The index of the line containing the byte offset (e.g., of a marker found with find()).
+        """
+        return line_index_at(self.data, offset, self._line_starts)
+
+    def lines(self) -> list[str]:
+        """
+        Decode all the lines (as readlines() in text mode).
+        """
+        return io.StringIO(self.text()).readlines()
+
+    def text(self) -> str:
+        """
+        Decode the whole content (as read() in text mode).
+        """
+        return decode_range(self.data, 0, len(self.data), self.encoding)
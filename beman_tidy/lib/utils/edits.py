@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import difflib
+import io
+from pathlib import Path
+
+from .cache import invalidate_cached_file
+from .filesystem import detect_newline, get_filesystem, write_text_atomic
+
+NO_NEWLINE_MARKER = "\\ No newline at end of file\n"
+
+
+def _split_lines(text) -> list[str]:
+    # Lines as git sees them: only "\n" ends a line (a "\r" stays in the content of the line).
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    if not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def unified_diff(old_text, new_text, relative_path) -> str:
+    """
+    Get the diff of a file between two contents, as printed by "git diff" (and accepted by "git apply").
+    Returns "" if the contents are the same.
+    """
+    if old_text == new_text:
+        return ""
+    name = Path(relative_path).as_posix()
+    diff = [f"diff --git a/{name} b/{name}\n"]
+    for line in difflib.unified_diff(_split_lines(old_text), _split_lines(new_text), f"a/{name}", f"b/{name}"):
+        diff.append(line if line.endswith("\n") else line + "\n" + NO_NEWLINE_MARKER)
+    return "".join(diff)
+
+
+class EditBuffer:
+    """
+    The edits of a --fix-inplace (or --fix-diff) run, kept in memory on top of the repository files
+    (the base filesystem: the worktree, or a read-only revision or archive for --fix-diff).
+
+    Fixers write files through the buffer: the new content is only recorded, and every later read
+    (by the same or another check) sees it, so successive fixes of one file are merged.
+    Each edited file is written once, atomically, when the run commits the buffer (see commit()),
+    or the edits are output as a patch, without writing anything (see diff()).
+    Contents are kept with "\n" line breaks (as read in text mode): they are written, or diffed,
+    with the line break style of the file (see detect_newline()).
+    Edits never create or remove files: the listings and walks are the ones of the base filesystem.
+    """
+
+    writable = True
+
+    def __init__(self, base):
+        self.base = base
+        self.walk_cache = base.walk_cache
+        # Absolute path -> new content.
+        self._contents = {}
+        # Absolute path -> number of edits, to version the cached values derived from the file.
+        self._versions = {}
+
+    @staticmethod
+    def _key(path):
+        return str(Path(path).absolute())
+
+    def _pending(self, path):
+        return self._contents.get(self._key(path))
+
+    def exists(self, path) -> bool:
+        return self.base.exists(path)
+
+    def is_file(self, path) -> bool:
+        return self.base.is_file(path)
+
+    def is_dir(self, path) -> bool:
+        return self.base.is_dir(path)
+
+    def iterdir(self, path) -> list[Path]:
+        return self.base.iterdir(path)
+
+    def walk(self, top):
+        return self.base.walk(top)
+
+    def open_text(self, path):
+        content = self._pending(path)
+        return io.StringIO(content) if content is not None else self.base.open_text(path)
+
+    def read_text(self, path) -> str:
+        content = self._pending(path)
+        return content if content is not None else self.base.read_text(path)
+
+    def read_lines(self, path) -> list[str]:
+        content = self._pending(path)
+        return io.StringIO(content).readlines() if content is not None else self.base.read_lines(path)
+
+    def read_bytes(self, path) -> bytes:
+        content = self._pending(path)
+        return content.encode("utf-8") if content is not None else self.base.read_bytes(path)
+
+    def size(self, path) -> int:
+        content = self._pending(path)
+        return len(content.encode("utf-8")) if content is not None else self.base.size(path)
+
+    def read_head(self, path, size) -> bytes:
+        content = self._pending(path)
+        return content.encode("utf-8")[:size] if content is not None else self.base.read_head(path, size)
+
+    def is_mappable(self, path) -> bool:
+        return self._pending(path) is None and self.base.is_mappable(path)
+
+    def cache_identity(self, path):
+        key = self._key(path)
+        if key in self._contents:
+            return ("edit", key), self._versions[key]
+        return self.base.cache_identity(path)
+
+    def content_id(self, path):
+        return None if self._pending(path) is not None else self.base.content_id(path)
+
+    def tracked_files(self, repo_path) -> set[Path] | None:
+        return self.base.tracked_files(repo_path)
+
+    def write_text(self, path, content):
+        """
+        Record the new content of the file; nothing is written until commit().
+        """
+        key = self._key(path)
+        self._contents[key] = content
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    @property
+    def edited_paths(self) -> list[Path]:
+        return [Path(key) for key in self._contents]
+
+    def pending(self) -> dict:
+        """
+        The recorded edits: {absolute path: new content}.
+        """
+        return dict(self._contents)
+
+    def diff(self, root) -> str:
+        """
+        Get the recorded edits as a single patch (see unified_diff()), with paths relative to root.
+        The files are not written.
+        """
+        patches = []
+        for key in sorted(self._contents):
+            # The content as stored (not as read in text mode), so that the patch applies to the file as is,
+            # and the new content with the same line breaks, so that only the edited lines differ.
+            old_data = self.base.read_bytes(key)
+            new_text = self._contents[key]
+            newline = detect_newline(old_data)
+            if newline != "\n":
+                new_text = new_text.replace("\n", newline)
+            patches.append(unified_diff(old_data.decode("utf-8"), new_text, Path(key).relative_to(Path(root).absolute())))
+        return "".join(patches)
+
+    def merge(self, contents):
+        """
+        Record edits made on another copy of the buffer (e.g., by a check run in a worker process).
+        """
+        for key, content in contents.items():
+            if self._contents.get(key) != content:
+                self.write_text(key, content)
+
+    def commit(self) -> list[Path]:
+        """
+        Write each edited file, once and atomically (see write_text_atomic()), with its line break style,
+        then clear the buffer.
+        Files whose content did not change are not written. Returns the paths of the written files.
+        Raises OSError if a file cannot be written (the files written before it are kept).
+        """
+        written = []
+        for key, content in list(self._contents.items()):
+            try:
+                unchanged = self.base.read_text(key) == content
+            except (OSError, UnicodeDecodeError):
+                unchanged = False
+            if not unchanged:
+                write_text_atomic(key, content)
+                written.append(Path(key))
+            del self._contents[key]
+            invalidate_cached_file(key)
+        return written
+
+
+def get_edit_buffer(repo_info) -> EditBuffer | None:
+    """
+    Get the edit buffer of the run (see EditBuffer), or None if the run writes nothing.
+    """
+    filesystem = get_filesystem(repo_info)
+    return filesystem if isinstance(filesystem, EditBuffer) else None
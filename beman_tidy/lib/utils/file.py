@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
-import os
+from dataclasses import dataclass, field
 from pathlib import Path
 from .comments import determine_comment_type
+from .filesystem import WORKTREE_FS
+from .gitignore import GitIgnore, load_directory_gitignore, load_root_gitignore
+from .ignore import compile_ignores
 
 
 def get_repo_ignorable_subdirectories():
@@ -47,56 +50,194 @@ def get_cpp_extensions():
     return get_cpp_header_extensions() | get_cpp_source_extensions()
 
 
-def _is_ignored(path, ignores):
-    path_str = path.as_posix()
-
-    for pattern in ignores:
-        clean_pattern = pattern.rstrip("/") # trailing slash is optional
-        if path_str == clean_pattern or path_str.startswith(clean_pattern + "/"):
-            return True
-    return False
-
-
-def get_matched_paths(repo_path, extensions, ignores=None):
+def walk_repo_files(repo_path, ignores=None, tracked_files=None, filesystem=None):
     """
-    Get all files in the repository matching the given extensions.
-    Ignores paths specified in 'ignores'.
+    Yield the relative paths of all files in the repository, in walk order.
+    Directories excluded by 'ignores' or by git (.gitignore files, .git/info/exclude)
+    are pruned before they are entered; as with git, files tracked in the git index are never
+    excluded by git (see WorktreeFS.tracked_files()), nor are the files of a git revision or an archive.
+
+    If 'tracked_files' is given (see get_tracked_files()), the filesystem is not walked:
+    the tracked files that exist in the working tree are yielded instead, minus 'ignores'.
+    The files are read from 'filesystem' (the worktree by default, see get_filesystem()).
     """
     if ignores is None:
         ignores = get_repo_ignorable_subdirectories()
+    ignores = compile_ignores(ignores)
 
-    matched_files = []
+    filesystem = filesystem or WORKTREE_FS
     repo_path = Path(repo_path)
 
-    for root, dirs, files in os.walk(repo_path):
+    if filesystem.walk_cache is not None and tracked_files is None:
+        key = (repo_path, id(ignores))
+        if key not in filesystem.walk_cache:
+            filesystem.walk_cache[key] = (ignores, list(_walk_repo_files(repo_path, ignores, filesystem)))
+        yield from filesystem.walk_cache[key][1]
+        return
+
+    if tracked_files is not None:
+        # Tracked files are never excluded by .gitignore rules.
+        for f_path in tracked_files:
+            if not ignores.matches(f_path) and filesystem.is_file(repo_path / f_path):
+                yield f_path
+        return
+
+    yield from _walk_repo_files(repo_path, ignores, filesystem)
+
+
+def _walk_repo_files(repo_path, ignores, filesystem):
+    # Files tracked in the git index are never ignored by git: an ignored directory is still entered if it
+    # contains tracked files, and only those are yielded from it.
+    tracked_files = filesystem.tracked_files(repo_path) or set()
+    tracked_dirs = {parent for f_path in tracked_files for parent in f_path.parents}
+
+    # Relative directory -> (gitignore rules that apply to its entries, True if the directory itself is ignored).
+    # All the files of a tree (a git revision, an archive) are tracked: no rules apply to them.
+    use_gitignore = filesystem.has_untracked_files
+    root_gitignore = load_root_gitignore(repo_path, filesystem) if use_gitignore else GitIgnore()
+    gitignores = {Path("."): (root_gitignore, False)}
+
+    for root, dirs, files in filesystem.walk(repo_path):
         rel_root = Path(root).relative_to(repo_path)
+        gitignore, ignored_dir = gitignores.pop(rel_root)
+        if use_gitignore and rel_root != Path(".") and ".gitignore" in files:
+            gitignore = load_directory_gitignore(gitignore, repo_path, rel_root, filesystem)
 
-        for d in list(dirs):
+        kept_dirs = []
+        for d in dirs:
             d_path = rel_root / d
-            if _is_ignored(d_path, ignores):
-                dirs.remove(d)
+            if ignores.matches(d_path):
+                continue
+            ignored = ignored_dir or gitignore.is_ignored(d_path, is_dir=True)
+            if ignored and d_path not in tracked_dirs:
+                continue
+            kept_dirs.append(d)
+            gitignores[d_path] = (gitignore, ignored)
+        dirs[:] = kept_dirs
 
         for f in files:
             f_path = rel_root / f
-            if f_path.suffix in extensions:
-                if not _is_ignored(f_path, ignores):
-                    matched_files.append(f_path)
+            if ignores.matches(f_path):
+                continue
+            if f_path in tracked_files or not (ignored_dir or gitignore.is_ignored(f_path)):
+                yield f_path
+
+
+def is_under_prefix(path, prefix):
+    """
+    Check if the relative path is the given prefix or lies under it, comparing whole path components.
+    e.g., "tests/beman/exemplar/a.test.cpp" is under "tests/beman/exemplar", "srcs/a.md" is not under "src".
+    """
+    prefix_parts = Path(prefix).parts
+    return Path(path).parts[: len(prefix_parts)] == prefix_parts
+
+
+def is_in_directory(path, directory):
+    """
+    Check if the relative path lies in a directory with the given name (or relative path), at any depth,
+    comparing whole path components.
+    e.g., "src/a.md" and "libs/x/src/a.md" are in "src", "srcs/a.md" and "resources/a.md" are not.
+    """
+    directory_parts = Path(directory).parts
+    parent_parts = Path(path).parent.parts
+    return any(
+        parent_parts[start : start + len(directory_parts)] == directory_parts
+        for start in range(len(parent_parts) - len(directory_parts) + 1)
+    )
+
+
+PAPER_EXTENSIONS = (
+    ".md", ".bib", ".bst", ".tex", ".sty", ".cls", ".pdf", ".docx",
+    ".org", ".html", ".css", ".js", ".asciidoc", ".asc", ".ad",
+    ".ascdoc", ".rst", ".wip", ".draft", ".proposal", ".standard",
+)
+
+# Category -> predicate on the file name. A file can belong to several categories.
+REPO_FILE_CATEGORIES = {
+    # Paper-related files, e.g. "abstract.bst", "P2988.tex".
+    "paper": lambda name: name.endswith(PAPER_EXTENSIONS),
+    # Documentation files, e.g. "README.md".
+    "doc": lambda name: name.endswith(".md"),
+    # Test files, e.g. "identity.test.cpp".
+    "test": lambda name: ".test." in name,
+    # Example sources, e.g. "identity_direct_usage.cpp".
+    "example": lambda name: name.endswith(".cpp"),
+    # CMake projects, e.g. "CMakeLists.txt".
+    "cmake": lambda name: name.endswith("CMakeLists.txt"),
+}
+
+
+# All file categories a check can declare as inputs (see CheckInputs): the categories of the shared
+# index, plus the file sets of the batch checks (see get_cpp_files() and get_commentable_files()).
+FILE_CATEGORIES = tuple(REPO_FILE_CATEGORIES) + ("cpp", "commentable")
+
+
+@dataclass
+class RepoFileIndex:
+    """
+    Repository files bucketed by category (see REPO_FILE_CATEGORIES), as relative paths.
+    """
+
+    files: dict[str, list[Path]] = field(default_factory=dict)
+
+    def get(self, category, under=None, exclude=()) -> list[Path]:
+        """
+        Get the files of a category, optionally restricted to a directory prefix (from the repository root),
+        and without the files in any of the excluded directories (at any depth, see is_in_directory()).
+        """
+        return [
+            path
+            for path in self.files.get(category, [])
+            if (under is None or is_under_prefix(path, under))
+            and not any(is_in_directory(path, directory) for directory in exclude)
+        ]
 
-    return sorted(list(set(matched_files)))
 
+def classify_repo_files(repo_path, ignores=None, tracked_files=None, filesystem=None, categories=None) -> RepoFileIndex:
+    """
+    Walk the repository once, pruning ignored directories, and bucket files by category.
+    Only the given categories are indexed (default: all REPO_FILE_CATEGORIES).
+    """
+    predicates = {
+        category: matches
+        for category, matches in REPO_FILE_CATEGORIES.items()
+        if categories is None or category in categories
+    }
+    index = RepoFileIndex({category: [] for category in predicates})
+    for f_path in walk_repo_files(repo_path, ignores=ignores, tracked_files=tracked_files, filesystem=filesystem):
+        for category, matches in predicates.items():
+            if matches(f_path.name):
+                index.files[category].append(f_path)
+
+    for paths in index.files.values():
+        paths.sort()
+    return index
 
-def get_cpp_files(repo_path, ignores=None):
+
+def get_matched_paths(repo_path, extensions, ignores=None, tracked_files=None, filesystem=None):
+    """
+    Get all files in the repository matching the given extensions.
+    Ignores paths specified in 'ignores' and by git.
+    """
+    matched_files = [
+        f_path for f_path in walk_repo_files(repo_path, ignores=ignores, tracked_files=tracked_files, filesystem=filesystem)
+        if f_path.suffix in extensions
+    ]
+    return sorted(set(matched_files))
+
+
+def get_cpp_files(repo_path, ignores=None, tracked_files=None, filesystem=None):
     """
     Get all C++ source and header files in the repository.
     """
-    return get_matched_paths(repo_path, get_cpp_extensions(), ignores=ignores)
+    return get_matched_paths(repo_path, get_cpp_extensions(), ignores=ignores, tracked_files=tracked_files, filesystem=filesystem)
 
 
-def get_non_test_cpp_files(repo_path, ignores=None):
+def get_non_test_cpp_files(repo_path, ignores=None, tracked_files=None, filesystem=None):
     """
     Get all C++ source and header files NOT under a tests/ directory.
     """
-    all_files = get_cpp_files(repo_path, ignores=ignores)
+    all_files = get_cpp_files(repo_path, ignores=ignores, tracked_files=tracked_files, filesystem=filesystem)
 
     non_test_files = []
     for path in all_files:
@@ -106,11 +247,11 @@ def get_non_test_cpp_files(repo_path, ignores=None):
     return non_test_files
 
 
-def get_beman_include_headers(repo_path, ignores=None):
+def get_beman_include_headers(repo_path, ignores=None, tracked_files=None, filesystem=None):
     """
     Get all header files in the repository under an include/beman directory.
     """
-    all_headers = get_matched_paths(repo_path, get_cpp_header_extensions(), ignores=ignores)
+    all_headers = get_matched_paths(repo_path, get_cpp_header_extensions(), ignores=ignores, tracked_files=tracked_files, filesystem=filesystem)
     
     beman_headers = []
     for path in all_headers:
@@ -144,56 +285,51 @@ COMMENTABLE_FILENAMES = {
 }
 
 
-def get_commentable_files(repo_path, ignores=None):
+def get_commentable_files(repo_path, ignores=None, tracked_files=None, filesystem=None):
     """
     Get all files that can contain a comment (and thus should have an SPDX identifier).
     Covers C++, CMake, Python, shell scripts, and YAML files.
     """
-    if ignores is None:
-        ignores = get_repo_ignorable_subdirectories()
-
-    matched_files = []
-    repo_path = Path(repo_path)
-
-    for root, dirs, files in os.walk(repo_path):
-        rel_root = Path(root).relative_to(repo_path)
-
-        for d in list(dirs):
-            d_path = rel_root / d
-            if _is_ignored(d_path, ignores):
-                dirs.remove(d)
+    matched_files = [
+        f_path for f_path in walk_repo_files(repo_path, ignores=ignores, tracked_files=tracked_files, filesystem=filesystem)
+        if f_path.suffix in COMMENTABLE_EXTENSIONS or f_path.name in COMMENTABLE_FILENAMES
+    ]
+    return sorted(set(matched_files))
 
-        for f in files:
-            f_path = rel_root / f
-            if f_path.suffix in COMMENTABLE_EXTENSIONS or f_path.name in COMMENTABLE_FILENAMES:
-                if not _is_ignored(f_path, ignores):
-                    matched_files.append(f_path)
 
-    return sorted(list(set(matched_files)))
+def find_spdx_index(lines):
+    """
+    Returns the index of the first line containing the SPDX license identifier, or -1.
+    """
+    return next(
+        (i for i, line in enumerate(lines) if "SPDX-License-Identifier:" in line),
+        -1
+    )
 
 
-def get_spdx_info(lines):
+def get_spdx_info(lines, comment_map=None):
     """
     Helper to find the SPDX line index and the comment info.
     Returns (spdx_index, comment_info).
 
     If not found or invalid, returns (-1, None).
     """
-    spdx_index = next(
-        (i for i, line in enumerate(lines) if "SPDX-License-Identifier:" in line),
-        -1
-    )
-
+    spdx_index = find_spdx_index(lines)
     if spdx_index == -1:
         return -1, None
 
-    comment_info = determine_comment_type(lines, spdx_index)
+    comment_info = determine_comment_type(
+        lines,
+        spdx_index,
+        comment_map=comment_map,
+        column=lines[spdx_index].find("SPDX-License-Identifier:"),
+    )
     return spdx_index, comment_info
 
 
-def get_test_files(repo_path, ignores=None):
+def get_test_files(repo_path, ignores=None, tracked_files=None, filesystem=None):
     """
     Get all C++ files in the tests/ directory.
     """
-    all_cpp_files = get_cpp_files(repo_path, ignores=ignores)
+    all_cpp_files = get_cpp_files(repo_path, ignores=ignores, tracked_files=tracked_files, filesystem=filesystem)
     return [p for p in all_cpp_files if "tests" in p.parts]
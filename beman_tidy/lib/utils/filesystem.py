@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import hashlib
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+
+from git import Repo
+
+from .git_index import get_tracked_files
+from .scan import LINE_BREAK_RE
+
+# Bytes read from the start of a file to find its line break style (see detect_newline()).
+NEWLINE_SNIFF_SIZE = 4096
+
+
+def _normalize_newlines(text):
+    # Same as reading a file in text mode (universal newlines).
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def detect_newline(data) -> str:
+    """
+    Get the line break style of a raw content ("\n", "\r\n" or "\r"): the one of its first line,
+    "\n" if it has no line break.
+    """
+    match = LINE_BREAK_RE.search(data)
+    return match.group().decode("ascii") if match else "\n"
+
+
+def write_text_atomic(path, content, newline=None):
+    """
+    Write the file through a temporary file in the same directory, renamed over it:
+    readers see either the old or the new content, never a partial write. The file mode is kept.
+    The content has "\n" line breaks (as read in text mode); they are written as newline,
+    by default the line break style of the existing file (see detect_newline()), so that it is kept.
+    """
+    path = Path(path)
+    if newline is None:
+        try:
+            with open(path, "rb") as file:
+                newline = detect_newline(file.read(NEWLINE_SNIFF_SIZE))
+        except OSError:
+            newline = "\n"
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline=newline) as file:
+            file.write(content)
+        if path.exists():
+            shutil.copymode(path, temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class WorktreeFS:
+    """
+    The repository files, as found on disk (default backend).
+    """
+
+    writable = True
+    # Untracked files can be excluded by .gitignore rules (see walk_repo_files()).
+    has_untracked_files = True
+
+    def __init__(self, cache_walks=False):
+        # The worktree can change at any time: repository walks are only cached on request,
+        # for runs that do not modify it (see walk_repo_files()).
+        self.walk_cache = {} if cache_walks else None
+
+    def exists(self, path) -> bool:
+        return Path(path).exists()
+
+    def is_file(self, path) -> bool:
+        return Path(path).is_file()
+
+    def is_dir(self, path) -> bool:
+        return Path(path).is_dir()
+
+    def iterdir(self, path) -> list[Path]:
+        return list(Path(path).iterdir())
+
+    def walk(self, top):
+        """
+        Same as os.walk(top): yields (root, dirs, files); dirs can be pruned in place.
+        """
+        return os.walk(top)
+
+    def open_text(self, path):
+        """
+        Open the file for streaming reads in text mode.
+        """
+        return open(path, "r")
+
+    def read_text(self, path) -> str:
+        with open(path, "r") as file:
+            return file.read()
+
+    def read_lines(self, path) -> list[str]:
+        with open(path, "r") as file:
+            return file.readlines()
+
+    def read_bytes(self, path) -> bytes:
+        with open(path, "rb") as file:
+            return file.read()
+
+    def size(self, path) -> int:
+        """
+        The size of the file in bytes.
+        """
+        return os.stat(path).st_size
+
+    def is_mappable(self, path) -> bool:
+        """
+        True if the file can be memory-mapped (see Document), i.e. its content is on disk.
+        """
+        return True
+
+    def write_text(self, path, content):
+        """
+        Write the file (atomically, see write_text_atomic()).
+        """
+        write_text_atomic(path, content)
+
+    def read_head(self, path, size) -> bytes:
+        """
+        Read at most size bytes from the start of the file, without reading the rest of it.
+        """
+        with open(path, "rb") as file:
+            return file.read(size)
+
+    def cache_identity(self, path):
+        """
+        Returns (key, version) identifying the file content for derived-value caches.
+        Raises OSError if the file cannot be accessed.
+        """
+        stat = os.stat(path)
+        return str(Path(path).absolute()), (stat.st_mtime_ns, stat.st_size)
+
+    def content_id(self, path):
+        """
+        Returns an ID of the file content shared by all files with the same content, if cheaply known.
+        Worktree files have none.
+        """
+        return None
+
+    def tracked_files(self, repo_path) -> set[Path] | None:
+        """
+        The relative paths of the files tracked in the git index of the repository (never ignored by git),
+        or None if there is no readable index (see walk_repo_files()).
+        """
+        try:
+            return set(get_tracked_files(repo_path))
+        except ValueError:
+            return None
+
+
+WORKTREE_FS = WorktreeFS()
+
+
+class GitObjectStore:
+    """
+    Read access to the git object database of a repository, shared by all revisions.
+    Objects are read through GitPython's persistent "git cat-file --batch" process;
+    blob contents are cached by SHA.
+    """
+
+    def __init__(self, repo_path):
+        self.repo = Repo(repo_path)
+        self._trees = {}
+        self._blobs = {}
+
+    def resolve(self, rev):
+        """
+        Resolve a commit-ish (branch, tag, SHA, "HEAD~3", ...) to a commit.
+        Raises ValueError if it does not name a commit.
+        """
+        try:
+            return self.repo.commit(rev)
+        except Exception as e:
+            raise ValueError(f"'{rev}' is not a valid commit: {e}")
+
+    def read_tree(self, tree) -> dict:
+        """
+        Get the entries of a tree object: {name: tree, blob or submodule}.
+        Listings are cached by SHA, so unchanged directories are read once across revisions.
+        """
+        listing = self._trees.get(tree.hexsha)
+        if listing is None:
+            listing = {item.name: item for item in tree}
+            self._trees[tree.hexsha] = listing
+        return listing
+
+    def read_blob(self, blob) -> bytes:
+        data = self._blobs.get(blob.hexsha)
+        if data is None:
+            data = blob.data_stream.read()
+            self._blobs[blob.hexsha] = data
+        return data
+
+    def close(self):
+        self._trees.clear()
+        self._blobs.clear()
+        self.repo.close()
+
+
+_object_stores = {}
+
+
+def get_git_object_store(repo_path) -> GitObjectStore:
+    """
+    Get the (per-process) object store of the repository at repo_path.
+    """
+    key = str(Path(repo_path).absolute())
+    if key not in _object_stores:
+        _object_stores[key] = GitObjectStore(repo_path)
+    return _object_stores[key]
+
+
+def release_git_processes():
+    """
+    Stop the persistent "git cat-file" processes of the object stores; they are restarted on demand.
+    Called before forking a worker (see worker.py), so that processes never share a git pipe.
+    """
+    for store in _object_stores.values():
+        store.repo.git.clear_cache()
+
+
+class TreeFS:
+    """
+    Base class for read-only views of the repository files backed by a tree of entries
+    (a git commit, an archive), instead of the worktree.
+    Paths are the same as for the worktree (root / relative path), nothing is extracted to disk.
+
+    Entries have a "type": "tree" (directory), "blob" (file) or "submodule" (seen as an empty directory).
+    Subclasses provide the root entry and implement _read_tree(), _read_blob(), _blob_size() and _blob_id().
+    """
+
+    writable = False
+    # Every file of a tree is tracked: .gitignore rules never exclude any (see walk_repo_files()).
+    has_untracked_files = False
+
+    def __init__(self, root, root_item):
+        self.root = Path(root)
+        self._root_str = str(self.root)
+        self._root_prefix = self._root_str + os.sep
+        self._root_item = root_item
+        # Relative directory ("" for the root) -> {name: entry}.
+        self._listings = {"": self._read_tree(root_item)}
+        # A tree never changes: repository walks are cached (see walk_repo_files()).
+        self.walk_cache = {}
+
+    def _read_tree(self, item) -> dict:
+        raise NotImplementedError
+
+    def _read_blob(self, item) -> bytes:
+        raise NotImplementedError
+
+    def _blob_size(self, item) -> int:
+        raise NotImplementedError
+
+    def _blob_id(self, item) -> str:
+        raise NotImplementedError
+
+    def _relative(self, path):
+        path_str = os.fspath(path)
+        if path_str.startswith(self._root_prefix):
+            return path_str[len(self._root_prefix) :]
+        if path_str == self._root_str:
+            return ""
+        path = Path(path)
+        try:
+            relative = path.relative_to(self.root)
+        except ValueError:
+            if path.is_absolute():
+                return None
+            relative = path
+        relative = relative.as_posix()
+        return "" if relative == "." else relative
+
+    def _listing(self, relative_dir):
+        listing = self._listings.get(relative_dir)
+        if listing is None:
+            parent, _, name = relative_dir.rpartition("/")
+            parent_listing = self._listing(parent)
+            item = parent_listing.get(name) if parent_listing is not None else None
+            if item is None or item.type not in ("tree", "submodule"):
+                return None
+            listing = self._read_tree(item) if item.type == "tree" else {}
+            self._listings[relative_dir] = listing
+        return listing
+
+    def _lookup(self, path):
+        relative = self._relative(path)
+        if relative is None:
+            return None
+        if relative == "":
+            return self._root_item
+        parent, _, name = relative.rpartition("/")
+        listing = self._listing(parent)
+        return listing.get(name) if listing is not None else None
+
+    def exists(self, path) -> bool:
+        return self._lookup(path) is not None
+
+    def is_file(self, path) -> bool:
+        item = self._lookup(path)
+        return item is not None and item.type == "blob"
+
+    def is_dir(self, path) -> bool:
+        item = self._lookup(path)
+        return item is not None and item.type in ("tree", "submodule")
+
+    def iterdir(self, path) -> list[Path]:
+        relative = self._relative(path)
+        listing = self._listing(relative) if relative is not None else None
+        if listing is None:
+            raise NotADirectoryError(str(path))
+        return [Path(path) / name for name in listing]
+
+    def walk(self, top):
+        """
+        Same as os.walk(top), over the tree.
+        """
+        relative_top = self._relative(top)
+        if relative_top is None or self._listing(relative_top) is None:
+            return
+        pending = [(Path(top), relative_top)]
+        while pending:
+            root, relative_root = pending.pop()
+            listing = self._listing(relative_root)
+            dirs = [name for name, item in listing.items() if item.type in ("tree", "submodule")]
+            files = [name for name, item in listing.items() if item.type == "blob"]
+            yield str(root), dirs, files
+            # Visit the (possibly pruned) subdirectories, in order.
+            for name in reversed(dirs):
+                child = f"{relative_root}/{name}" if relative_root else name
+                pending.append((root / name, child))
+
+    def _blob(self, path):
+        item = self._lookup(path)
+        if item is None:
+            raise FileNotFoundError(str(path))
+        if item.type != "blob":
+            raise IsADirectoryError(str(path))
+        return item
+
+    def read_bytes(self, path) -> bytes:
+        return self._read_blob(self._blob(path))
+
+    def size(self, path) -> int:
+        return self._blob_size(self._blob(path))
+
+    def is_mappable(self, path) -> bool:
+        return False
+
+    def read_head(self, path, size) -> bytes:
+        return self.read_bytes(path)[:size]
+
+    def read_text(self, path) -> str:
+        return _normalize_newlines(self.read_bytes(path).decode("utf-8"))
+
+    def read_lines(self, path) -> list[str]:
+        return io.StringIO(self.read_text(path)).readlines()
+
+    def open_text(self, path):
+        return io.StringIO(self.read_text(path))
+
+    def cache_identity(self, path):
+        """
+        Files are identified by their git blob SHA: derived values are shared by all paths,
+        revisions and archives with the same content.
+        """
+        sha = self._blob_id(self._blob(path))
+        return ("blob", sha), sha
+
+    def content_id(self, path):
+        """
+        The blob SHA of the file, or None if it is not a file of the tree.
+        """
+        item = self._lookup(path)
+        return self._blob_id(item) if item is not None and item.type == "blob" else None
+
+    def tracked_files(self, repo_path) -> set[Path] | None:
+        """
+        Trees have no git index: None (see WorktreeFS.tracked_files()).
+        """
+        return None
+
+
+class GitTreeFS(TreeFS):
+    """
+    A read-only view of the repository files at a given commit, backed by the git object database.
+    """
+
+    def __init__(self, repo_path, rev, store=None):
+        self.store = store or get_git_object_store(repo_path)
+        self.commit = self.store.resolve(rev)
+        self.rev = rev
+        super().__init__(repo_path, self.commit.tree)
+
+    def _read_tree(self, item):
+        return self.store.read_tree(item)
+
+    def _read_blob(self, item):
+        return self.store.read_blob(item)
+
+    def _blob_size(self, item):
+        # From the object header: the blob is not read.
+        return item.size
+
+    def _blob_id(self, item):
+        return item.hexsha
+
+
+# Source archives that can be checked directly (see ArchiveFS).
+ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz", ".tar", ".zip")
+
+
+def is_archive_path(path) -> bool:
+    """
+    Check if the path is a source archive file (e.g., a release artifact).
+    """
+    path = Path(path)
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES) and path.is_file()
+
+
+class _ArchiveEntry:
+    """
+    A directory ("tree") or file ("blob") of an archive.
+    """
+
+    __slots__ = ("type", "children", "data", "zip_info", "sha", "size")
+
+    def __init__(self, type, data=None, zip_info=None, size=0):
+        self.type = type
+        self.children = {} if type == "tree" else None
+        self.data = data
+        self.zip_info = zip_info
+        self.sha = None
+        self.size = size
+
+
+class ArchiveFS(TreeFS):
+    """
+    A read-only view of a source archive (.tar.gz, .tar, .zip, ...), nothing is extracted to disk.
+    Tar archives are read in a single streaming pass, keeping the regular files in memory;
+    zip entries are decompressed on demand. A common top-level directory (e.g., "exemplar-1.0.0/")
+    is stripped, as for the archives created by "git archive --prefix" and GitHub releases.
+    """
+
+    def __init__(self, archive_path, retained_files=None):
+        """
+        retained_files: relative paths of the files whose content is needed (default: all files).
+        Other files are listed, but their content is skipped while streaming and cannot be read.
+        """
+        self.archive_path = Path(archive_path)
+        self._retained_files = retained_files
+        # Name of the stripped top-level directory, if any.
+        self.top_level_name = None
+        # Commit ID recorded by "git archive" (pax header or zip comment), if any.
+        self.commit_hash = None
+        self._zip = None
+
+        try:
+            if zipfile.is_zipfile(self.archive_path):
+                members = self._read_zip_members()
+            else:
+                members = self._read_tar_members()
+        except (OSError, tarfile.TarError, zipfile.BadZipFile, EOFError) as e:
+            raise ValueError(f"cannot read the archive '{self.archive_path}': {e}")
+
+        super().__init__(archive_path, self._build_tree(members))
+
+    def _read_tar_members(self):
+        members = []
+        # "r|*": sequential access to a (possibly compressed) stream, no seeking.
+        with tarfile.open(self.archive_path, mode="r|*") as tar:
+            for member in tar:
+                if member.isdir():
+                    members.append((member.name, _ArchiveEntry("tree")))
+                elif member.isfile():
+                    # Members must be read before moving to the next one.
+                    data = tar.extractfile(member).read() if self._is_retained(member.name) else None
+                    members.append((member.name, _ArchiveEntry("blob", data=data, size=member.size)))
+                # Links and special files are not part of the checked tree.
+            self.commit_hash = tar.pax_headers.get("comment") or None
+        return members
+
+    def _is_retained(self, name):
+        if self._retained_files is None:
+            return True
+        # The top-level directory is not known yet: compare without the first component too.
+        name = name.strip("/").removeprefix("./")
+        return name in self._retained_files or name.partition("/")[2] in self._retained_files
+
+    def _read_zip_members(self):
+        self._zip = zipfile.ZipFile(self.archive_path)
+        self.commit_hash = self._zip.comment.decode("utf-8", errors="replace").strip() or None
+        return [
+            (info.filename, _ArchiveEntry("tree" if info.is_dir() else "blob", zip_info=info, size=info.file_size))
+            for info in self._zip.infolist()
+        ]
+
+    def _build_tree(self, members):
+        members = [
+            (parts, entry)
+            for name, entry in members
+            if (parts := [part for part in name.split("/") if part not in ("", ".")])
+        ]
+        top_level_names = {parts[0] for parts, _ in members}
+        if len(top_level_names) == 1 and all(len(parts) > 1 or entry.type == "tree" for parts, entry in members):
+            self.top_level_name = top_level_names.pop()
+            members = [(parts[1:], entry) for parts, entry in members if len(parts) > 1]
+
+        root = _ArchiveEntry("tree")
+        for parts, entry in members:
+            directory = root
+            for part in parts[:-1]:
+                directory = directory.children.setdefault(part, _ArchiveEntry("tree"))
+                if directory.type != "tree":
+                    break
+            else:
+                if entry.type == "blob" or parts[-1] not in directory.children:
+                    directory.children[parts[-1]] = entry
+        return root
+
+    def _read_tree(self, item):
+        return item.children
+
+    def _read_blob(self, item):
+        if item.data is None:
+            if item.zip_info is None:
+                raise OSError("the file content was not retained when streaming the archive")
+            item.data = self._zip.read(item.zip_info)
+        return item.data
+
+    def _blob_size(self, item):
+        return item.size
+
+    def _blob_id(self, item):
+        # Same ID as git, so derived values are shared with revisions of the repository.
+        if item.sha is None:
+            data = self._read_blob(item)
+            item.sha = hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+        return item.sha
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+def get_filesystem(repo_info):
+    """
+    Get the filesystem backend the checks read the repository from (the worktree by default).
+    """
+    return repo_info.get("filesystem") or WORKTREE_FS
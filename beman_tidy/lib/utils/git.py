@@ -9,6 +9,9 @@ from pathlib import Path
 
 from git import Repo, InvalidGitRepositoryError
 from .config import load_repo_config
+from .filesystem import ARCHIVE_SUFFIXES, ArchiveFS, GitTreeFS, is_archive_path
+from .git_index import get_tracked_files
+from .matcher import build_values_matcher
 
 
 def parse_repo_name_from_remote_url(remote_url: str) -> str | None:
@@ -48,62 +51,94 @@ def parse_repo_name_from_remote_url(remote_url: str) -> str | None:
     return None
 
 
-def get_repo_info(path: str, config_path: str | None = None):
+def get_remote_url(repo):
+    """
+    Get the remote URL, preferring 'upstream' over 'origin' to handle forks correctly.
+    Returns None if the repository has neither.
+    """
+    # Forks often have 'upstream' pointing to the original repository with the correct name
+    # TODO: Consider using GitHub/GitLab API to get canonical repository metadata,
+    #       which would be more robust for forks with renamed repositories
+    if "upstream" in repo.remotes:
+        return repo.remote("upstream").url
+    if "origin" in repo.remotes:
+        return repo.remote("origin").url
+    return None
+
+
+def get_repo_short_name(repo_name, remote_url=None):
+    """
+    Get the repository short name, e.g. "optional" for "beman.optional".
+    """
+    # Get the repository short name from remote URL (actual repo name, not checkout dir)
+    # This handles forks correctly by using upstream if available
+    short_name = parse_repo_name_from_remote_url(remote_url) if remote_url else None
+    # Fall back to directory name if we can't parse the remote URL
+    if short_name is None:
+        short_name = repo_name
+    # Normalize: repo may be named "beman.optional" on disk or on GitHub; short_name = "optional"
+    if short_name.startswith("beman."):
+        short_name = short_name[6:]
+    return short_name
+
+
+# repo_info fields that require git commands, fetched on demand (see get_repo_info()).
+GIT_METADATA_FIELDS = ("current_branch", "default_branch", "commit_hash", "status", "unstaged_changes")
+
+
+def get_repo_info(path: str, config_path: str | None = None, metadata=None, retained_files=None):
     """
     Get information about the repository at the given path.
     Returns data as a dictionary.
+
+    metadata: the GIT_METADATA_FIELDS to fetch (default: all), the others are None.
+    retained_files: for archives, the files whose content is needed (default: all, see ArchiveFS).
     """
 
     path: Path = Path(path)
+    if is_archive_path(path):
+        return get_archive_repo_info(path, config_path=config_path, retained_files=retained_files)
+
     try:
         # Initialize the repository object
         repo = Repo(path.absolute(), search_parent_directories=True)
 
+        if repo.bare:
+            return get_bare_repo_info(repo, config_path=config_path)
+
         # Get the top-level directory of the repository
         top_level_dir = Path(repo.git.rev_parse("--show-toplevel"))
 
         # Get the repository name (directory name of the top level)
         repo_name = top_level_dir.name
 
-        # Get the remote URL, preferring 'upstream' over 'origin' to handle forks correctly
-        # Forks often have 'upstream' pointing to the original repository with the correct name
-        # TODO: Consider using GitHub/GitLab API to get canonical repository metadata,
-        #       which would be more robust for forks with renamed repositories
-        remote_url = None
-        if "upstream" in repo.remotes:
-            remote_url = repo.remote("upstream").url
-        elif "origin" in repo.remotes:
-            remote_url = repo.remote("origin").url
-
-        # Get the repository short name from remote URL (actual repo name, not checkout dir)
-        # This handles forks correctly by using upstream if available
-        short_name = parse_repo_name_from_remote_url(remote_url) if remote_url else None
-        # Fall back to directory name if we can't parse the remote URL
-        if short_name is None:
-            short_name = repo_name
-        # Normalize: repo may be named "beman.optional" on disk or on GitHub; short_name = "optional"
-        if short_name.startswith("beman."):
-            short_name = short_name[6:]
+        remote_url = get_remote_url(repo)
+        short_name = get_repo_short_name(repo_name, remote_url)
+
+        def wanted(field):
+            return metadata is None or field in metadata
 
         # Get the current branch
-        current_branch = repo.active_branch.name
+        current_branch = repo.active_branch.name if wanted("current_branch") else None
 
         # Get the default branch
         # Note: shallow clones (e.g. GitHub Actions) may not have refs/remotes/origin/HEAD set.
-        try:
-            split_head = repo.git.symbolic_ref("refs/remotes/origin/HEAD").split("/")
-            default_branch = split_head[-1]
-        except Exception:
-            default_branch = "main"  # fallback for shallow clones
+        default_branch = None
+        if wanted("default_branch"):
+            try:
+                split_head = repo.git.symbolic_ref("refs/remotes/origin/HEAD").split("/")
+                default_branch = split_head[-1]
+            except Exception:
+                default_branch = "main"  # fallback for shallow clones
 
         # Get the commit hash
-        commit_hash = repo.head.commit.hexsha
+        commit_hash = repo.head.commit.hexsha if wanted("commit_hash") else None
 
         # Get the status of the repository
-        status = repo.git.status()
+        status = repo.git.status() if wanted("status") else None
 
         # Get unstaged changes
-        unstaged_changes = repo.git.diff("--stat")
+        unstaged_changes = repo.git.diff("--stat") if wanted("unstaged_changes") else None
 
         # Load repository configuration
         config = load_repo_config(top_level_dir, config_path)
@@ -128,18 +163,109 @@ def get_repo_info(path: str, config_path: str | None = None):
         sys.exit(1)
 
 
-def get_beman_standard_config_path():
+def get_bare_repo_info(repo, config_path=None):
     """
-    Get the path to the Beman Standard YAML configuration file.
+    Get information about a bare repository (e.g., a mirror): the files are read from HEAD
+    (see use_repo_revision() for another revision), nothing is checked out.
     """
-    return Path(__file__).parent.parent.parent / ".beman-standard.yaml"
+    top_level_dir = Path(repo.git_dir)
+    repo_name = top_level_dir.name.removesuffix(".git")
+    remote_url = get_remote_url(repo)
 
+    # The HEAD of a bare mirror is the default branch of the repository.
+    try:
+        current_branch = repo.active_branch.name
+    except TypeError:  # detached HEAD
+        current_branch = None
+
+    filesystem = GitTreeFS(top_level_dir, "HEAD")
+    return {
+        "top_level": top_level_dir,
+        "name": repo_name,
+        "short_name": get_repo_short_name(repo_name, remote_url),
+        "remote_url": remote_url,
+        "current_branch": current_branch,
+        "default_branch": current_branch or "main",
+        "commit_hash": filesystem.commit.hexsha,
+        "status": "",
+        "unstaged_changes": "",
+        "config": load_repo_config(top_level_dir, config_path, filesystem=filesystem),
+        "filesystem": filesystem,
+        "rev": "HEAD",
+    }
+
+
+# Version suffix of a source archive name, e.g. "-1.0.0", "-v2.1.0-rc1".
+_ARCHIVE_VERSION_SUFFIX = re.compile(r"-v?\d+(\.\d+)*([-+][\w.]+)?$")
+
+
+def get_archive_repo_info(path, config_path=None, retained_files=None):
+    """
+    Get information about a source archive (.tar.gz, .zip, ...) of a repository, read without extraction.
+    """
+    try:
+        filesystem = ArchiveFS(path, retained_files=retained_files)
+    except ValueError as e:
+        logging.error(f"Cannot check the archive: {e}")
+        sys.exit(1)
+
+    archive_name = Path(path).name
+    for suffix in ARCHIVE_SUFFIXES:
+        if archive_name.lower().endswith(suffix):
+            archive_name = archive_name[: -len(suffix)]
+            break
+    repo_name = _ARCHIVE_VERSION_SUFFIX.sub("", filesystem.top_level_name or archive_name)
+
+    return {
+        "top_level": filesystem.root,
+        "name": repo_name,
+        "short_name": get_repo_short_name(repo_name),
+        "remote_url": None,
+        "current_branch": None,
+        "default_branch": "main",
+        "commit_hash": filesystem.commit_hash,
+        "status": "",
+        "unstaged_changes": "",
+        "config": load_repo_config(filesystem.root, config_path, filesystem=filesystem),
+        "filesystem": filesystem,
+    }
+
+
+def use_repo_revision(repo_info, rev, config_path=None):
+    """
+    Check the repository as of the given commit-ish instead of the working tree.
+    The files are read from the git object database (see GitTreeFS), nothing is checked out.
+    """
+    try:
+        filesystem = GitTreeFS(repo_info["top_level"], rev)
+    except ValueError as e:
+        logging.error(f"Cannot check the revision of '{repo_info['top_level']}': {e}")
+        sys.exit(1)
+
+    repo_info["filesystem"] = filesystem
+    repo_info["rev"] = rev
+    repo_info["commit_hash"] = filesystem.commit.hexsha
+    # The repository configuration is the one committed in that revision.
+    repo_info["config"] = load_repo_config(repo_info["top_level"], config_path, filesystem=filesystem)
+    return repo_info
 
-def get_beman_recommended_license_path():
+
+def get_repo_tracked_files(repo_info):
+    """
+    Get the files tracked in the git index of the repository (relative paths).
+    """
+    try:
+        return get_tracked_files(repo_info["top_level"])
+    except ValueError as e:
+        logging.error(f"Cannot list the tracked files of '{repo_info['top_level']}': {e}")
+        sys.exit(1)
+
+
+def get_beman_standard_config_path():
     """
-    Get the path to the Beman recommended license file.
+    Get the path to the Beman Standard YAML configuration file.
     """
-    return Path(__file__).parent.parent.parent / "LICENSE"
+    return Path(__file__).parent.parent.parent / ".beman-standard.yaml"
 
 
 def load_beman_standard_config(path=get_beman_standard_config_path()):
@@ -171,6 +297,8 @@ def load_beman_standard_config(path=get_beman_standard_config_path()):
             # e.g., ["a string value", "another string value"]
             elif "values" in entry:
                 check_config["values"] = entry["values"]
+                # Compiled once here, so checks scan a file once for all values.
+                check_config["values_matcher"] = build_values_matcher(entry["values"])
             elif "regex" in entry:
                 # TODO: Implement the regex check.
                 pass
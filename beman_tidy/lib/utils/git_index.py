@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+
+# See https://git-scm.com/docs/index-format.
+_INDEX_SIGNATURE = b"DIRC"
+_SUPPORTED_VERSIONS = (2, 3, 4)
+# ctime, mtime (seconds + nanoseconds), dev, ino, mode, uid, gid, size.
+_ENTRY_STAT = struct.Struct(">10I")
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE_MASK = 0x3000
+_FLAG_NAME_MASK = 0x0FFF
+
+# Extensions follow the entries: a 4-byte signature and a 32-bit size. A split index
+# (see git update-index --split-index) has a "link" extension to its shared index.
+_EXTENSION_HEADER = struct.Struct(">4sI")
+_LINK_EXTENSION = b"link"
+
+# Object types stored in the upper bits of the entry mode.
+_MODE_TYPE_MASK = 0o170000
+_MODE_GITLINK = 0o160000  # submodule
+_MODE_DIRECTORY = 0o040000  # sparse index directory entry
+
+
+@dataclass(frozen=True)
+class GitIndexEntry:
+    # Path relative to the repository root, POSIX style.
+    path: str
+    mode: int
+    size: int
+    # Hex object ID of the staged blob.
+    object_id: str
+    # Merge stage: 0 for normal entries, 1-3 for unresolved conflicts.
+    stage: int
+
+
+def find_git_dir(repo_path) -> Path | None:
+    """
+    Get the git directory of a working tree: .git itself, or the directory a .git file
+    points to (worktrees, submodules). Returns None if there is none.
+    """
+    dot_git = Path(repo_path) / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        content = dot_git.read_text(encoding="utf-8").strip()
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:") :].strip())
+            return git_dir if git_dir.is_absolute() else (Path(repo_path) / git_dir).resolve()
+    return None
+
+
+def find_common_dir(git_dir) -> Path:
+    """
+    Get the common git directory (with the config and the objects) of a git directory:
+    the main git directory for a linked worktree, the git directory itself otherwise.
+    """
+    git_dir = Path(git_dir)
+    try:
+        common_dir = Path((git_dir / "commondir").read_text(encoding="utf-8").strip())
+    except OSError:
+        return git_dir
+    return common_dir if common_dir.is_absolute() else (git_dir / common_dir).resolve()
+
+
+def _object_id_size(git_dir):
+    # Repositories created with --object-format=sha256 use 32-byte object IDs.
+    try:
+        config = (find_common_dir(git_dir) / "config").read_text(encoding="utf-8").lower()
+    except OSError:
+        return 20
+    for line in config.splitlines():
+        key, _, value = line.partition("=")
+        if key.strip() == "objectformat" and value.strip() == "sha256":
+            return 32
+    return 20
+
+
+def _read_varint(data, offset):
+    # Offset-encoded varint used by index v4 path prefix compression.
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, offset
+
+
+def _read_ewah_bits(data, offset):
+    # A bitmap of the link extension, EWAH-compressed: bit size, word count, words, then
+    # the position of the last run-length word. Returns the set bit positions and the end offset.
+    _bit_size, word_count = struct.unpack_from(">II", data, offset)
+    words = struct.unpack_from(f">{word_count}Q", data, offset + 8)
+    bits = []
+    position = 0
+    index = 0
+    while index < word_count:
+        # A run-length word: the running bit, the run length (in words), then the number of literal words.
+        marker = words[index]
+        run_length = (marker >> 1) & 0xFFFFFFFF
+        literal_count = marker >> 33
+        if marker & 1:
+            bits.extend(range(position, position + run_length * 64))
+        position += run_length * 64
+        for literal in words[index + 1 : index + 1 + literal_count]:
+            bits.extend(position + bit for bit in range(64) if literal >> bit & 1)
+            position += 64
+        index += 1 + literal_count
+    return bits, offset + 8 + word_count * 8 + 4
+
+
+def _parse_link_extension(data, object_id_size):
+    # The shared index ID, then (if any) the bitmaps of the shared entries deleted and replaced by the split index.
+    shared_index_id = data[:object_id_size].hex()
+    if len(data) == object_id_size:
+        return shared_index_id, [], []
+    delete_bits, offset = _read_ewah_bits(data, object_id_size)
+    replace_bits, _ = _read_ewah_bits(data, offset)
+    return shared_index_id, delete_bits, replace_bits
+
+
+def _merge_split_index(shared_entries, split_entries, delete_bits, replace_bits) -> list[GitIndexEntry]:
+    # As git's merge_base_index(): the first split entries (with an empty path) replace the content
+    # of the marked shared entries, the deleted ones are dropped, and the other split entries are added.
+    entries = list(shared_entries)
+    for replacement, position in zip(split_entries, replace_bits):
+        if replacement.path or position >= len(entries):
+            raise ValueError("corrupted link extension in the git index")
+        entries[position] = GitIndexEntry(
+            path=entries[position].path,
+            mode=replacement.mode,
+            size=replacement.size,
+            object_id=replacement.object_id,
+            stage=replacement.stage,
+        )
+    deleted = set(delete_bits)
+    merged = {(entry.path, entry.stage): entry for index, entry in enumerate(entries) if index not in deleted}
+    for entry in split_entries[len(replace_bits) :]:
+        if not entry.path:
+            raise ValueError("corrupted link extension in the git index")
+        merged[(entry.path, entry.stage)] = entry
+    return [merged[key] for key in sorted(merged)]
+
+
+def parse_git_index(data, object_id_size=20, read_shared_index=None) -> list[GitIndexEntry]:
+    """
+    Parse the content of a git index file (versions 2, 3 and 4).
+    A split index is merged with its shared index, read by read_shared_index(shared index ID)
+    (the content of the sharedindex.<ID> file).
+    Raises ValueError if the data is not a supported index, or if it is a split index and its
+    shared index cannot be read.
+    """
+    if len(data) < 12 or data[:4] != _INDEX_SIGNATURE:
+        raise ValueError("not a git index file")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in _SUPPORTED_VERSIONS:
+        raise ValueError(f"unsupported git index version {version}")
+
+    entries = []
+    offset = 12
+    previous_path = b""
+    for _ in range(count):
+        entry_start = offset
+        stat = _ENTRY_STAT.unpack_from(data, offset)
+        offset += _ENTRY_STAT.size
+        object_id = data[offset : offset + object_id_size].hex()
+        offset += object_id_size
+        (flags,) = struct.unpack_from(">H", data, offset)
+        offset += 2
+        if version >= 3 and flags & _FLAG_EXTENDED:
+            offset += 2
+
+        if version == 4:
+            strip, offset = _read_varint(data, offset)
+            end = data.index(b"\0", offset)
+            path = previous_path[: len(previous_path) - strip] + data[offset:end]
+            offset = end + 1
+        else:
+            name_length = flags & _FLAG_NAME_MASK
+            if name_length < _FLAG_NAME_MASK:
+                end = offset + name_length
+            else:
+                end = data.index(b"\0", offset)
+            path = data[offset:end]
+            # Entries are NUL-padded to a multiple of 8 bytes (at least one NUL).
+            offset = entry_start + ((end - entry_start) // 8 + 1) * 8
+        previous_path = path
+
+        entries.append(
+            GitIndexEntry(
+                path=path.decode("utf-8", errors="surrogateescape"),
+                mode=stat[6],
+                size=stat[9],
+                object_id=object_id,
+                stage=(flags & _FLAG_STAGE_MASK) >> 12,
+            )
+        )
+
+    # The extensions, up to the trailing checksum.
+    while offset + _EXTENSION_HEADER.size <= len(data) - object_id_size:
+        signature, size = _EXTENSION_HEADER.unpack_from(data, offset)
+        offset += _EXTENSION_HEADER.size
+        if signature == _LINK_EXTENSION:
+            shared_index_id, delete_bits, replace_bits = _parse_link_extension(
+                data[offset : offset + size], object_id_size
+            )
+            if read_shared_index is None:
+                raise ValueError("split git index, the shared index cannot be read")
+            shared_entries = parse_git_index(read_shared_index(shared_index_id), object_id_size)
+            return _merge_split_index(shared_entries, entries, delete_bits, replace_bits)
+        offset += size
+    return entries
+
+
+def read_git_index(repo_path) -> list[GitIndexEntry]:
+    """
+    Read the index of the repository at repo_path (no git subprocess).
+    Raises ValueError if the repository has no readable index.
+    """
+    git_dir = find_git_dir(repo_path)
+    if git_dir is None:
+        raise ValueError(f"'{repo_path}' is not the top level of a git working tree")
+    try:
+        data = (git_dir / "index").read_bytes()
+    except OSError as e:
+        raise ValueError(f"cannot read the git index: {e}")
+
+    def read_shared_index(shared_index_id):
+        name = f"sharedindex.{shared_index_id}"
+        for directory in (git_dir, find_common_dir(git_dir)):
+            try:
+                return (directory / name).read_bytes()
+            except OSError:
+                pass
+        raise ValueError(f"cannot read the shared git index '{name}'")
+
+    return parse_git_index(data, _object_id_size(git_dir), read_shared_index)
+
+
+def get_tracked_files(repo_path) -> list[Path]:
+    """
+    Get the sorted relative paths of the files tracked in the repository's index.
+    Submodules and sparse directory entries are skipped; conflicted files are listed once.
+    """
+    tracked_files = set()
+    for entry in read_git_index(repo_path):
+        if entry.mode & _MODE_TYPE_MASK in (_MODE_GITLINK, _MODE_DIRECTORY):
+            continue
+        tracked_files.add(entry.path)
+    return [Path(path) for path in sorted(tracked_files)]
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from .filesystem import WORKTREE_FS
+from .git_index import find_common_dir, find_git_dir
+
+
+@dataclass(frozen=True)
+class GitIgnoreRule:
+    # The pattern as written in the .gitignore file.
+    pattern: str
+    # Directory of the .gitignore file, relative to the repository root ("" for the root).
+    base: str
+    regex: re.Pattern
+    # "!pattern": re-includes a path excluded by a previous rule.
+    negated: bool
+    # "pattern/": only matches directories.
+    dir_only: bool
+
+
+def _translate_glob(pattern):
+    """
+    Translate a gitignore glob into a regex: "*" and "?" do not match "/",
+    "**/" matches zero or more directories and a trailing "/**" matches everything inside.
+    """
+    i, n = 0, len(pattern)
+    regex = []
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                j = i + 2
+                at_start = i == 0 or pattern[i - 1] == "/"
+                at_end = j == n or pattern[j] == "/"
+                if at_start and at_end:
+                    if j == n:
+                        regex.append(".*")
+                        i = j
+                    else:
+                        regex.append("(?:.*/)?")
+                        i = j + 1
+                    continue
+                # Other consecutive asterisks are regular asterisks.
+                while j < n and pattern[j] == "*":
+                    j += 1
+                regex.append("[^/]*")
+                i = j
+                continue
+            regex.append("[^/]*")
+        elif c == "?":
+            regex.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                regex.append(re.escape(c))
+            else:
+                content = pattern[i + 1 : j].replace("\\", "\\\\")
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                regex.append(f"[{content}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(c))
+        i += 1
+    return "".join(regex)
+
+
+def parse_gitignore_line(line, base="") -> GitIgnoreRule | None:
+    """
+    Parse one line of a .gitignore file into a rule, or None for blank lines and comments.
+    """
+    line = line.rstrip("\r\n")
+    # Trailing spaces are ignored unless they are escaped.
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+
+    pattern = line
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith(("\\!", "\\#")):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # A slash at the beginning or in the middle anchors the pattern to the .gitignore directory,
+    # otherwise it matches at any depth.
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _translate_glob(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+
+    return GitIgnoreRule(pattern, base, re.compile(regex), negated, dir_only)
+
+
+def parse_gitignore(text, base="") -> list[GitIgnoreRule]:
+    """
+    Parse the content of a .gitignore file located in the directory base (relative to the repository root).
+    """
+    rules = [parse_gitignore_line(line, base) for line in text.splitlines()]
+    return [rule for rule in rules if rule is not None]
+
+
+class GitIgnore:
+    """
+    The gitignore rules that apply to a directory: .git/info/exclude, then the .gitignore
+    files from the repository root down to the directory. The last matching rule wins.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = tuple(rules)
+
+    def with_rules(self, rules) -> "GitIgnore":
+        """
+        Returns a new GitIgnore with the given rules taking precedence (e.g., a nested .gitignore file).
+        """
+        return GitIgnore(self.rules + tuple(rules)) if rules else self
+
+    def is_ignored(self, path, is_dir=False) -> bool:
+        """
+        Check if the path (relative to the repository root) is ignored.
+        Callers are expected to prune ignored directories: children of an ignored directory
+        cannot be re-included, as with git.
+        """
+        path_str = path if isinstance(path, str) else path.as_posix()
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.base:
+                if not path_str.startswith(rule.base + "/"):
+                    continue
+                relative = path_str[len(rule.base) + 1 :]
+            else:
+                relative = path_str
+            if rule.regex.fullmatch(relative):
+                return not rule.negated
+        return False
+
+
+def _read_rules(path, base, filesystem):
+    try:
+        return parse_gitignore(filesystem.read_text(path), base)
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+def load_root_gitignore(repo_path, filesystem=None) -> GitIgnore:
+    """
+    Load the repository-wide rules: info/exclude (in the common git directory, also for linked worktrees
+    and submodules, where .git is a file) and the root .gitignore.
+    """
+    filesystem = filesystem or WORKTREE_FS
+    repo_path = Path(repo_path)
+    git_dir = find_git_dir(repo_path)
+    rules = _read_rules(find_common_dir(git_dir) / "info" / "exclude", "", filesystem) if git_dir is not None else []
+    rules += _read_rules(repo_path / ".gitignore", "", filesystem)
+    return GitIgnore(rules)
+
+
+def load_directory_gitignore(parent, repo_path, relative_dir, filesystem=None) -> GitIgnore:
+    """
+    Extend the parent's rules with the .gitignore file of a subdirectory, if any.
+    """
+    filesystem = filesystem or WORKTREE_FS
+    base = Path(relative_dir).as_posix()
+    rules = _read_rules(Path(repo_path) / relative_dir / ".gitignore", base, filesystem)
+    return parent.with_rules(rules)
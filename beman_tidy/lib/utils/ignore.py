@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import fnmatch
+import re
+from functools import lru_cache
+
+_GLOB_CHARS = ("*", "?", "[")
+
+
+class _IgnoreNode:
+    """
+    A node of the ignore trie: one path component of one or more ignore patterns.
+    """
+
+    __slots__ = ("children", "globs", "recursive", "is_recursive", "terminal")
+
+    def __init__(self):
+        # Literal component -> node.
+        self.children = {}
+        # (compiled glob, node) for components with wildcards, e.g. "*.log".
+        self.globs = []
+        # Node for a "**" component, which matches zero or more path components.
+        self.recursive = None
+        # True for the node of a "**" component: it stays active while consuming components.
+        self.is_recursive = False
+        # True if an ignore pattern ends here.
+        self.terminal = False
+
+
+class IgnoreMatcher:
+    """
+    Ignore patterns compiled into a path-component trie.
+
+    Patterns are relative to the repository root, e.g. "build/", "include/beman/x/config.hpp".
+    A component can be a glob ("*.log", "cmake-build-*") and "**" matches any number of components
+    (e.g. "**/generated"). As before, ignoring a directory also ignores all its children.
+    A query costs O(path depth), independently of the number of patterns.
+    """
+
+    def __init__(self, patterns):
+        self.root = _IgnoreNode()
+        for pattern in patterns:
+            self._add(str(pattern))
+
+    def _add(self, pattern):
+        parts = [part for part in pattern.strip("/").split("/") if part not in ("", ".")]
+        if not parts:
+            return
+
+        node = self.root
+        for part in parts:
+            if part == "**":
+                if node.recursive is None:
+                    node.recursive = _IgnoreNode()
+                    node.recursive.is_recursive = True
+                node = node.recursive
+            elif any(char in part for char in _GLOB_CHARS):
+                regex = re.compile(fnmatch.translate(part))
+                child = next((child for glob, child in node.globs if glob.pattern == regex.pattern), None)
+                if child is None:
+                    child = _IgnoreNode()
+                    node.globs.append((regex, child))
+                node = child
+            else:
+                node = node.children.setdefault(part, _IgnoreNode())
+        node.terminal = True
+
+    @staticmethod
+    def _expand(nodes):
+        # Follow "**" edges, which can match zero components.
+        expanded = {}
+        while nodes:
+            node = nodes.pop()
+            if id(node) in expanded:
+                continue
+            expanded[id(node)] = node
+            if node.recursive is not None:
+                nodes.append(node.recursive)
+        return list(expanded.values())
+
+    def matches(self, path) -> bool:
+        """
+        Check if the relative path (Path or POSIX string) is ignored.
+        """
+        path_str = path if isinstance(path, str) else path.as_posix()
+        states = self._expand([self.root])
+
+        for part in path_str.split("/"):
+            if part in ("", "."):
+                continue
+
+            next_states = []
+            for node in states:
+                child = node.children.get(part)
+                if child is not None:
+                    next_states.append(child)
+                for glob, child in node.globs:
+                    if glob.match(part):
+                        next_states.append(child)
+                if node.is_recursive:
+                    # "**" consumes this component and stays active.
+                    next_states.append(node)
+            states = self._expand(next_states)
+
+            if not states:
+                return False
+            if any(node.terminal for node in states):
+                return True
+
+        return False
+
+
+@lru_cache(maxsize=32)
+def _compile_ignores(patterns) -> IgnoreMatcher:
+    return IgnoreMatcher(patterns)
+
+
+def compile_ignores(ignores) -> IgnoreMatcher:
+    """
+    Compile the ignore patterns into an IgnoreMatcher.
+    Matchers are cached, so compiling the same patterns again is cheap.
+    """
+    if isinstance(ignores, IgnoreMatcher):
+        return ignores
+    return _compile_ignores(tuple(str(ignore) for ignore in ignores))
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+from .cache import FileStatCache
+
+# SPDX identifiers of the licenses approved by the Beman Standard.
+APACHE_LLVM_LICENSE_ID = "Apache-2.0 WITH LLVM-exception"
+BOOST_LICENSE_ID = "BSL-1.0"
+
+# Number of consecutive tokens in a shingle.
+SHINGLE_SIZE = 5
+# Minimum similarity with a reference text to be considered a full license text.
+SIMILARITY_THRESHOLD = 0.9
+
+# Lowercase words and version numbers, e.g. "apache", "2.0". Punctuation and whitespace are dropped.
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[a-z0-9]+)*")
+
+
+@dataclass(frozen=True)
+class ApprovedLicense:
+    spdx_id: str
+    name: str
+    # Reference text, relative to the beman_tidy package directory.
+    reference: str
+    # Short statements (e.g., "licensed under the Apache License 2.0 with LLVM Exceptions") are identified
+    # by keywords: each group must contain at least one normalized phrase found in the text.
+    keyword_groups: tuple[tuple[str, ...], ...]
+
+    def matches_keywords(self, fingerprint) -> bool:
+        """
+        Check if the fingerprinted text mentions this license by keywords.
+        """
+        # Pad with spaces so phrases only match whole tokens.
+        normalized_text = f" {fingerprint.text} "
+        return all(
+            any(f" {phrase} " in normalized_text for phrase in group)
+            for group in self.keyword_groups
+        )
+
+
+APPROVED_LICENSES = (
+    ApprovedLicense(
+        APACHE_LLVM_LICENSE_ID,
+        "Apache License - Version 2.0 with LLVM Exceptions",
+        "LICENSE",
+        (
+            ("apache license",),
+            (
+                "version 2.0",
+                "version v2.0",
+                "apache license 2.0",
+                "apache license v2.0",
+                "apache 2.0",
+                "apache v2.0",
+            ),
+            ("llvm exceptions",),
+        ),
+    ),
+    ApprovedLicense(
+        BOOST_LICENSE_ID,
+        "Boost Software License - Version 1.0",
+        "licenses/BSL-1.0",
+        (
+            ("boost software license", "boost license"),
+            ("version 1.0", "v1.0", "boost software license 1.0"),
+        ),
+    ),
+)
+
+
+@dataclass(frozen=True)
+class LicenseFingerprint:
+    tokens: tuple[str, ...]
+    # Hash of the normalized text: equal for texts that differ only in case, whitespace or punctuation.
+    digest: str
+    shingles: frozenset[int]
+
+    @property
+    def text(self) -> str:
+        """
+        The normalized text: lowercase tokens separated by single spaces.
+        """
+        return " ".join(self.tokens)
+
+
+@dataclass(frozen=True)
+class LicenseMatch:
+    license: ApprovedLicense
+    # Similarity with the reference text, in [0, 1].
+    score: float
+    # True if the text is identical to the reference text, up to case, whitespace and punctuation.
+    exact: bool
+    # True if the text is a full license text (score >= SIMILARITY_THRESHOLD), False for short statements.
+    full_text: bool
+
+
+def fingerprint_license_text(text) -> LicenseFingerprint:
+    """
+    Normalize the text in one pass and compute its fingerprint.
+    """
+    tokens = tuple(_TOKEN_RE.findall(text.lower()))
+    digest = hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()
+    shingles = frozenset(
+        hash(tokens[i : i + SHINGLE_SIZE])
+        for i in range(max(len(tokens) - SHINGLE_SIZE + 1, 0))
+    )
+    return LicenseFingerprint(tokens, digest, shingles)
+
+
+class LicenseCorpus:
+    """
+    Precomputed fingerprints of the approved licenses, with a shingle -> licenses index.
+    """
+
+    def __init__(self, references):
+        # references: list of (ApprovedLicense, reference text)
+        self.licenses = []
+        self.fingerprints = {}
+        self.by_digest = {}
+        self.shingle_index = {}
+        for approved_license, text in references:
+            fingerprint = fingerprint_license_text(text)
+            self.licenses.append(approved_license)
+            self.fingerprints[approved_license.spdx_id] = fingerprint
+            self.by_digest[fingerprint.digest] = approved_license
+            for shingle in fingerprint.shingles:
+                self.shingle_index.setdefault(shingle, set()).add(approved_license.spdx_id)
+
+    def similarity(self, fingerprint) -> dict[str, float]:
+        """
+        Jaccard similarity between the fingerprint's shingles and each reference's shingles.
+        """
+        hits = dict.fromkeys(self.fingerprints, 0)
+        for shingle in fingerprint.shingles:
+            for spdx_id in self.shingle_index.get(shingle, ()):
+                hits[spdx_id] += 1
+
+        scores = {}
+        for spdx_id, count in hits.items():
+            union = len(fingerprint.shingles) + len(self.fingerprints[spdx_id].shingles) - count
+            scores[spdx_id] = count / union if union else 0.0
+        return scores
+
+    def classify(self, text) -> LicenseMatch | None:
+        """
+        Identify the approved license in the given text, or None.
+        Both full license texts and short statements are identified by keywords;
+        the similarity score tells how close the text is to the reference text.
+        """
+        fingerprint = fingerprint_license_text(text)
+
+        exact_license = self.by_digest.get(fingerprint.digest)
+        if exact_license is not None:
+            return LicenseMatch(exact_license, 1.0, exact=True, full_text=True)
+
+        # Keywords are required in all cases: e.g., a plain Apache 2.0 text is very similar
+        # to the reference, but lacks the LLVM exceptions.
+        candidates = [item for item in self.licenses if item.matches_keywords(fingerprint)]
+        if not candidates:
+            return None
+
+        scores = self.similarity(fingerprint)
+        best_license = max(candidates, key=lambda item: scores[item.spdx_id])
+        score = scores[best_license.spdx_id]
+        return LicenseMatch(best_license, score, exact=False, full_text=score >= SIMILARITY_THRESHOLD)
+
+
+def get_approved_license(spdx_id) -> ApprovedLicense:
+    """
+    Get the approved license with the given SPDX identifier.
+    """
+    return next(item for item in APPROVED_LICENSES if item.spdx_id == spdx_id)
+
+
+def get_reference_license_path(spdx_id) -> Path:
+    """
+    Get the path to the reference text of an approved license.
+    """
+    return Path(__file__).parent.parent.parent / get_approved_license(spdx_id).reference
+
+
+@cache
+def get_reference_license_text(spdx_id) -> str:
+    """
+    Read the reference text of an approved license (once per process).
+    """
+    return get_reference_license_path(spdx_id).read_text(encoding="utf-8")
+
+
+@cache
+def get_license_corpus() -> LicenseCorpus:
+    """
+    Build the corpus of approved licenses (once per process).
+    """
+    return LicenseCorpus(
+        [(item, get_reference_license_text(item.spdx_id)) for item in APPROVED_LICENSES]
+    )
+
+
+def identify_license(text) -> LicenseMatch | None:
+    """
+    Identify the approved license in the given text, or None.
+    """
+    return get_license_corpus().classify(text)
+
+
+_license_match_cache = FileStatCache()
+
+
+def _identify_text(text) -> tuple[LicenseMatch | None]:
+    # Wrapped in a tuple: None is a valid result that must be cached too.
+    return (identify_license(text),)
+
+
+def get_license_match(path, filesystem=None) -> LicenseMatch | None:
+    """
+    Read the license file once and identify its license.
+    Results are cached until the file changes on disk or is rewritten by a check.
+    """
+    return _license_match_cache.get_or_compute(
+        path, _identify_text, default=(None,), filesystem=filesystem
+    )[0]
@@ -11,10 +11,23 @@ class DynamicStdoutStream:
     def flush():
         sys.stdout.flush()
 
-def setup_logging():
+# an object that always redirects to the stderr stream
+class DynamicStderrStream:
+    @staticmethod
+    def write(data):
+        sys.stderr.write(data)
+
+    @staticmethod
+    def flush():
+        sys.stderr.flush()
+
+def setup_logging(to_stderr=False):
+    """
+    Log messages to stdout, or to stderr when stdout is reserved for another output (e.g., --fix-diff).
+    """
     logging.basicConfig(
         level=logging.INFO,
         format='%(message)s',
         force=True,
-        stream=DynamicStdoutStream(),
+        stream=DynamicStderrStream() if to_stderr else DynamicStdoutStream(),
     )
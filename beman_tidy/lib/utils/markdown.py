@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from .budget import CHECKPOINT_INTERVAL, checkpoint
+from .cache import FileStatCache
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_FENCE_RE = re.compile(r"^\s{0,3}(`{3,}|~{3,})")
+_BOLD_LABEL_RE = re.compile(r"^\*\*([^*]+)\*\*:")
+# e.g., [![alt](image_url)](link_url)
+_LINKED_IMAGE_RE = re.compile(r"\[!\[([^\]]*)\]\(([^)\s]+)\)\]\(([^)\s]+)\)")
+# e.g., ![alt](image_url) or [text](link_url)
+_LINK_RE = re.compile(r"(!?)\[([^\[\]]*)\]\(([^)\s]+)\)")
+
+
+@dataclass
+class MarkdownHeading:
+    level: int
+    title: str
+    # Line index of the heading.
+    line: int
+    # Line index where the section ends (exclusive): next heading of the same or a higher level, or EOF.
+    end_line: int
+
+
+@dataclass
+class MarkdownLink:
+    line: int
+    # The raw Markdown text, e.g. "![alt](url)".
+    raw: str
+    # Alt text for images, link text otherwise.
+    text: str
+    url: str
+    is_image: bool
+    # For a linked image ([![alt](image_url)](href)), the URL the image links to.
+    href: str | None = None
+
+
+@dataclass
+class MarkdownIndex:
+    """
+    One-pass index of a Markdown document.
+    Everything except fenced_ranges ignores the content of fenced code blocks.
+    """
+
+    lines: list[str]
+    headings: list[MarkdownHeading] = field(default_factory=list)
+    # [start, end) line ranges of fenced code blocks, fences included.
+    fenced_ranges: list[tuple[int, int]] = field(default_factory=list)
+    # Links, images and linked images (badges), in document order.
+    links: list[MarkdownLink] = field(default_factory=list)
+    # Bold label -> line indices, e.g. "Implements" -> [12] for "**Implements**: ...".
+    labels: dict[str, list[int]] = field(default_factory=dict)
+
+    def section(self, title, level=None) -> MarkdownHeading | None:
+        """
+        The first heading with the given title (and level, if given).
+        """
+        for heading in self.headings:
+            if heading.title == title and (level is None or heading.level == level):
+                return heading
+        return None
+
+    def section_text(self, heading) -> str:
+        """
+        The body of a section, without its heading line.
+        """
+        return "\n".join(self.lines[heading.line + 1 : heading.end_line])
+
+    def label_lines(self, label) -> list[str]:
+        """
+        The stripped lines starting with the given bold label, e.g. "**Status**:".
+        """
+        return [self.lines[i] for i in self.labels.get(label, [])]
+
+    def linked_images(self) -> list[MarkdownLink]:
+        """
+        All images wrapped in a link - e.g., badges.
+        """
+        return [link for link in self.links if link.href is not None]
+
+    @cached_property
+    def text(self) -> str:
+        """
+        The document's (stripped) lines outside fenced code blocks, joined by newlines.
+        """
+        fenced = set()
+        for start, end in self.fenced_ranges:
+            fenced.update(range(start, end))
+        return "\n".join(line for i, line in enumerate(self.lines) if i not in fenced)
+
+    def raw_links(self) -> set[str]:
+        """
+        The raw text of all links, images and linked images.
+        """
+        return {link.raw for link in self.links}
+
+
+def build_markdown_index(text) -> MarkdownIndex:
+    """
+    Build the index of a Markdown document in one pass over its lines.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    index = MarkdownIndex(lines=lines)
+
+    open_headings: list[MarkdownHeading] = []
+    fence = None
+    fence_start = 0
+
+    for i, line in enumerate(lines):
+        if i % CHECKPOINT_INTERVAL == 0:
+            checkpoint()
+        fence_match = _FENCE_RE.match(line)
+        if fence is not None:
+            # Inside a fenced code block: only look for the closing fence.
+            if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                index.fenced_ranges.append((fence_start, i + 1))
+                fence = None
+            continue
+        if fence_match:
+            fence, fence_start = fence_match.group(1), i
+            continue
+
+        heading_match = _HEADING_RE.match(line)
+        if heading_match:
+            level = len(heading_match.group(1))
+            while open_headings and open_headings[-1].level >= level:
+                open_headings.pop().end_line = i
+            heading = MarkdownHeading(level, heading_match.group(2), i, len(lines))
+            index.headings.append(heading)
+            open_headings.append(heading)
+            continue
+
+        label_match = _BOLD_LABEL_RE.match(line)
+        if label_match:
+            index.labels.setdefault(label_match.group(1), []).append(i)
+
+        if "](" in line:
+            for match in _LINKED_IMAGE_RE.finditer(line):
+                index.links.append(
+                    MarkdownLink(i, match.group(0), match.group(1), match.group(2), True, match.group(3))
+                )
+            for match in _LINK_RE.finditer(line):
+                index.links.append(
+                    MarkdownLink(i, match.group(0), match.group(2), match.group(3), match.group(1) == "!")
+                )
+
+    if fence is not None:
+        # Unterminated fence: runs until the end of the document.
+        index.fenced_ranges.append((fence_start, len(lines)))
+
+    return index
+
+
+_markdown_index_cache = FileStatCache()
+
+
+def get_markdown_index(path, filesystem=None) -> MarkdownIndex:
+    """
+    Read the Markdown file once and return its index.
+    Results are cached until the file changes on disk or is rewritten by a check.
+    """
+    return _markdown_index_cache.get_or_compute(
+        path, build_markdown_index, default=MarkdownIndex(lines=[]), filesystem=filesystem
+    )
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import re
+
+
+class LiteralMatcher:
+    """
+    Matches a fixed set of literal strings, grouped by category, in a single scan.
+    All literals are compiled into one alternation regex (longest first, so that a literal
+    never hides a longer one starting at the same position), so the result is the same as
+    searching for each literal separately.
+    """
+
+    def __init__(self, literals_by_category):
+        # literal -> category
+        self.categories = {}
+        for category, literals in literals_by_category.items():
+            for literal in literals:
+                self.categories[literal] = category
+
+        literals = sorted(self.categories, key=len, reverse=True)
+        # The regex reports only the longest literal at each position: also credit
+        # the shorter literals that are prefixes of it.
+        self.prefixes = {
+            literal: [other for other in literals if literal.startswith(other)]
+            for literal in literals
+        }
+
+        alternation = "|".join(re.escape(literal) for literal in literals)
+        # The lookahead makes overlapping occurrences visible, as when searching each literal separately.
+        self.regex = re.compile(f"(?=({alternation}))") if alternation else None
+
+    def scan(self, text) -> dict[str, set[str]]:
+        """
+        Returns the distinct literals found in the text, per category.
+        Every known category is present in the result, possibly with an empty set.
+        """
+        found = {category: set() for category in self.categories.values()}
+        if self.regex is None:
+            return found
+
+        for match in self.regex.finditer(text):
+            for literal in self.prefixes[match.group(1)]:
+                found[self.categories[literal]].add(literal)
+        return found
+
+    def count(self, text) -> dict[str, int]:
+        """
+        Returns the number of distinct literals found in the text, per category.
+        """
+        return {category: len(literals) for category, literals in self.scan(text).items()}
+
+
+def build_values_matcher(values, default_category="values") -> LiteralMatcher:
+    """
+    Build a LiteralMatcher from a "values" entry of the Beman Standard YAML config.
+    Supports both plain lists of strings (one default category) and lists of
+    single-key dicts mapping a category to its strings (e.g., readme.badges).
+    """
+    literals_by_category = {}
+    for value in values:
+        if isinstance(value, dict):
+            for category, literals in value.items():
+                literals_by_category.setdefault(category, []).extend(literals)
+        else:
+            literals_by_category.setdefault(default_category, []).append(value)
+    return LiteralMatcher(literals_by_category)
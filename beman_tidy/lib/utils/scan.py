@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import re
+from bisect import bisect_right
+
+# Helpers to scan the raw bytes of a file (bytes or mmap) without decoding it:
+# ASCII markers are found with bytes.find() or a bytes pattern, line numbers are computed
+# from the line break positions, and only the lines that are needed are decoded.
+
+# Line breaks, as for a file read in text mode (universal newlines).
+LINE_BREAK_RE = re.compile(rb"\r\n?|\n")
+
+
+def line_starts(data) -> list[int]:
+    """
+    Get the byte offset of the start of each line, as for readlines(): no line for empty data,
+    and no empty last line after a final line break.
+    """
+    if not data:
+        return []
+    if data.find(b"\r") == -1:
+        starts = [0]
+        position = data.find(b"\n")
+        while position != -1:
+            starts.append(position + 1)
+            position = data.find(b"\n", position + 1)
+    else:
+        starts = [0] + [match.end() for match in LINE_BREAK_RE.finditer(data)]
+    if starts[-1] == len(data):
+        starts.pop()
+    return starts
+
+
+def head_end(data, max_lines) -> int:
+    """
+    Get the byte offset of the end of the first max_lines lines (line breaks included), or the size of the data
+    if it has fewer lines. Only the line breaks of these lines are searched.
+    """
+    if max_lines <= 0:
+        return 0
+    count = 0
+    for match in LINE_BREAK_RE.finditer(data):
+        count += 1
+        if count == max_lines:
+            return match.end()
+    return len(data)
+
+
+def line_index_at(data, offset, starts=None) -> int:
+    """
+    Get the (0-based) index of the line containing the byte offset.
+    Without the line starts (see line_starts()), the line breaks before the offset are counted.
+    """
+    if starts is not None:
+        return bisect_right(starts, offset) - 1
+    if data.find(b"\r", 0, offset) == -1:
+        return data.count(b"\n", 0, offset)
+    return sum(1 for _ in LINE_BREAK_RE.finditer(data, 0, offset))
+
+
+def decode_range(data, start, end, encoding="utf-8") -> str:
+    """
+    Decode data[start:end] without copying it, with line breaks normalized to "\n" (as in text mode).
+    """
+    text = str(memoryview(data)[start:end], encoding)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def decode_line(data, index, starts, encoding="utf-8") -> str:
+    """
+    Decode the line at the given index (see line_starts()). Only this line is decoded.
+    """
+    end = starts[index + 1] if index + 1 < len(starts) else len(data)
+    return decode_range(data, starts[index], end, encoding)
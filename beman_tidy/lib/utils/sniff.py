@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import codecs
+from enum import Enum
+
+from .cache import FileStatCache
+from .filesystem import WORKTREE_FS
+
+# Number of bytes read from the start of a file to classify it.
+SNIFF_SIZE = 4096
+
+# Files larger than this are not read by the checks (see 'max_file_size' in .beman-tidy.yaml).
+DEFAULT_MAX_FILE_SIZE = 1024 * 1024
+
+# A file stored in Git LFS is checked out as a small text pointer to the actual content.
+LFS_POINTER_PREFIX = b"version https://git-lfs.github.com/spec/v1"
+
+
+class FileKind(Enum):
+    """
+    What a file contains, as far as the checks are concerned. Only TEXT files are read by the checks.
+    """
+
+    TEXT = "text"
+    BINARY = "binary"
+    LFS_POINTER = "Git LFS pointer"
+    OVERSIZED = "oversized"
+
+
+def classify_head(head, size, max_size=DEFAULT_MAX_FILE_SIZE) -> FileKind:
+    """
+    Classify a file from its size and the first bytes of its content (at least SNIFF_SIZE bytes, if any).
+    A file is binary if its head contains a NUL byte or is not valid UTF-8.
+    """
+    if size > max_size:
+        return FileKind.OVERSIZED
+    if head.startswith(LFS_POINTER_PREFIX):
+        return FileKind.LFS_POINTER
+    if b"\0" in head:
+        return FileKind.BINARY
+    try:
+        # The head can end in the middle of a multi-byte character: only the complete ones are validated.
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=len(head) >= size)
+    except UnicodeDecodeError:
+        return FileKind.BINARY
+    return FileKind.TEXT
+
+
+_file_kind_cache = FileStatCache()
+
+
+def sniff_file(path, filesystem=None, max_size=DEFAULT_MAX_FILE_SIZE) -> FileKind:
+    """
+    Classify a file, reading at most SNIFF_SIZE bytes of it (nothing for oversized files).
+    Results are cached until the file changes on disk.
+    Raises OSError if the file cannot be read.
+    """
+    filesystem = filesystem or WORKTREE_FS
+    cached = _file_kind_cache.get(path, filesystem)
+    if cached is not None and cached[0] == max_size:
+        return cached[1]
+
+    size = filesystem.size(path)
+    head = filesystem.read_head(path, SNIFF_SIZE) if size <= max_size else b""
+    kind = classify_head(head, size, max_size)
+    _file_kind_cache.set(path, (max_size, kind), filesystem)
+    return kind
+
+
+def sniff_head(path, filesystem=None) -> FileKind:
+    """
+    Classify a file from its first SNIFF_SIZE bytes only, whatever its size (e.g., to read only the head of
+    an oversized file). Raises OSError if the file cannot be read.
+    """
+    filesystem = filesystem or WORKTREE_FS
+    size = filesystem.size(path)
+    return classify_head(filesystem.read_head(path, SNIFF_SIZE), size, max_size=size)
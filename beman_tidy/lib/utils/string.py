@@ -40,86 +40,6 @@ def match_badges(string):
     ]
 
 
-def match_apache_license_v2_with_llvm_exceptions(content):
-    # beman/LICENSE contains the following text (multiple lines)
-    # - Apache License
-    # - Version 2.0
-    # - LLVM Exceptions to the Apache 2.0 License
-    #
-    # We also check for variations.
-    #
-    license_regex = [
-        rf"Apache License",  # noqa: F541
-        rf"Apache License 2\.0 with LLVM Exceptions",  # noqa: F541
-        rf"Apache License v2\.0 with LLVM Exceptions",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None for regex in license_regex
-    ):
-        return False
-
-    version_regex = [
-        rf"Version 2\.0",  # noqa: F541,
-        rf"Version v2\.0",  # noqa: F541,
-        rf"Version 2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"Version v2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"Apache License 2\.0 with LLVM Exceptions",  # noqa: F541
-        rf"Apache License v2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"Apache 2\.0",  # noqa: F541,
-        rf"Apache v2\.0",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None for regex in version_regex
-    ):
-        return False
-
-    llvm_exceptions_regex = [
-        rf"LLVM Exceptions",  # noqa: F541,
-        rf"Apache License 2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"Apache License v2\.0 with LLVM Exceptions",  # noqa: F541,
-        rf"LLVM Exceptions to the Apache 2\.0 License",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None
-        for regex in llvm_exceptions_regex
-    ):
-        return False
-
-    return True
-
-
-def match_boost_software_license_v1_0(content):
-    # beman/LICENSE contains the following text (multiple lines)
-    # - Boost Software License
-    # - Version 1.0
-    #
-    # We also check for variations.
-    #
-    license_regex = [
-        rf"Boost Software License",  # noqa: F541
-        rf"Boost License",  # noqa: F541
-        rf"Boost Software License 1\.0",  # noqa: F541,
-        rf"Boost Software License Version 1\.0",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None for regex in license_regex
-    ):
-        return False
-
-    version_regex = [
-        rf"Version 1\.0",  # noqa: F541,
-        rf"V1\.0",  # noqa: F541,
-        rf"Boost Software License 1\.0",  # noqa: F541,
-        rf"Boost Software License Version 1\.0",  # noqa: F541,
-    ]
-    if not any(
-        re.search(regex, content, re.IGNORECASE) is not None for regex in version_regex
-    ):
-        return False
-
-    return True
-
-
 def skip_lines(lines, n):
     return lines[n:] if lines is not None else None
 
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import multiprocessing
+import sys
+import traceback
+
+from .utils.filesystem import release_git_processes
+
+# Extra time given to a check to reach a cancellation point after its budget, before its worker is killed.
+GRACE_PERIOD = 1.0
+
+
+def _serve(connection, run):
+    """
+    Worker loop: run the requested checks until None is received.
+    """
+    while True:
+        check_name = connection.recv()
+        if check_name is None:
+            break
+        try:
+            reply = ("result", run(check_name))
+        except Exception:
+            reply = ("exception", traceback.format_exc())
+        sys.stdout.flush()
+        connection.send(reply)
+
+
+class CheckWorker:
+    """
+    Run checks in a child process, so that a check stuck outside of the cancellation points
+    (see budget.checkpoint()) can still be stopped: the process is killed, and a new one is started
+    for the next check. The worker is forked, so it inherits the loaded checks and repo_info as they are.
+    """
+
+    def __init__(self, run):
+        """
+        @param run: The function that runs a check by name in the worker; its result must be picklable.
+        """
+        self.run = run
+        self._process = None
+        self._connection = None
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        True if workers can be started on this platform (i.e., processes can be forked).
+        """
+        return "fork" in multiprocessing.get_all_start_methods()
+
+    def _start(self):
+        # Flush first, otherwise pending output would be printed twice, by both processes.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        release_git_processes()
+
+        context = multiprocessing.get_context("fork")
+        self._connection, child_connection = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child_connection, self.run), daemon=True)
+        self._process.start()
+        child_connection.close()
+
+    def run_check(self, check_name, timeout):
+        """
+        Run the check in the worker and wait for its result for at most timeout seconds (plus GRACE_PERIOD).
+        Returns None if the check did not finish in time: the worker is then recycled.
+        Raises RuntimeError if the check raised an exception, or if the worker died.
+        """
+        if self._process is None:
+            self._start()
+
+        self._connection.send(check_name)
+        if not self._connection.poll(timeout + GRACE_PERIOD):
+            self.recycle()
+            return None
+
+        try:
+            kind, value = self._connection.recv()
+        except (EOFError, OSError):
+            exitcode = self._process.exitcode
+            self.recycle()
+            raise RuntimeError(f"The worker running check [{check_name}] died (exit code: {exitcode}).")
+        if kind == "exception":
+            raise RuntimeError(f"Check [{check_name}] raised an exception in the worker:\n{value}")
+        return value
+
+    def recycle(self):
+        """
+        Kill the worker process; a new one is started on the next run_check().
+        """
+        if self._process is None:
+            return
+        self._process.kill()
+        self._process.join()
+        self._connection.close()
+        self._process = None
+        self._connection = None
+
+    def close(self):
+        """
+        Stop the worker process.
+        """
+        if self._process is None:
+            return
+        try:
+            self._connection.send(None)
+            self._process.join(GRACE_PERIOD)
+        except OSError:
+            pass
+        self.recycle()
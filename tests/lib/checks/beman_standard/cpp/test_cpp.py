@@ -39,6 +39,21 @@ def test__cpp_namespace__fix_inplace(repo_info, beman_standard_check_config, tmp
     assert check.check() is True
 
 
+def test__cpp__namespace_with_same_prefix_is_another_namespace(repo_info, beman_standard_check_config, tmp_path):
+    header = tmp_path / "include/beman/optional/optional.hpp"
+    header.parent.mkdir(parents=True)
+    header.write_text("#pragma once\n#include <vector>\nnamespace beman::optional26 {\nclass optional {};\n}\n")
+    repo_info["top_level"] = tmp_path
+
+    # "beman::optional26" is not "beman::optional" (nor nested in it).
+    check = CppNamespaceCheck(repo_info, beman_standard_check_config)
+    assert check.check() is False
+
+    assert check.fix() is True
+    assert check.check() is True
+    assert "namespace beman::optional {\n" in header.read_text()
+
+
 def test__cpp_extension_identifiers__is_always_skipped(repo_info, beman_standard_check_config):
     """
     Test that cpp.extension_identifiers is always skipped.
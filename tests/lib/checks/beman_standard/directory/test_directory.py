@@ -193,7 +193,7 @@ def test__directory_examples__fix_inplace(repo_info, beman_standard_check_config
     pass
 
 
-def test__directory_docs__valid(repo_info, beman_standard_check_config):
+def test__directory_docs__valid(repo_info, beman_standard_check_config, tmp_path):
     """
     Test that repositories with valid documentation structure pass the check.
     """
@@ -214,6 +214,12 @@ def test__directory_docs__valid(repo_info, beman_standard_check_config):
         beman_standard_check_config,
     )
 
+    # Documentation files in excluded directories are accepted at any depth.
+    for relative_path in ["README.md", "docs/guide.md", "libs/x/src/notes.md", "libs/x/examples/README.md"]:
+        (tmp_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / relative_path).write_text("# x\n")
+    run_check_for_each_path(True, [tmp_path], DirectoryDocsCheck, repo_info, beman_standard_check_config)
+
 
 def test__directory_docs__invalid(repo_info, beman_standard_check_config):
     """
@@ -6,6 +6,9 @@ import shutil
 from pathlib import Path
 
 from beman_tidy.lib.checks.beman_standard.file import FileCopyrightCheck, FileLicenseIdCheck, FileNamesCheck, FileTestNamesCheck
+from beman_tidy.lib.utils.analysis import get_file_facts
+from beman_tidy.lib.utils.diagnostics import DiagnosticCollector
+from beman_tidy.lib.utils.filesystem import WorktreeFS
 
 # Workaround to test for both normal and block comments.
 test_data_prefix = Path("tests/lib/checks/beman_standard/file/data")
@@ -146,6 +149,68 @@ def test__file_license_id__fix_inplace(repo_info, beman_standard_check_config, t
     assert check.check() is False
     assert check.fix() is False
 
+class _ListRenderer:
+    def __init__(self):
+        self.diagnostics = []
+
+    def render(self, diagnostic):
+        self.diagnostics.append(diagnostic)
+
+def test__file__license_id_marker_past_max_line(repo_info, beman_standard_check_config, tmp_path):
+    (tmp_path / "late.hpp").write_text("// x\n" * 1000 + "// SPDX-License-Identifier: MIT\n")
+    renderer = _ListRenderer()
+    repo_info["top_level"] = tmp_path
+    repo_info["diagnostics"] = DiagnosticCollector([renderer])
+
+    # Without logging, the check fails the same way, and nothing is emitted.
+    check = FileLicenseIdCheck.FileLicenseIdCheckImpl(repo_info, beman_standard_check_config, "late.hpp")
+    assert check.check() is False
+    assert renderer.diagnostics == []
+
+    # With logging, it is reported where it is, whether the file was analysed by another check or not.
+    for analysed in (False, True):
+        if analysed:
+            get_file_facts(tmp_path / "late.hpp")
+        check = FileLicenseIdCheck.FileLicenseIdCheckImpl(repo_info, beman_standard_check_config, "late.hpp")
+        check.log_enabled = True
+        assert check.check() is False
+        [diagnostic] = renderer.diagnostics
+        assert diagnostic.message_id == "file.license_id.too_late"
+        assert diagnostic.line == 1001
+        renderer.diagnostics.clear()
+
+class _HeadOnlyFS(WorktreeFS):
+    """
+    A worktree whose file contents fail the test if anything past the given offset is searched.
+    """
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+
+    def is_mappable(self, path):
+        return False
+
+    def read_bytes(self, path):
+        limit = self.limit
+
+        class HeadOnlyBytes(bytes):
+            def find(self, sub, start=0, end=None):
+                assert end is not None and end <= limit, "the tail of the file was searched"
+                return super().find(sub, start, end)
+
+        return HeadOnlyBytes(super().read_bytes(path))
+
+def test__file__license_id_reads_only_the_head(repo_info, beman_standard_check_config, tmp_path):
+    head = "// x\n" * FileLicenseIdCheck.SPDX_MAX_LINE
+    (tmp_path / "late.hpp").write_text(head + "// x\n" * 100000 + "// SPDX-License-Identifier: MIT\n")
+    repo_info["top_level"] = tmp_path
+    repo_info["filesystem"] = _HeadOnlyFS(len(head))
+
+    # Without diagnostics, the first SPDX_MAX_LINE lines decide: the rest of the file is never searched.
+    check = FileLicenseIdCheck.FileLicenseIdCheckImpl(repo_info, beman_standard_check_config, "late.hpp")
+    assert check.check() is False
+
 # --- file.names tests ---
 
 file_names_prefix = Path("tests/lib/checks/beman_standard/file/data/names")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import pytest
+from git import Actor, Repo
+
+from beman_tidy.lib.history import RevisionEvaluator, bisect_check
+from beman_tidy.lib.utils.git import get_repo_info, load_beman_standard_config
+
+_AUTHOR = Actor("beman-tidy", "beman-tidy@example.com")
+
+
+def _commit(repo, root, files, message):
+    for relative_path, content in files.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    repo.index.add(list(files))
+    return repo.index.commit(message, author=_AUTHOR, committer=_AUTHOR)
+
+
+@pytest.fixture
+def history(tmp_path):
+    repo = Repo.init(tmp_path)
+    _commit(repo, tmp_path, {"include/beman/x/good_name.hpp": "// x\n"}, "good")
+    _commit(repo, tmp_path, {"include/beman/x/BadName.hpp": "// x\n"}, "bad")
+    _commit(repo, tmp_path, {"README.md": "# beman.x\n"}, "still bad")
+    # Back to the tree of the first commit.
+    repo.index.remove(["include/beman/x/BadName.hpp", "README.md"], working_tree=True)
+    repo.index.commit("fix", author=_AUTHOR, committer=_AUTHOR)
+    return repo
+
+
+@pytest.fixture
+def evaluator(tmp_path, history):
+    return RevisionEvaluator(get_repo_info(tmp_path), load_beman_standard_config())
+
+
+def test__history__evaluates_each_commit(evaluator):
+    commits = evaluator.iter_commits()
+    assert [commit.summary for commit in commits] == ["good", "bad", "still bad", "fix"]
+    assert [evaluator.evaluate(commit, ["file.names"])["file.names"] for commit in commits] == [
+        "passed",
+        "failed",
+        "failed",
+        "passed",
+    ]
+    assert len(evaluator.iter_commits(last=2)) == 2
+
+
+def test__history__memoizes_by_tree_and_blob(evaluator):
+    commits = evaluator.iter_commits()
+    for commit in commits:
+        evaluator.evaluate(commit, ["file.names"])
+
+    # Each distinct tree is evaluated once: "fix" restores the tree of "good".
+    assert len(evaluator._tree_results) == 3
+    # Each (check, path, blob) is evaluated once, no matter how many commits contain it.
+    (file_results,) = evaluator._file_results.values()
+    assert sorted(path for _, path, _ in file_results) == [
+        "include/beman/x/BadName.hpp",
+        "include/beman/x/good_name.hpp",
+    ]
+
+
+def test__history__invalid_range(evaluator):
+    with pytest.raises(ValueError):
+        evaluator.iter_commits("does-not-exist..HEAD")
+
+
+def test__bisect__finds_the_first_bad_commit(tmp_path):
+    repo = Repo.init(tmp_path)
+    commits = [_commit(repo, tmp_path, {f"include/beman/x/file_{i}.hpp": "// x\n"}, f"good {i}") for i in range(5)]
+    commits.append(_commit(repo, tmp_path, {"include/beman/x/BadName.hpp": "// x\n"}, "culprit"))
+    commits += [_commit(repo, tmp_path, {f"src/beman/x/file_{i}.cpp": "// x\n"}, f"bad {i}") for i in range(10)]
+    evaluator = RevisionEvaluator(get_repo_info(tmp_path), load_beman_standard_config())
+
+    probed = []
+    culprit, probes = bisect_check(
+        evaluator, "file.names", commits[0].hexsha, "HEAD", on_probe=lambda commit, status: probed.append(commit)
+    )
+    assert culprit.summary == "culprit"
+    # good and bad, then a binary search over the 15 commits in between.
+    assert probes == len(probed) <= 2 + 4
+
+    with pytest.raises(ValueError):
+        bisect_check(evaluator, "file.names", commits[0].hexsha, commits[4].hexsha)
+    with pytest.raises(ValueError):
+        bisect_check(evaluator, "file.names", "HEAD", commits[0].hexsha)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import pytest
+
+from beman_tidy.lib.checks import beman_standard  # noqa: F401 (registers all checks)
+from beman_tidy.lib.planner import expand_check_patterns, plan_checks
+from beman_tidy.lib.checks.system.registry import get_all_beman_standard_check_names
+
+CHECK_NAMES = ["readme.title", "readme.badges", "cmake.project_name", "cmake.library_name", "license.approved"]
+
+
+def test__planner__expand_check_patterns():
+    assert expand_check_patterns(["cmake.*"], CHECK_NAMES) == ["cmake.project_name", "cmake.library_name"]
+    assert expand_check_patterns(["readme.title", "readme.*", "license.approved"], CHECK_NAMES) == [
+        "readme.title",
+        "readme.badges",
+        "license.approved",
+    ]
+    # Plain names are kept, even if unknown (the pipeline ignores them).
+    assert expand_check_patterns(["readme.unknown"], CHECK_NAMES) == ["readme.unknown"]
+    with pytest.raises(ValueError):
+        expand_check_patterns(["unknown.*"], CHECK_NAMES)
+
+
+def test__planner__reads_only_the_needed_files():
+    plan = plan_checks(["readme.title", "cmake.project_name"])
+    assert plan.files == {"README.md", "CMakeLists.txt"}
+    assert not plan.needs_walk
+    assert plan.metadata == set()
+    assert plan.retained_files() == {"README.md", "CMakeLists.txt", ".beman-tidy.yaml", ".gitignore"}
+
+
+def test__planner__walks_and_metadata():
+    plan = plan_checks(["directory.docs", "file.copyright", "repository.default_branch"])
+    assert plan.needs_walk
+    assert plan.categories == {"doc", "cpp"}
+    assert plan.indexed_categories == {"doc"}
+    assert plan.metadata == {"default_branch"}
+    assert plan.retained_files() is None
+
+    assert plan_checks([], fix_inplace=True).metadata == {"unstaged_changes"}
+
+
+def test__planner__all_checks_declare_valid_inputs():
+    # Unknown categories or metadata fields are rejected when building the plan.
+    plan = plan_checks(get_all_beman_standard_check_names())
+    assert plan.needs_walk
+    assert "README.md" in plan.files
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import io
+import json
+from argparse import Namespace
+
+from beman_tidy.lib.pipeline import run_checks_pipeline
+from beman_tidy.lib.reporters import JsonLinesReporter
+from beman_tidy.lib.utils.diagnostics import Diagnostic
+from beman_tidy.lib.utils.git import load_beman_standard_config
+from tests.utils.conftest import mock_repo_info  # noqa: F401
+
+
+def _records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test__jsonl_reporter__one_object_per_line():
+    stream = io.StringIO()
+    reporter = JsonLinesReporter(stream)
+    reporter.render(
+        Diagnostic("file.copyright", "warning", "Found in {path}.", path="include/foo.hpp", line=2, column=4, args={})
+    )
+    reporter.check_result("file.copyright", "Recommendation", "failed")
+
+    assert _records(stream) == [
+        {
+            "type": "diagnostic",
+            "check": "file.copyright",
+            "level": "warning",
+            "code": "file.copyright",
+            "path": "include/foo.hpp",
+            "line": 2,
+            "column": 4,
+            "message": "Found in include/foo.hpp.",
+            "fix_hint": None,
+        },
+        {"type": "check", "check": "file.copyright", "check_type": "Recommendation", "status": "failed"},
+    ]
+
+
+def test__pipeline__streams_jsonl(tmp_path, mock_repo_info, capsys):  # noqa: F811
+    (tmp_path / "README.md").write_text("# Wrong title\n")
+    mock_repo_info["top_level"] = tmp_path
+    args = Namespace(
+        repo_info=mock_repo_info,
+        verbose=False,
+        require_all=False,
+        fix_inplace=False,
+        fix_diff=None,
+        format="jsonl",
+        store=None,
+    )
+
+    failed = run_checks_pipeline(["readme.title", "toplevel.readme"], args, load_beman_standard_config())
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+    assert [(r["type"], r["check"]) for r in records[:-1]] == [
+        ("diagnostic", "readme.title"),
+        ("check", "readme.title"),
+        ("check", "toplevel.readme"),
+    ]
+    assert records[0]["path"] == "README.md" and records[0]["line"] == 1
+    assert records[1]["status"] == "failed" and records[2]["status"] == "passed"
+
+    summary = records[-1]
+    assert summary["type"] == "summary"
+    assert summary["counters"]["failed"] == {"Requirement": 0, "Recommendation": 1}
+    assert summary["counters"]["passed"] == {"Requirement": 1, "Recommendation": 0}
+    assert summary["coverage"]["Recommendation"] == 0
+    assert summary["failed"] == failed == 0  # A failed recommendation is not a failure.
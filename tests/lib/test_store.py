@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import sqlite3
+from argparse import Namespace
+
+import pytest
+
+import beman_tidy.lib.store as store_module
+from beman_tidy.lib.pipeline import run_checks_pipeline
+from beman_tidy.lib.store import ResultsStore, RunRecorder, run_query
+from beman_tidy.lib.utils.diagnostics import Diagnostic
+from beman_tidy.lib.utils.git import load_beman_standard_config
+from tests.utils.conftest import mock_repo_info  # noqa: F401
+
+_COUNTERS = {name: {"Requirement": 0, "Recommendation": 0} for name in ("passed", "failed", "skipped", "timeout", "disabled")}
+_COVERAGE = {"Requirement": 50.0, "Recommendation": 25.0, "TOTAL": 40.0}
+
+
+def _record_run(store, repo, commit_hash, statuses):
+    """
+    Record a run of the given checks ({check name: status}) of a repository.
+    """
+    recorder = RunRecorder(store, {"top_level": repo, "name": repo, "remote_url": None, "commit_hash": commit_hash}, {})
+    for check_name, status in statuses.items():
+        if status == "failed":
+            recorder.render(Diagnostic(check_name, "error", "Failed.", path="README.md", line=1))
+        recorder.check_result(check_name, "Requirement", status)
+    recorder.summary(_COUNTERS, _COVERAGE, sum(status == "failed" for status in statuses.values()))
+    return recorder.run_id
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(tmp_path / "results.sqlite")
+    yield store
+    store.close()
+
+
+def test__store__records_runs(store):
+    run_id = _record_run(store, "/repos/a", "abc1234", {"readme.title": "failed", "toplevel.readme": "passed"})
+
+    run = store.connection.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+    assert (run["repo"], run["commit_hash"], run["failed_checks"], run["coverage_total"]) == ("/repos/a", "abc1234", 1, 40.0)
+    assert len(run["standard_hash"]) == 64
+    assert store.connection.execute("SELECT COUNT(*) FROM check_results").fetchone()[0] == 2
+    diagnostic = store.connection.execute("SELECT * FROM diagnostics").fetchone()
+    assert (diagnostic["check_name"], diagnostic["code"], diagnostic["path"], diagnostic["line"]) == (
+        "readme.title",
+        "readme.title",
+        "README.md",
+        1,
+    )
+
+
+def test__store__overlapping_runs(tmp_path, store):
+    # A run in progress does not hold a transaction: another run can be recorded in the same store meanwhile.
+    recorder = RunRecorder(store, {"top_level": "/repos/a", "name": "a", "remote_url": None}, {})
+    recorder.check_result("readme.title", "Requirement", "failed")
+
+    other_store = ResultsStore(tmp_path / "results.sqlite")
+    _record_run(other_store, "/repos/b", "d1", {"readme.title": "passed"})
+    other_store.close()
+
+    recorder.summary(_COUNTERS, _COVERAGE, 1)
+    runs = store.connection.execute("SELECT repo FROM runs ORDER BY id").fetchall()
+    assert [row["repo"] for row in runs] == ["/repos/b", "/repos/a"]
+    assert store.connection.execute("SELECT COUNT(*) FROM check_results").fetchone()[0] == 2
+
+
+def test__pipeline__locked_store(tmp_path, mock_repo_info, monkeypatch):  # noqa: F811
+    path = tmp_path / "results.sqlite"
+    ResultsStore(path).close()
+    monkeypatch.setattr(store_module, "BUSY_TIMEOUT", 0.1)
+    lock = sqlite3.connect(path)
+    lock.execute("BEGIN EXCLUSIVE")
+    mock_repo_info["top_level"] = tmp_path
+    args = Namespace(
+        repo_info=mock_repo_info,
+        verbose=False,
+        require_all=False,
+        fix_inplace=False,
+        fix_diff=None,
+        format="text",
+        store=path,
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        run_checks_pipeline(["toplevel.readme"], args, load_beman_standard_config())
+    assert exit_info.value.code == 1
+    lock.close()
+
+
+def test__store__interrupted_run_is_not_recorded(tmp_path):
+    path = tmp_path / "results.sqlite"
+    store = ResultsStore(path)
+    recorder = RunRecorder(store, {"top_level": "/repos/a", "name": "a", "remote_url": None}, {})
+    recorder.check_result("readme.title", "Requirement", "failed")
+    store.close()  # No summary.
+
+    store = ResultsStore(path)
+    assert store.connection.execute("SELECT COUNT(*) FROM runs").fetchone()[0] == 0
+    store.close()
+
+
+def test__store__unsupported_schema_version(tmp_path):
+    path = tmp_path / "results.sqlite"
+    ResultsStore(path).close()
+    store = ResultsStore(path)
+    store.connection.execute("PRAGMA user_version = 99")
+    store.close()
+
+    with pytest.raises(ValueError):
+        ResultsStore(path)
+
+
+def test__store__failing_checks_trend(store):
+    for commit_hash, status in (("c1", "passed"), ("c2", "failed"), ("c3", "failed")):
+        _record_run(store, "/repos/a", commit_hash, {"readme.title": status, "toplevel.readme": "failed"})
+    _record_run(store, "/repos/b", "d1", {"readme.title": "passed"})
+
+    trend = store.failing_checks_trend("/repos/a")
+    assert [(row["commit_hash"], row["failed_checks"]) for row in trend] == [("c1", 1), ("c2", 2), ("c3", 2)]
+    assert [row["commit_hash"] for row in store.failing_checks_trend(last=1)] == ["c3", "d1"]
+    assert [row["commit_hash"] for row in store.failing_checks_trend("/repos/a", last=2)] == ["c2", "c3"]
+
+
+def test__store__first_regressions(store):
+    for commit_hash, status in (("c1", "failed"), ("c2", "passed"), ("c3", "failed"), ("c4", "passed"), ("c5", "failed")):
+        _record_run(store, "/repos/a", commit_hash, {"readme.title": status})
+    _record_run(store, "/repos/b", "d1", {"readme.title": "failed"})
+
+    regressions = store.first_regressions("readme.title")
+    # Failing from the first run is not a regression.
+    assert [(row["repo"], row["commit_hash"]) for row in regressions] == [("/repos/a", "c3")]
+    assert store.first_regressions("readme.title", repo="/repos/b") == []
+
+
+def test__store__first_regressions_across_inconclusive_runs(store):
+    for commit_hash, status in (("c1", "passed"), ("c2", "timeout"), ("c3", "skipped"), ("c4", "failed")):
+        _record_run(store, "/repos/a", commit_hash, {"readme.title": status})
+
+    regressions = store.first_regressions("readme.title")
+    assert [(row["repo"], row["commit_hash"]) for row in regressions] == [("/repos/a", "c4")]
+
+
+def test__store__pass_rates(store):
+    _record_run(store, "/repos/a", "c1", {"readme.title": "failed", "toplevel.readme": "passed"})
+    _record_run(store, "/repos/a", "c2", {"readme.title": "passed", "toplevel.readme": "passed"})
+    _record_run(store, "/repos/b", "d1", {"readme.title": "failed", "toplevel.readme": "skipped"})
+
+    # Only the last run of each repository counts, and skipped checks are not evaluated.
+    rates = {row["check_name"]: (row["passed"], row["evaluated"], row["rate"]) for row in store.pass_rates()}
+    assert rates == {"readme.title": (1, 2, 50.0), "toplevel.readme": (1, 1, 100.0)}
+
+
+def test__store__run_query(store, tmp_path, caplog):
+    _record_run(store, "/repos/a", "0123456789", {"readme.title": "failed"})
+
+    with caplog.at_level("INFO"):
+        count = run_query(Namespace(store=tmp_path / "results.sqlite", question="trend", repo=None, last=None))
+    assert count == 1
+    assert "/repos/a" in caplog.text and "0123456 " in caplog.text and "1 failed" in caplog.text
+
+
+def test__pipeline__records_run(tmp_path, mock_repo_info):  # noqa: F811
+    (tmp_path / "README.md").write_text("# Wrong title\n")
+    mock_repo_info["top_level"] = tmp_path
+    mock_repo_info["commit_hash"] = "abc1234"
+    path = tmp_path / "results.sqlite"
+    args = Namespace(
+        repo_info=mock_repo_info,
+        verbose=False,
+        require_all=False,
+        fix_inplace=False,
+        fix_diff=None,
+        format="text",
+        store=path,
+    )
+
+    run_checks_pipeline(["readme.title", "toplevel.readme"], args, load_beman_standard_config())
+
+    store = ResultsStore(path)
+    run = store.connection.execute("SELECT * FROM runs").fetchone()
+    assert (run["repo"], run["commit_hash"], run["failed_checks"]) == (mock_repo_info["remote_url"], "abc1234", 0)
+    statuses = store.connection.execute("SELECT check_name, status FROM check_results ORDER BY check_name").fetchall()
+    assert [tuple(row) for row in statuses] == [("readme.title", "failed"), ("toplevel.readme", "passed")]
+    diagnostic = store.connection.execute("SELECT check_name, path, line FROM diagnostics").fetchone()
+    assert tuple(diagnostic) == ("readme.title", "README.md", 1)
+    store.close()
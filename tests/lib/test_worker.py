@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import time
+import pytest
+
+from beman_tidy.lib.worker import CheckWorker
+
+pytestmark = pytest.mark.skipif(not CheckWorker.is_supported(), reason="workers need fork()")
+
+
+def _run(check_name):
+    if check_name == "stuck":
+        time.sleep(60)  # No cancellation point.
+    if check_name == "crash":
+        raise ValueError("boom")
+    return "Requirement", "passed"
+
+
+def test__worker__runs_checks():
+    worker = CheckWorker(_run)
+    try:
+        assert worker.run_check("readme.title", timeout=10) == ("Requirement", "passed")
+        assert worker.run_check("readme.badges", timeout=10) == ("Requirement", "passed")
+    finally:
+        worker.close()
+
+
+def test__worker__recycled_after_a_timeout():
+    worker = CheckWorker(_run)
+    try:
+        worker.run_check("readme.title", timeout=10)
+        process = worker._process
+
+        start = time.monotonic()
+        assert worker.run_check("stuck", timeout=0.1) is None
+        assert time.monotonic() - start < 10
+        assert not process.is_alive()
+
+        # A new worker runs the next checks.
+        assert worker.run_check("readme.title", timeout=10) == ("Requirement", "passed")
+        assert worker._process is not process
+    finally:
+        worker.close()
+
+
+def test__worker__reports_exceptions():
+    worker = CheckWorker(_run)
+    try:
+        with pytest.raises(RuntimeError, match="boom"):
+            worker.run_check("crash", timeout=10)
+        assert worker.run_check("readme.title", timeout=10) == ("Requirement", "passed")
+    finally:
+        worker.close()
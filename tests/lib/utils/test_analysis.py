@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from beman_tidy.lib.utils.analysis import (
+    SPDX_MAX_LINE,
+    analyze_lines,
+    get_cached_file_facts,
+    get_file_facts,
+    invalidate_file_facts,
+)
+from beman_tidy.lib.utils.comments import CommentType
+
+
+def test__analysis__spdx_and_copyright_line_comment():
+    lines = [
+        "// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception\n",
+        "// Copyright (c) 2026 Someone\n",
+        "\n",
+        "int x = 0;\n",
+    ]
+    facts = analyze_lines(lines)
+    assert facts.spdx_index == 0
+    assert facts.spdx_comment_type == CommentType.LINE
+    assert facts.copyright_lines == [1]
+
+
+def test__analysis__copyright_in_next_single_line_block_comment():
+    lines = [
+        "/* SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception */\n",
+        "\n",
+        "/* Copyright 2026 Beman */\n",
+        "int x = 0;\n",
+    ]
+    facts = analyze_lines(lines)
+    assert facts.spdx_comment_type == CommentType.BLOCK
+    assert facts.copyright_lines == [2]
+
+
+def test__analysis__no_spdx():
+    facts = analyze_lines(["int x = 0;\n", "// Copyright 2026\n"])
+    assert facts.spdx_index == -1
+    assert facts.spdx_comment_type is None
+    assert facts.copyright_lines == []
+
+
+def test__analysis__spdx_is_searched_in_the_head_only():
+    facts = analyze_lines(["int x = 0;\n"] * SPDX_MAX_LINE + ["// SPDX-License-Identifier: MIT\n"])
+    assert facts.spdx_index == -1
+
+    facts = analyze_lines(["int x = 0;\n"] * (SPDX_MAX_LINE - 1) + ["// SPDX-License-Identifier: MIT\n"])
+    assert facts.spdx_index == SPDX_MAX_LINE - 1
+
+
+def test__analysis__namespaces_and_code_body():
+    lines = [
+        "#ifndef X\n",
+        "#define X\n",
+        "#include <vector>\n",
+        "namespace beman {\n",
+        "namespace my_lib {\n",
+        "class c {};\n",
+        "} // namespace my_lib\n",
+        "} // namespace beman\n",
+        "namespace beman::other::detail {}\n",
+        "#endif\n",
+    ]
+    facts = analyze_lines(lines)
+    assert facts.code_body == (3, 9)
+    assert facts.has_body_code is True
+    assert facts.declares_namespace("beman::my_lib")
+    assert facts.declares_namespace("beman::other")
+    assert not facts.declares_namespace("beman::my")
+
+
+def test__analysis__header_without_code():
+    lines = [
+        "#pragma once\n",
+        "#include <vector>\n",
+        "// only a comment\n",
+    ]
+    facts = analyze_lines(lines)
+    assert facts.has_body_code is False
+
+
+def test__analysis__file_facts_are_cached_until_invalidated(tmp_path):
+    path = tmp_path / "a.hpp"
+    path.write_text("// SPDX-License-Identifier: MIT\n")
+
+    facts = get_file_facts(path)
+    assert facts.spdx_index == 0
+    assert get_cached_file_facts(path) is facts
+
+    invalidate_file_facts(path)
+    assert get_cached_file_facts(path) is None
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import time
+import pytest
+
+from beman_tidy.lib.checks import beman_standard  # noqa: F401 (registers all checks)
+from beman_tidy.lib.checks.system.registry import get_registered_beman_standard_checks
+from beman_tidy.lib.utils.budget import BudgetExceeded, checkpoint, time_budget
+
+
+def test__budget__checkpoint_raises_after_the_deadline():
+    # No budget: checkpoints are no-ops.
+    checkpoint()
+    with time_budget(None, "check [x]") as budget:
+        assert budget is None
+        checkpoint()
+
+    with time_budget(0.01, "check [x]") as budget:
+        checkpoint()
+        time.sleep(0.02)
+        with pytest.raises(BudgetExceeded) as e:
+            checkpoint()
+    assert e.value.budget is budget
+    assert "check [x] exceeded its time budget" in str(e.value)
+
+    # The budget is not active outside of its block.
+    checkpoint()
+
+
+def test__budget__innermost_and_outermost():
+    with time_budget(60, "check [x]") as outer:
+        with pytest.raises(BudgetExceeded) as e:
+            with time_budget(0.001, "file"):
+                time.sleep(0.01)
+                checkpoint()
+        assert e.value.budget is not outer
+        checkpoint()
+
+
+def test__budget__not_swallowed_by_exception_handlers():
+    with pytest.raises(BudgetExceeded):
+        with time_budget(0.001, "check [x]"):
+            time.sleep(0.01)
+            try:
+                checkpoint()
+            except Exception:
+                pass
+
+
+def test__budget__batch_check_skips_files_over_budget(tmp_path, repo_info, beman_standard_check_config):
+    (tmp_path / "include/beman/exemplar").mkdir(parents=True)
+    (tmp_path / "include/beman/exemplar/a.hpp").write_text("// Copyright\n" * 10)
+    (tmp_path / "include/beman/exemplar/b.hpp").write_text("// Copyright\n" * 10)
+    repo_info["top_level"] = tmp_path
+    repo_info["config"] = {"timeouts": {"file": 1e-9}}
+
+    check = get_registered_beman_standard_checks()["file.copyright"](repo_info, beman_standard_check_config)
+    with pytest.raises(BudgetExceeded):
+        check.check()
+    assert sorted(path.name for path in check.timed_out_files) == ["a.hpp", "b.hpp"]
+
+    repo_info["config"] = {"timeouts": {"file": 60}}
+    check = get_registered_beman_standard_checks()["file.copyright"](repo_info, beman_standard_check_config)
+    assert check.check() is True
+    assert check.timed_out_files == []
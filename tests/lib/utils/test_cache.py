@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import pytest
+
+from beman_tidy.lib.utils.cache import FileStatCache
+
+
+def test__cache__get_or_compute_caches_until_the_file_changes(tmp_path):
+    path = tmp_path / "LICENSE"
+    path.write_text("a")
+    cache = FileStatCache()
+    assert cache.get_or_compute(path, str.upper) == "A"
+    assert cache.get_or_compute(path, lambda text: "recomputed") == "A"
+
+    path.write_text("bb")
+    assert cache.get_or_compute(path, str.upper) == "BB"
+
+
+def test__cache__get_or_compute_read_errors_return_default(tmp_path):
+    cache = FileStatCache()
+    assert cache.get_or_compute(tmp_path / "missing", str.upper, default="default") == "default"
+
+    path = tmp_path / "binary"
+    path.write_bytes(b"\xff\xfe\x00")
+    assert cache.get_or_compute(path, str.upper, default="default") == "default"
+
+
+def test__cache__get_or_compute_does_not_hide_compute_errors(tmp_path):
+    path = tmp_path / "LICENSE"
+    path.write_text("a")
+
+    def compute(text):
+        raise KeyError("bug")
+
+    with pytest.raises(KeyError):
+        FileStatCache().get_or_compute(path, compute, default="default")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from beman_tidy.lib.utils.comments import (
+    CommentType,
+    build_comment_map,
+    determine_comment_type,
+    find_in_comment,
+    iterate_comment_lines,
+)
+
+
+def test__comments__comment_map__trailing_block_comment_after_code():
+    lines = ["x = 1; /* SPDX-License-Identifier: MIT */\n"]
+    assert determine_comment_type(lines, 0) == CommentType.BLOCK
+    assert determine_comment_type(lines, 0, column=0) is None
+    assert determine_comment_type(lines, 0, column=lines[0].find("SPDX")) == CommentType.BLOCK
+
+
+def test__comments__comment_map__delimiters_inside_string_literals():
+    lines = [
+        'const char* s = "/* not a comment";\n',
+        'const char* t = "escaped \\" // still a string";\n',
+        "int x = 0;\n",
+    ]
+    comment_map = build_comment_map(lines)
+    assert comment_map.spans == []
+    assert determine_comment_type(lines, 2, comment_map=comment_map) is None
+
+
+def test__comments__comment_map__raw_string_spanning_lines():
+    lines = [
+        'auto s = R"delim(\n',
+        "/* not a comment\n",
+        ')" still raw )delim"; // real comment\n',
+    ]
+    comment_map = build_comment_map(lines)
+    assert len(comment_map.spans) == 1
+    span = comment_map.spans[0]
+    assert (span.kind, span.start_line) == (CommentType.LINE, 2)
+    assert determine_comment_type(lines, 1, comment_map=comment_map) is None
+
+
+def test__comments__comment_map__char_literals_and_digit_separators():
+    lines = ["auto q = '\"'; int n = 1'000'000; // c\n"]
+    comment_map = build_comment_map(lines)
+    assert [span.kind for span in comment_map.spans] == [CommentType.LINE]
+    assert comment_map.spans[0].start_col == lines[0].find("//")
+
+
+def test__comments__comment_map__nested_looking_delimiters():
+    lines = [
+        "/* outer /* not nested\n",
+        " // not a line comment */ int x; // line\n",
+    ]
+    comment_map = build_comment_map(lines)
+    kinds = [(span.kind, span.start_line, span.end_line) for span in comment_map.spans]
+    assert kinds == [(CommentType.BLOCK, 0, 1), (CommentType.LINE, 1, 1)]
+
+
+def test__comments__comment_map__span_lookup_matches_backward_scan_on_long_block():
+    lines = ["/*\n"] + [" * filler\n"] * 5000 + [" * SPDX-License-Identifier: MIT\n", " */\n", "int x;\n"]
+    comment_map = build_comment_map(lines)
+    assert determine_comment_type(lines, 5001, comment_map=comment_map) == CommentType.BLOCK
+    assert determine_comment_type(lines, 5003, comment_map=comment_map) is None
+    assert list(iterate_comment_lines(lines, 5001, CommentType.BLOCK, comment_map)) == [
+        (5001, lines[5001]),
+        (5002, lines[5002]),
+    ]
+
+
+def test__comments__find_in_comment__ignores_code_before_comment():
+    lines = [
+        'auto copyright = "x"; // SPDX-License-Identifier: MIT\n',
+        "// nothing here\n",
+    ]
+    assert find_in_comment(lines, 0, CommentType.LINE, ["copyright"]) == (None, None)
@@ -3,7 +3,13 @@
 
 import pytest
 import yaml
-from beman_tidy.lib.utils.config import validate_config, load_repo_config, get_default_config_path
+from beman_tidy.lib.utils.config import (
+    validate_config,
+    load_repo_config,
+    get_default_config_path,
+    get_timeout,
+    set_timeouts,
+)
 
 def test_validate_config_valid():
     """Test that a valid configuration passes validation."""
@@ -146,3 +152,31 @@ def test_load_repo_config_invalid_validation(tmp_path, capsys):
     
     captured = capsys.readouterr()
     assert "Error: Cannot ignore mandatory file 'README.md'" in captured.out
+
+def test_validate_config_timeouts(capsys):
+    """Test the validation of the time budgets."""
+    assert validate_config({"timeouts": {"check": 60, "file": 2.5}}) is True
+    assert validate_config({"timeouts": {"check": None}}) is True
+
+    assert validate_config({"timeouts": 60}) is False
+    assert "Error: 'timeouts' in .beman-tidy.yaml must be a mapping" in capsys.readouterr().out
+
+    assert validate_config({"timeouts": {"commit": 60}}) is False
+    assert "Error: Invalid entry in 'timeouts': commit" in capsys.readouterr().out
+
+    assert validate_config({"timeouts": {"file": 0}}) is False
+    assert "Must be a positive number of seconds" in capsys.readouterr().out
+
+def test_set_timeouts():
+    """Test that CLI time budgets override the configured ones."""
+    config = {"timeouts": {"check": 60, "file": 5}}
+    set_timeouts(config, check=None, file=1)
+    assert get_timeout({"config": config}, "check") == 60
+    assert get_timeout({"config": config}, "file") == 1
+    assert get_timeout({"config": {}}, "check") is None
+
+def test_validate_config_max_file_size(capsys):
+    """Test the validation of the file size cap."""
+    assert validate_config({"max_file_size": 4096}) is True
+    assert validate_config({"max_file_size": "1MB"}) is False
+    assert "Error: 'max_file_size' in .beman-tidy.yaml must be a positive number of bytes" in capsys.readouterr().out
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import logging
+from pathlib import Path
+
+from beman_tidy.lib.checks.beman_standard.file import FileCopyrightCheck
+from beman_tidy.lib.checks.beman_standard.readme import ReadmeTitleCheck
+from beman_tidy.lib.utils.diagnostics import ConsoleRenderer, Diagnostic, DiagnosticCollector
+
+
+class _Unformattable:
+    def __format__(self, spec):
+        raise AssertionError("The message should not be rendered.")
+
+
+def test__diagnostic__renders_template_on_demand():
+    diagnostic = Diagnostic(
+        "file.license_id",
+        "error",
+        "Found in {path} at line {line}, expected within {max_line} lines.",
+        path=Path("/repo/include/foo.hpp"),
+        line=30,
+        fix_hint="Move it to the first {max_line} lines.",
+        args={"max_line": 25},
+        root=Path("/repo"),
+    )
+    assert diagnostic.display_path == "include/foo.hpp"
+    assert diagnostic.message == "Found in include/foo.hpp at line 30, expected within 25 lines."
+    assert diagnostic.hint == "Move it to the first 25 lines."
+    assert diagnostic.message_id == "file.license_id"
+
+    # Without args, the message is not a template.
+    diagnostic = Diagnostic("cpp.namespace", "error", "namespace beman::{x} {", path=Path("foo.hpp"))
+    assert diagnostic.message == "namespace beman::{x} {"
+
+
+def test__log__does_not_render_disabled_messages(repo_info, beman_standard_check_config, caplog):
+    check = ReadmeTitleCheck(repo_info, beman_standard_check_config)
+    check.log("The file '{path}' is {state}.", path=check.path, state=_Unformattable())
+
+    check.log_enabled = True
+    check.log_level = "error"
+    with caplog.at_level(logging.INFO):
+        check.log("The file '{path}' is {state}.", path=check.path, state="empty")
+    assert "[readme.title]: The file 'README.md' is empty." in caplog.text
+
+
+class _ListRenderer:
+    def __init__(self):
+        self.diagnostics = []
+
+    def render(self, diagnostic):
+        self.diagnostics.append(diagnostic)
+
+
+def test__diagnostics__checks_emit_through_the_collector(tmp_path, repo_info, beman_standard_check_config, caplog):
+    (tmp_path / "include").mkdir()
+    (tmp_path / "include" / "foo.hpp").write_text("// SPDX-License-Identifier: MIT\n// Copyright (c) Someone\nint x;\n")
+    renderer = _ListRenderer()
+    repo_info["top_level"] = tmp_path
+    repo_info["diagnostics"] = DiagnosticCollector([renderer, ConsoleRenderer()])
+
+    check = FileCopyrightCheck.FileCopyrightCheckImpl(repo_info, beman_standard_check_config, "include/foo.hpp")
+    check.log_enabled = True
+    with caplog.at_level(logging.INFO):
+        assert not check.check()
+
+    [diagnostic] = renderer.diagnostics
+    assert (diagnostic.check, diagnostic.level, diagnostic.display_path) == ("file.copyright", "warning", "include/foo.hpp")
+    assert (diagnostic.line, diagnostic.column) == (2, 4)
+    assert diagnostic.hint == "It should be removed."
+    # The console output is a rendering of the same diagnostic.
+    assert "[file.copyright]: Copyright notice found in foo.hpp at line 2. It should be removed." in caplog.text
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import io
+import re
+import pytest
+
+from beman_tidy.lib.utils.document import MMAP_THRESHOLD, Document
+
+
+@pytest.mark.parametrize("data", [b"", b"a", b"a\n", b"a\nb", b"a\r\nb\r\n", b"a\rb\n\nc", "é\nü\n".encode()])
+def test__document__lines_match_text_mode(data):
+    lines = io.StringIO(data.decode(), newline=None).readlines()
+    assert Document(data).lines() == lines
+    assert Document(data).text() == "".join(lines)
+
+    document = Document(data)
+    assert [document.line(i) for i in range(document.line_count)] == lines
+    with pytest.raises(IndexError):
+        document.line(len(lines))
+
+
+@pytest.mark.parametrize("data", [b"", b"a", b"a\n", b"a\nb", b"a\r\nb\r\n", b"a\rb\n\nc"])
+def test__document__head_end(data):
+    document = Document(data)
+    ends = [document.head_end(n) for n in range(5)]
+    document.line_starts  # Same offsets from the line index.
+    assert [document.head_end(n) for n in range(5)] == ends
+    assert [Document(data[: ends[n]]).line_count for n in range(5)] == [min(n, document.line_count) for n in range(5)]
+
+
+def test__document__scans_without_decoding():
+    document = Document(b"// x\n// SPDX-License-Identifier: MIT\r\n// Copyright\n")
+    offset = document.find(b"SPDX-License-Identifier:")
+    assert document.line_index_at(offset) == 1
+    assert document._line_starts is None  # The line index is built on first random access only.
+    assert document.search(re.compile(rb"copyright", re.IGNORECASE)) is not None
+    assert document.contains("MIT\n// Copyright")
+    assert not document.contains("Apache")
+    assert bytes(document.view(3, 4)) == b"x"
+
+
+def test__document__big_files_are_mapped(tmp_path):
+    (tmp_path / "small.hpp").write_text("// small\n")
+    (tmp_path / "big.hpp").write_text("// big\n" * (MMAP_THRESHOLD // 7 + 1))
+
+    with Document.open(tmp_path / "small.hpp") as small:
+        assert not small.is_mapped
+        assert small.lines() == ["// small\n"]
+
+    with Document.open(tmp_path / "big.hpp") as big:
+        assert big.is_mapped
+        assert big.line(0) == "// big\n"
+        assert big.line_count == MMAP_THRESHOLD // 7 + 1
+
+    with pytest.raises(OSError):
+        Document.open(tmp_path / "missing.hpp")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import os
+import stat
+
+import pytest
+
+from beman_tidy.lib.checks.beman_standard.readme import ReadmeTitleCheck
+from beman_tidy.lib.utils import edits as edits_module
+from beman_tidy.lib.utils.edits import EditBuffer, get_edit_buffer, unified_diff
+from beman_tidy.lib.utils.filesystem import WorktreeFS, write_text_atomic
+
+
+def test__edit_buffer__edits_are_merged_and_written_once(tmp_path, monkeypatch):
+    path = tmp_path / "foo.hpp"
+    path.write_text("int x;\n")
+    buffer = EditBuffer(WorktreeFS())
+    buffer.write_text(path, "// SPDX-License-Identifier: MIT\n" + buffer.read_text(path))
+    buffer.write_text(path, "// Copyright\n" + buffer.read_text(path))
+
+    # Nothing is written before the commit, but every read sees the merged edits.
+    assert path.read_text() == "int x;\n"
+    assert buffer.read_lines(path) == ["// Copyright\n", "// SPDX-License-Identifier: MIT\n", "int x;\n"]
+    assert buffer.size(path) == len(buffer.read_bytes(path))
+    assert not buffer.is_mappable(path)
+
+    writes = []
+    monkeypatch.setattr(edits_module, "write_text_atomic", lambda *args: (writes.append(args), write_text_atomic(*args)))
+    assert buffer.commit() == [path]
+    assert len(writes) == 1
+    assert path.read_text() == "// Copyright\n// SPDX-License-Identifier: MIT\nint x;\n"
+    assert buffer.edited_paths == []
+
+
+def test__edit_buffer__commit_skips_unchanged_files_and_keeps_mode(tmp_path):
+    unchanged = tmp_path / "unchanged.sh"
+    unchanged.write_text("echo\n")
+    script = tmp_path / "script.sh"
+    script.write_text("echo\n")
+    script.chmod(0o755)
+
+    buffer = EditBuffer(WorktreeFS())
+    buffer.write_text(unchanged, "echo\n")
+    buffer.write_text(script, "echo fixed\n")
+    assert buffer.commit() == [script]
+    assert script.read_text() == "echo fixed\n"
+    assert stat.S_IMODE(os.stat(script).st_mode) == 0o755
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["script.sh", "unchanged.sh"]  # No temporary file left.
+
+
+def test__write_text_atomic__keeps_the_file_on_failure(tmp_path):
+    path = tmp_path / "foo.hpp"
+    path.write_text("old\n")
+    with pytest.raises(UnicodeEncodeError):
+        write_text_atomic(path, "\ud800")
+    assert path.read_text() == "old\n"
+    assert [p.name for p in tmp_path.iterdir()] == ["foo.hpp"]
+
+
+def test__edit_buffer__fixes_go_through_the_buffer(tmp_path, repo_info, beman_standard_check_config):
+    readme = tmp_path / "README.md"
+    readme.write_text("# Wrong title\n\nSome text\n")
+    repo_info["top_level"] = tmp_path
+    repo_info["filesystem"] = EditBuffer(WorktreeFS())
+    assert get_edit_buffer(repo_info) is repo_info["filesystem"]
+
+    check = ReadmeTitleCheck(repo_info, beman_standard_check_config)
+    assert not check.check()
+    assert check.fix()
+    # The line break of the replaced line is kept, the other lines are unchanged.
+    assert ReadmeTitleCheck(repo_info, beman_standard_check_config).check()
+    assert readme.read_text() == "# Wrong title\n\nSome text\n"
+
+    get_edit_buffer(repo_info).commit()
+    assert readme.read_text() == "# beman.exemplar: TODO Short Description\n\nSome text\n"
+
+
+def test__edit_buffer__no_buffer_without_fix_inplace(repo_info):
+    assert get_edit_buffer(repo_info) is None
+
+
+def test__write_lines__terminates_each_line_once(tmp_path, repo_info, beman_standard_check_config):
+    readme = tmp_path / "README.md"
+    readme.write_text("# Wrong title\nSome text")
+    repo_info["top_level"] = tmp_path
+
+    check = ReadmeTitleCheck(repo_info, beman_standard_check_config)
+    check.write_lines(["a\n", "b", "", "c\n"])
+    assert readme.read_text() == "a\nb\n\nc\n"
+    check.write_lines(check.read_lines())
+    assert readme.read_text() == "a\nb\n\nc\n"
+
+
+def test__unified_diff__git_apply_format():
+    assert unified_diff("same\n", "same\n", "foo.hpp") == ""
+    assert unified_diff("a\nb", "x\na\nb\n", "include/foo.hpp") == (
+        "diff --git a/include/foo.hpp b/include/foo.hpp\n"
+        "--- a/include/foo.hpp\n"
+        "+++ b/include/foo.hpp\n"
+        "@@ -1,2 +1,3 @@\n"
+        "+x\n"
+        " a\n"
+        "-b\n"
+        "\\ No newline at end of file\n"
+        "+b\n"
+    )
+
+
+def test__edit_buffer__diff_does_not_write(tmp_path):
+    (tmp_path / "b.hpp").write_text("int b;\n")
+    (tmp_path / "a.hpp").write_text("int a;\n")
+    buffer = EditBuffer(WorktreeFS())
+    buffer.write_text(tmp_path / "b.hpp", "// b\nint b;\n")
+    buffer.write_text(tmp_path / "a.hpp", "int a;\n")
+
+    assert buffer.diff(tmp_path) == (
+        "diff --git a/b.hpp b/b.hpp\n"
+        "--- a/b.hpp\n"
+        "+++ b/b.hpp\n"
+        "@@ -1 +1,2 @@\n"
+        "+// b\n"
+        " int b;\n"
+    )
+    assert (tmp_path / "b.hpp").read_text() == "int b;\n"
+
+
+def test__edit_buffer__keeps_crlf_line_breaks(tmp_path):
+    path = tmp_path / "crlf.hpp"
+    path.write_bytes(b"a\r\nb\r\nc\r\n")
+    buffer = EditBuffer(WorktreeFS())
+    assert buffer.read_text(path) == "a\nb\nc\n"
+    buffer.write_text(path, "a\nB\nc\n")
+
+    # Only the edited line is in the patch, with the line breaks of the file.
+    assert buffer.diff(tmp_path) == (
+        "diff --git a/crlf.hpp b/crlf.hpp\n"
+        "--- a/crlf.hpp\n"
+        "+++ b/crlf.hpp\n"
+        "@@ -1,3 +1,3 @@\n"
+        " a\r\n"
+        "-b\r\n"
+        "+B\r\n"
+        " c\r\n"
+    )
+
+    assert buffer.commit() == [path]
+    assert path.read_bytes() == b"a\r\nB\r\nc\r\n"
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from pathlib import Path
+
+from beman_tidy.lib.utils.file import classify_repo_files, is_in_directory, is_under_prefix
+
+
+def _touch(root, relative_path):
+    path = root / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+
+
+def test__file__is_under_prefix_matches_path_components():
+    assert is_under_prefix(Path("tests/beman/exemplar/a.test.cpp"), "tests/beman/exemplar")
+    assert is_under_prefix(Path("src"), "src/")
+    assert not is_under_prefix(Path("srcs/a.md"), "src")
+    assert not is_under_prefix(Path("resources/a.md"), "src")
+    assert not is_under_prefix(Path("tests/beman/exemplar2/a.test.cpp"), "tests/beman/exemplar")
+
+
+def test__file__is_in_directory_matches_path_components_at_any_depth():
+    assert is_in_directory(Path("src/notes.md"), "src")
+    assert is_in_directory(Path("libs/x/src/notes.md"), "src")
+    assert is_in_directory(Path("libs/tests/beman/exemplar/a.test.cpp"), "tests/beman/exemplar")
+    assert not is_in_directory(Path("srcs/a.md"), "src")
+    assert not is_in_directory(Path("resources/a.md"), "src")
+    assert not is_in_directory(Path("src.md"), "src")
+    assert not is_in_directory(Path("tests/beman/exemplar2/a.test.cpp"), "tests/beman/exemplar")
+
+
+def test__file__classify_repo_files_buckets_and_prunes(tmp_path):
+    for relative_path in [
+        "README.md",
+        "papers/P2988/abstract.bst",
+        "docs/guide.md",
+        "examples/CMakeLists.txt",
+        "examples/usage.cpp",
+        "tests/beman/exemplar/identity.test.cpp",
+        "build/generated.md",
+        "vendor/skip.test.cpp",
+    ]:
+        _touch(tmp_path, relative_path)
+
+    index = classify_repo_files(tmp_path, ignores=["build/", "vendor"])
+
+    assert index.get("doc") == [Path("README.md"), Path("docs/guide.md")]
+    assert index.get("paper", exclude=["docs"]) == [Path("README.md"), Path("papers/P2988/abstract.bst")]
+    assert index.get("doc", exclude=["guide", "doc"]) == [Path("README.md"), Path("docs/guide.md")]
+    assert index.get("test") == [Path("tests/beman/exemplar/identity.test.cpp")]
+    assert index.get("example", under="examples") == [Path("examples/usage.cpp")]
+    assert index.get("cmake", under="tests") == []
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import io
+import pytest
+import tarfile
+import zipfile
+from pathlib import Path
+from git import Actor, Repo
+
+from beman_tidy.lib.utils.analysis import get_file_facts
+from beman_tidy.lib.utils.file import get_cpp_files, walk_repo_files
+from beman_tidy.lib.utils.filesystem import ArchiveFS, GitTreeFS
+from beman_tidy.lib.utils.git import get_repo_info
+
+_AUTHOR = Actor("beman-tidy", "beman-tidy@example.com")
+
+
+def _commit(repo, root, files, message):
+    for relative_path, content in files.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    repo.index.add(list(files))
+    return repo.index.commit(message, author=_AUTHOR, committer=_AUTHOR)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = Repo.init(tmp_path)
+    _commit(
+        repo,
+        tmp_path,
+        {
+            "README.md": "# beman.x\n",
+            "include/beman/x/x.hpp": "// v1\n",
+            "build/generated.cpp": "",
+            ".gitignore": "build/\n",
+        },
+        "first",
+    )
+    _commit(repo, tmp_path, {"src/beman/x/x.cpp": "// v2\n"}, "second")
+    return repo
+
+
+def test__filesystem__reads_the_committed_content(tmp_path, repo):
+    # Uncommitted changes are not visible at a revision.
+    (tmp_path / "include/beman/x/x.hpp").write_text("// modified\n")
+    (tmp_path / "untracked.cpp").write_text("")
+
+    fs = GitTreeFS(tmp_path, "HEAD")
+    assert fs.read_text(tmp_path / "include/beman/x/x.hpp") == "// v1\n"
+    assert fs.size(tmp_path / "include/beman/x/x.hpp") == 6
+    assert fs.read_head(tmp_path / "include/beman/x/x.hpp", 2) == b"//"
+    assert fs.is_file(tmp_path / "README.md")
+    assert fs.is_dir(tmp_path / "include/beman")
+    assert not fs.exists(tmp_path / "untracked.cpp")
+    assert not fs.writable
+
+    previous = GitTreeFS(tmp_path, "HEAD~1")
+    assert not previous.exists(tmp_path / "src/beman/x/x.cpp")
+    with pytest.raises(FileNotFoundError):
+        previous.read_text(tmp_path / "src/beman/x/x.cpp")
+
+
+def test__filesystem__invalid_revision(tmp_path, repo):
+    with pytest.raises(ValueError):
+        GitTreeFS(tmp_path, "does-not-exist")
+
+
+def test__filesystem__walk_matches_the_worktree(tmp_path, repo):
+    fs = GitTreeFS(tmp_path, "HEAD")
+    (tmp_path / "untracked.cpp").write_text("")
+
+    # Same walk as on the worktree, minus untracked files.
+    assert get_cpp_files(tmp_path, filesystem=fs) == [
+        Path("include/beman/x/x.hpp"),
+        Path("src/beman/x/x.cpp"),
+    ]
+    assert get_cpp_files(tmp_path, filesystem=GitTreeFS(tmp_path, "HEAD~1")) == [
+        Path("include/beman/x/x.hpp"),
+    ]
+
+
+def test__filesystem__force_added_ignored_files_are_walked_as_in_the_worktree(tmp_path, repo):
+    _commit(repo, tmp_path, {".gitignore": "gen/\n"}, "ignore gen/")
+    (tmp_path / "gen").mkdir()
+    (tmp_path / "gen/keep.txt").write_text("")
+    (tmp_path / "gen/untracked.txt").write_text("")
+    repo.git.add("-f", "gen/keep.txt")
+    repo.git.execute(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "keep"])
+
+    # --rev checks the same files as a checkout of the revision: the force-added file is tracked, hence not ignored.
+    worktree_files = sorted(walk_repo_files(tmp_path))
+    assert Path("gen/keep.txt") in worktree_files
+    assert Path("gen/untracked.txt") not in worktree_files
+    assert sorted(walk_repo_files(tmp_path, filesystem=GitTreeFS(tmp_path, "HEAD"))) == worktree_files
+
+
+def test__filesystem__caches_are_keyed_by_blob(tmp_path, repo):
+    fs = GitTreeFS(tmp_path, "HEAD")
+    facts = get_file_facts(tmp_path / "include/beman/x/x.hpp", fs)
+    assert facts.line_count == 1
+
+    # The same blob in another revision reuses the cached value.
+    previous = GitTreeFS(tmp_path, "HEAD~1")
+    assert get_file_facts(tmp_path / "include/beman/x/x.hpp", previous) is facts
+
+
+def test__filesystem__bare_repository(tmp_path, repo):
+    Repo.clone_from(tmp_path, tmp_path / "mirrors" / "beman.x.git", bare=True)
+
+    repo_info = get_repo_info(tmp_path / "mirrors" / "beman.x.git")
+    assert repo_info["short_name"] == "x"
+    assert repo_info["commit_hash"] == repo.head.commit.hexsha
+    fs = repo_info["filesystem"]
+    assert fs.read_text(repo_info["top_level"] / "include/beman/x/x.hpp") == "// v1\n"
+
+
+_ARCHIVE_FILES = {
+    "x-1.0.0/README.md": b"# beman.x\r\n",
+    "x-1.0.0/include/beman/x/x.hpp": b"// v1\n",
+    "x-1.0.0/build/generated.cpp": b"",
+    "x-1.0.0/.gitignore": b"build/\n",
+}
+
+
+def _write_tar(path):
+    with tarfile.open(path, "w:gz") as tar:
+        for name, data in _ARCHIVE_FILES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+def _write_zip(path):
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in _ARCHIVE_FILES.items():
+            archive.writestr(name, data)
+
+
+@pytest.mark.parametrize("name, write", [("x-1.0.0.tar.gz", _write_tar), ("x-1.0.0.zip", _write_zip)])
+def test__filesystem__archive(tmp_path, name, write):
+    write(tmp_path / name)
+
+    fs = ArchiveFS(tmp_path / name)
+    assert fs.top_level_name == "x-1.0.0"
+    assert fs.read_text(fs.root / "README.md") == "# beman.x\n"
+    assert fs.size(fs.root / "README.md") == 11
+    assert fs.is_dir(fs.root / "include/beman")
+    assert get_cpp_files(fs.root, filesystem=fs) == [Path("include/beman/x/x.hpp")]
+    # Same content ID as git, so cached values are shared with the repository revisions.
+    assert fs.content_id(fs.root / "include/beman/x/x.hpp") == "beaf7bb0521546b142183a3006321dee071e2d57"
+
+    repo_info = get_repo_info(tmp_path / name)
+    assert repo_info["short_name"] == "x"
+    assert repo_info["filesystem"].exists(repo_info["top_level"] / "README.md")
+
+
+def test__filesystem__archive_retained_files(tmp_path):
+    _write_tar(tmp_path / "x-1.0.0.tar.gz")
+
+    fs = ArchiveFS(tmp_path / "x-1.0.0.tar.gz", retained_files={"README.md"})
+    assert fs.read_text(fs.root / "README.md") == "# beman.x\n"
+    # Listed, but the content was skipped while streaming.
+    assert fs.is_file(fs.root / "include/beman/x/x.hpp")
+    with pytest.raises(OSError):
+        fs.read_text(fs.root / "include/beman/x/x.hpp")
+
+
+def test__filesystem__invalid_archive(tmp_path):
+    (tmp_path / "x.tar.gz").write_bytes(b"not an archive")
+    with pytest.raises(ValueError):
+        ArchiveFS(tmp_path / "x.tar.gz")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import pytest
+from pathlib import Path
+from git import Repo
+
+from beman_tidy.lib.utils.file import get_cpp_files
+from beman_tidy.lib.utils.git_index import get_tracked_files, parse_git_index
+
+
+def _make_repo(root):
+    repo = Repo.init(root)
+    for relative_path in ["include/beman/x/x.hpp", "src/beman/x/x.cpp", "README.md", "dir with space/a.cpp"]:
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("// content\n")
+    repo.index.add(["include/beman/x/x.hpp", "src/beman/x/x.cpp", "README.md", "dir with space/a.cpp"])
+    repo.index.write()
+    return repo
+
+
+@pytest.mark.parametrize("index_version", [2, 3, 4])
+def test__git_index__matches_git_ls_files(tmp_path, index_version):
+    repo = _make_repo(tmp_path)
+    repo.git.update_index(f"--index-version={index_version}")
+
+    expected = sorted(repo.git.ls_files("-z").split("\0")[:-1])
+    assert [p.as_posix() for p in get_tracked_files(tmp_path)] == expected
+
+
+def test__git_index__rejects_invalid_data():
+    with pytest.raises(ValueError):
+        parse_git_index(b"not an index")
+
+
+def test__git_index__tracked_only_skips_untracked_files(tmp_path):
+    _make_repo(tmp_path)
+    (tmp_path / "build-custom").mkdir()
+    (tmp_path / "build-custom" / "generated.cpp").write_text("")
+    (tmp_path / "src/beman/x/x.cpp").unlink()  # tracked, but deleted from the working tree
+
+    tracked_files = get_tracked_files(tmp_path)
+    assert get_cpp_files(tmp_path, tracked_files=tracked_files) == [
+        Path("dir with space/a.cpp"),
+        Path("include/beman/x/x.hpp"),
+    ]
+    assert Path("build-custom/generated.cpp") in get_cpp_files(tmp_path)
+
+
+def test__git_index__split_index(tmp_path):
+    repo = _make_repo(tmp_path)
+    for index in range(6):
+        (tmp_path / f"f{index}.txt").write_text(f"{index}\n")
+    repo.git.add(".")
+    repo.git.update_index("--split-index")
+    # Changes after the split go to the split index: replaced, deleted and added entries.
+    (tmp_path / "f1.txt").write_text("changed\n")
+    repo.git.add("f1.txt")
+    repo.git.rm("--cached", "f2.txt")
+    (tmp_path / "g.txt").write_text("new\n")
+    repo.git.add("g.txt")
+    assert list((tmp_path / ".git").glob("sharedindex.*"))
+
+    expected = sorted(repo.git.ls_files("-z").split("\0")[:-1])
+    assert [p.as_posix() for p in get_tracked_files(tmp_path)] == expected
+
+
+def test__git_index__split_index_without_shared_index(tmp_path):
+    repo = _make_repo(tmp_path)
+    repo.git.update_index("--split-index")
+
+    with pytest.raises(ValueError):
+        parse_git_index((tmp_path / ".git" / "index").read_bytes())
+
+
+def test__git_index__sha256_linked_worktree(tmp_path):
+    main = tmp_path / "main"
+    main.mkdir()
+    repo = Repo.init(main, object_format="sha256")
+    (main / "README.md").write_text("# x\n")
+    repo.git.add("README.md")
+    repo.git.execute(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init"])
+    # The config (with the object format) is in the main git directory, not in the one of the linked worktree.
+    repo.git.worktree("add", str(tmp_path / "linked"))
+
+    assert get_tracked_files(tmp_path / "linked") == [Path("README.md")]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from pathlib import Path
+
+from git import Repo
+
+from beman_tidy.lib.utils.file import walk_repo_files
+from beman_tidy.lib.utils.gitignore import GitIgnore, parse_gitignore
+
+
+def _touch(root, relative_path, content=""):
+    path = root / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test__gitignore__anchoring_and_directories():
+    gitignore = GitIgnore(parse_gitignore("/out\n_build-*/\n*.o\ndocs/*.html\n"))
+    assert gitignore.is_ignored("out", is_dir=True)
+    assert not gitignore.is_ignored("src/out", is_dir=True)
+    assert gitignore.is_ignored("_build-gcc14", is_dir=True)
+    assert gitignore.is_ignored("src/_build-gcc14", is_dir=True)
+    assert not gitignore.is_ignored("_build-gcc14")  # directory-only pattern, regular file
+    assert gitignore.is_ignored("src/deep/main.o")
+    assert gitignore.is_ignored("docs/index.html")
+    assert not gitignore.is_ignored("docs/api/index.html")
+
+
+def test__gitignore__double_star_negation_and_escapes():
+    gitignore = GitIgnore(parse_gitignore("**/gen\nlogs/**\n*.log\n!keep.log\n\\#hash\n# comment\n"))
+    assert gitignore.is_ignored("gen", is_dir=True)
+    assert gitignore.is_ignored("a/b/gen", is_dir=True)
+    assert gitignore.is_ignored("logs/a/b.txt")
+    assert gitignore.is_ignored("a/debug.log")
+    assert not gitignore.is_ignored("a/keep.log")
+    assert gitignore.is_ignored("#hash")
+    assert not gitignore.is_ignored("comment")
+
+
+def test__gitignore__walk_prunes_nested_gitignore_and_info_exclude(tmp_path):
+    _touch(tmp_path, ".gitignore", "out/\n*.gen.cpp\n")
+    _touch(tmp_path, ".git/info/exclude", "scratch/\n")
+    _touch(tmp_path, "src/.gitignore", "vendored/\n!keep.gen.cpp\n")
+    for relative_path in [
+        "src/a.cpp",
+        "src/b.gen.cpp",
+        "src/keep.gen.cpp",
+        "src/vendored/c.cpp",
+        "out/d.cpp",
+        "scratch/e.cpp",
+        "tests/vendored/f.cpp",
+    ]:
+        _touch(tmp_path, relative_path)
+
+    files = sorted(p for p in walk_repo_files(tmp_path) if p.suffix == ".cpp")
+    assert files == [
+        Path("src/a.cpp"),
+        Path("src/keep.gen.cpp"),
+        Path("tests/vendored/f.cpp"),
+    ]
+
+
+def test__gitignore__walk_keeps_tracked_files(tmp_path):
+    repo = Repo.init(tmp_path)
+    _touch(tmp_path, "include/.gitignore", "gen/\n*.tmp\n")
+    _touch(tmp_path, "include/gen/a.hpp")
+    _touch(tmp_path, "include/gen/untracked.hpp")
+    _touch(tmp_path, "include/b.tmp")
+    repo.git.add("include/.gitignore")
+    repo.git.add("-f", "include/gen/a.hpp", "include/b.tmp")
+
+    # Force-added files are tracked, hence never ignored (as with --tracked-only); untracked ones still are.
+    assert sorted(walk_repo_files(tmp_path)) == [
+        Path("include/.gitignore"),
+        Path("include/b.tmp"),
+        Path("include/gen/a.hpp"),
+    ]
+
+
+def test__gitignore__walk_reads_info_exclude_of_linked_worktree(tmp_path):
+    main = tmp_path / "main"
+    repo = Repo.init(main)
+    _touch(main, "README.md")
+    repo.git.add("README.md")
+    repo.git.execute(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init"])
+    _touch(main, ".git/info/exclude", "scratch/\n")
+    linked = tmp_path / "linked"
+    repo.git.worktree("add", str(linked))
+    _touch(linked, "scratch/a.cpp")
+
+    # The .git of a linked worktree is a file: info/exclude is read from the main git directory.
+    assert (linked / ".git").is_file()
+    assert sorted(walk_repo_files(linked)) == [Path("README.md")]
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from pathlib import Path
+
+from beman_tidy.lib.utils.config import get_ignore_matcher, get_ignores, is_ignored
+from beman_tidy.lib.utils.ignore import IgnoreMatcher, compile_ignores
+
+
+def test__ignore__literal_prefixes():
+    matcher = IgnoreMatcher(["build/", "include/beman/optional/config.hpp"])
+    assert matcher.matches(Path("build"))
+    assert matcher.matches(Path("build/debug/output.log"))
+    assert matcher.matches("include/beman/optional/config.hpp")
+    assert not matcher.matches("include/beman/optional/config.hpp.in")
+    assert not matcher.matches("src/build")
+    assert not matcher.matches(Path("."))
+
+
+def test__ignore__globs_and_double_star():
+    matcher = IgnoreMatcher(["cmake-build-*", "docs/*.tmp", "**/generated", "third_party/**/test"])
+    assert matcher.matches("cmake-build-debug/main.o")
+    assert matcher.matches("docs/notes.tmp")
+    assert not matcher.matches("docs/sub/notes.tmp")
+    assert matcher.matches("generated/a.hpp")
+    assert matcher.matches("src/deep/generated/a.hpp")
+    assert matcher.matches("third_party/test")
+    assert matcher.matches("third_party/a/b/test/x.cpp")
+    assert not matcher.matches("third_party/a/b/tests/x.cpp")
+
+
+def test__ignore__compiled_once_per_repo_info():
+    repo_info = {"config": {"ignored_paths": ["dist/"]}}
+    assert get_ignore_matcher(repo_info) is get_ignore_matcher(repo_info)
+    assert get_ignore_matcher(repo_info) is compile_ignores(get_ignores(repo_info))
+    assert is_ignored(repo_info, Path("dist/a.whl"))
+
+    # Replacing the configured ignores invalidates the memoized matcher.
+    repo_info["config"]["ignored_paths"] = ["out/"]
+    assert not is_ignored(repo_info, Path("dist/a.whl"))
+    assert is_ignored(repo_info, Path("out/a.whl"))
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from beman_tidy.lib.utils.license import (
+    APACHE_LLVM_LICENSE_ID,
+    BOOST_LICENSE_ID,
+    fingerprint_license_text,
+    get_reference_license_text,
+    identify_license,
+)
+
+
+def test__license__fingerprint_normalizes_case_whitespace_and_punctuation():
+    a = fingerprint_license_text("Boost Software License - Version 1.0 -\n  August 17th, 2003")
+    b = fingerprint_license_text("boost software license version 1.0 august 17th 2003.")
+    assert a.tokens == ("boost", "software", "license", "version", "1.0", "august", "17th", "2003")
+    assert a.digest == b.digest
+    assert a.shingles == b.shingles
+
+
+def test__license__identify_reference_texts():
+    for spdx_id in (APACHE_LLVM_LICENSE_ID, BOOST_LICENSE_ID):
+        match = identify_license(get_reference_license_text(spdx_id))
+        assert match.license.spdx_id == spdx_id
+        assert match.exact and match.full_text and match.score == 1.0
+
+    # Reflowed text with a changed header still matches the reference.
+    text = get_reference_license_text(BOOST_LICENSE_ID).replace("\n", " ").upper()
+    text = text.replace("AUGUST 17TH, 2003", "")
+    match = identify_license(text)
+    assert match.license.spdx_id == BOOST_LICENSE_ID
+    assert not match.exact and match.full_text and match.score < 1.0
+
+
+def test__license__identify_short_statements():
+    match = identify_license("This project is licensed under the Apache License 2.0 with LLVM Exceptions.")
+    assert match.license.spdx_id == APACHE_LLVM_LICENSE_ID
+    assert not match.full_text
+
+    match = identify_license("This project is licensed under the Boost Software License 1.0.")
+    assert match.license.spdx_id == BOOST_LICENSE_ID
+
+    assert identify_license("This is licensed under the Blah Blah license.") is None
+
+
+def test__license__plain_apache_is_not_approved():
+    text = get_reference_license_text(APACHE_LLVM_LICENSE_ID).replace("LLVM", "")
+    assert identify_license(text) is None
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from beman_tidy.lib.utils.markdown import build_markdown_index
+
+README = """# beman.example: A Beman Library Example
+
+[![Library Status](https://img.shields.io/badge/status-under_development-orange)](https://example.com/status)
+
+**Implements**: `std::example` proposed in [P0000R0](https://wg21.link/P0000R0).
+
+**Status**: [Under development and not yet ready for production use.](https://example.com/status)
+
+## Usage
+
+```markdown
+## License
+**Implements**: not a real label
+```
+
+### Details
+
+Some text.
+
+## License
+
+Licensed under Apache 2.0.
+"""
+
+
+def test__markdown__headings_and_sections():
+    index = build_markdown_index(README)
+    assert [(h.level, h.title) for h in index.headings] == [
+        (1, "beman.example: A Beman Library Example"),
+        (2, "Usage"),
+        (3, "Details"),
+        (2, "License"),
+    ]
+
+    usage = index.section("Usage", level=2)
+    assert usage.end_line == index.section("License").line
+
+    # The last section runs until the end of the document.
+    license_section = index.section("License", level=2)
+    assert index.section_text(license_section).strip() == "Licensed under Apache 2.0."
+
+
+def test__markdown__fenced_code_blocks_are_ignored():
+    index = build_markdown_index(README)
+    assert len(index.fenced_ranges) == 1
+    assert [h.title for h in index.headings].count("License") == 1
+    assert len(index.label_lines("Implements")) == 1
+    assert index.label_lines("Implements")[0].startswith("**Implements**: `std::example`")
+
+
+def test__markdown__links_and_linked_images():
+    index = build_markdown_index(README)
+    badges = index.linked_images()
+    assert len(badges) == 1
+    assert badges[0].text == "Library Status"
+    assert badges[0].url == "https://img.shields.io/badge/status-under_development-orange"
+    assert badges[0].href == "https://example.com/status"
+    assert (
+        "[![Library Status](https://img.shields.io/badge/status-under_development-orange)](https://example.com/status)"
+        in index.raw_links()
+    )
+    assert "[P0000R0](https://wg21.link/P0000R0)" in index.raw_links()
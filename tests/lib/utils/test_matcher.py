@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from beman_tidy.lib.utils.matcher import LiteralMatcher, build_values_matcher
+
+
+def test__matcher__counts_per_category():
+    matcher = build_values_matcher(
+        [
+            {"status": ["![A](a.svg)", "![B](b.svg)"]},
+            {"target": ["![C](c.svg)"]},
+        ]
+    )
+    text = "![A](a.svg) text ![A](a.svg)\n![B](b.svg)"
+    assert matcher.count(text) == {"status": 2, "target": 0}
+
+
+def test__matcher__plain_values_use_default_category():
+    matcher = build_values_matcher(["one", "two"])
+    assert matcher.count("two and one") == {"values": 2}
+
+
+def test__matcher__overlapping_and_prefix_literals():
+    matcher = LiteralMatcher({"a": ["abc", "abcdef"], "b": ["cde"]})
+    assert matcher.scan("xabcdefx") == {"a": {"abc", "abcdef"}, "b": {"cde"}}
+    assert matcher.scan("") == {"a": set(), "b": set()}
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import io
+
+from beman_tidy.lib.utils.analysis import COPYRIGHT_MARKERS_RE, SPDX_MARKER_BYTES
+from beman_tidy.lib.utils.scan import decode_line, head_end, line_index_at, line_starts
+
+
+def test__scan__lines_match_text_mode():
+    for data in [b"", b"a", b"a\n", b"a\nb", b"a\r\nb\r\n", b"a\rb\n\nc", "é\nü\n".encode()]:
+        lines = io.StringIO(data.decode(), newline=None).readlines()
+        starts = line_starts(data)
+        assert [decode_line(data, i, starts) for i in range(len(starts))] == lines
+
+
+def test__scan__line_index_at():
+    data = b"#!/bin/sh\r\n\r\n# SPDX-License-Identifier: MIT\n"
+    offset = data.find(SPDX_MARKER_BYTES)
+    assert line_index_at(data, offset) == 2
+    assert line_index_at(data, offset, starts=line_starts(data)) == 2
+
+    data = b"// a\n// b\n// SPDX-License-Identifier: MIT\n"
+    assert line_index_at(data, data.find(SPDX_MARKER_BYTES)) == 2
+
+
+def test__scan__head_end():
+    data = b"a\r\nb\rc\nd"
+    assert [head_end(data, n) for n in range(6)] == [0, 3, 5, 7, 8, 8]
+    assert data[: head_end(data, 2)] == b"a\r\nb\r"
+
+
+def test__scan__copyright_markers():
+    assert COPYRIGHT_MARKERS_RE.search(b"// COPYRIGHT 2025") is not None
+    assert COPYRIGHT_MARKERS_RE.search(b"/* (C) beman */") is not None
+    assert COPYRIGHT_MARKERS_RE.search(b"int copy(int right);") is None
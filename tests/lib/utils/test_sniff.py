@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+import logging
+from argparse import Namespace
+
+import pytest
+
+from beman_tidy.lib.checks import beman_standard  # noqa: F401 (registers all checks)
+from beman_tidy.lib.checks.system.registry import get_registered_beman_standard_checks
+from beman_tidy.lib.pipeline import run_checks_pipeline
+from beman_tidy.lib.utils.git import load_beman_standard_config
+from beman_tidy.lib.utils.sniff import SNIFF_SIZE, FileKind, classify_head, sniff_file
+from tests.utils.conftest import mock_repo_info  # noqa: F401
+
+
+def test__sniff__classify_head():
+    assert classify_head(b"", 0) is FileKind.TEXT
+    assert classify_head(b"// SPDX-License-Identifier: MIT\n", 33) is FileKind.TEXT
+    assert classify_head("// café\n".encode(), 9) is FileKind.TEXT
+    assert classify_head(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR", 1000) is FileKind.BINARY
+    assert classify_head(b"// caf\xe9\n", 9) is FileKind.BINARY
+    assert classify_head(b"version https://git-lfs.github.com/spec/v1\noid sha256:0\nsize 3\n", 60) is FileKind.LFS_POINTER
+    assert classify_head(b"", 2 * 1024 * 1024) is FileKind.OVERSIZED
+    assert classify_head(b"x", 100, max_size=10) is FileKind.OVERSIZED
+
+    # The head can cut a multi-byte character: it is not an encoding error.
+    head = ("x" * (SNIFF_SIZE - 1) + "é").encode()[:SNIFF_SIZE]
+    assert classify_head(head, SNIFF_SIZE + 1) is FileKind.TEXT
+    assert classify_head(head, SNIFF_SIZE) is FileKind.BINARY
+
+
+def test__sniff__file(tmp_path):
+    (tmp_path / "a.hpp").write_text("// x\n")
+    (tmp_path / "b.hpp").write_bytes(b"\0\1\2")
+    assert sniff_file(tmp_path / "a.hpp") is FileKind.TEXT
+    assert sniff_file(tmp_path / "a.hpp", max_size=2) is FileKind.OVERSIZED
+    assert sniff_file(tmp_path / "b.hpp") is FileKind.BINARY
+
+    # The cached kind is dropped when the file changes.
+    (tmp_path / "b.hpp").write_text("// now text\n")
+    assert sniff_file(tmp_path / "b.hpp") is FileKind.TEXT
+
+    with pytest.raises(OSError):
+        sniff_file(tmp_path / "missing.hpp")
+
+
+def test__sniff__non_text_files_are_skipped(tmp_path, repo_info, beman_standard_check_config, capsys):
+    (tmp_path / "include/beman/exemplar").mkdir(parents=True)
+    (tmp_path / "include/beman/exemplar/binary.hpp").write_bytes(b"\0" * 100)
+    (tmp_path / "include/beman/exemplar/lfs.hpp").write_text(
+        "version https://git-lfs.github.com/spec/v1\noid sha256:0\nsize 100000\n"
+    )
+    (tmp_path / "include/beman/exemplar/generated.hpp").write_text("// Copyright\n" * 1000)
+    repo_info["top_level"] = tmp_path
+    repo_info["config"] = {"max_file_size": 1000}
+
+    # None of them is read by the check, and all of them are reported.
+    check = get_registered_beman_standard_checks()["file.names"](repo_info, beman_standard_check_config)
+    check.log_enabled = True
+    assert check.check() is True
+    assert sorted(path.name for path in check.unchecked_files) == ["binary.hpp", "generated.hpp", "lfs.hpp"]
+
+    output = capsys.readouterr().out
+    assert "'include/beman/exemplar/binary.hpp' was not checked: it is a binary file" in output
+    assert "'include/beman/exemplar/lfs.hpp' was not checked: it is a Git LFS pointer file" in output
+    assert "'include/beman/exemplar/generated.hpp' was not checked: it is larger than max_file_size (1000 bytes)" in output
+
+
+def test__sniff__head_only_checks_read_the_head_of_oversized_files(tmp_path, repo_info, beman_standard_check_config):
+    (tmp_path / "include/beman/exemplar").mkdir(parents=True)
+    (tmp_path / "include/beman/exemplar/generated.hpp").write_text("// Copyright\n" * 1000)
+    (tmp_path / "include/beman/exemplar/licensed.hpp").write_text(
+        "// SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception\n" + "int x;\n" * 1000
+    )
+    repo_info["top_level"] = tmp_path
+    repo_info["config"] = {"max_file_size": 1000}
+
+    check = get_registered_beman_standard_checks()["file.license_id"](repo_info, beman_standard_check_config)
+    assert check.check() is False
+    assert check.unchecked_files == []
+
+    # Only the head was read: the file is not fixed (nor truncated).
+    (tmp_path / "include/beman/exemplar/generated.hpp").write_text("// Copyright\n" * 30 + "// SPDX-License-Identifier: MIT\n" * 100)
+    assert check.fix() is False
+    assert (tmp_path / "include/beman/exemplar/generated.hpp").stat().st_size > 1000
+
+
+def test__sniff__unchecked_files_are_reported_without_verbose(tmp_path, mock_repo_info, caplog):  # noqa: F811
+    (tmp_path / "include/beman/exemplar").mkdir(parents=True)
+    (tmp_path / "include/beman/exemplar/binary.hpp").write_bytes(b"\0" * 100)
+    mock_repo_info["top_level"] = tmp_path
+    mock_repo_info["config"] = {"max_file_size": 1000}
+    args = Namespace(
+        repo_info=mock_repo_info,
+        verbose=False,
+        require_all=False,
+        fix_inplace=False,
+        fix_diff=None,
+        format=None,
+        store=None,
+    )
+
+    with caplog.at_level(logging.INFO):
+        run_checks_pipeline(["file.names"], args, load_beman_standard_config())
+
+    assert "1 files not checked" in caplog.text
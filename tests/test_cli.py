@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+# SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+
+from beman_tidy.cli import SUBCOMMANDS, get_subcommand
+
+
+def test__cli__subcommand_dispatch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert get_subcommand(["beman-tidy", "history", "."]) is SUBCOMMANDS["history"]
+    assert get_subcommand(["beman-tidy", "path/to/exemplar"]) is None
+    assert get_subcommand(["beman-tidy"]) is None
+
+    # A repository named like a subcommand is checked.
+    (tmp_path / "query").mkdir()
+    assert get_subcommand(["beman-tidy", "query"]) is None
+    assert get_subcommand(["beman-tidy", "./history"]) is None